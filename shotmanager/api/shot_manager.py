@@ -112,7 +112,7 @@ def copy_take(
 
 
 def get_unique_shot_name(shot_manager: UAS_ShotManager_Props, name: str, take_index: int):
-    return shot_manager.getUniqueShotName(shot_manager, name, takeIndex=take_index)
+    return shot_manager.getUniqueShotName(name, takeIndex=take_index)
 
 
 def add_shot(
@@ -143,6 +143,37 @@ def add_shot(
     )
 
 
+def batch_edit_shots(shot_manager: UAS_ShotManager_Props):
+    """Return a context manager in which shots can be added, modified and removed without refreshing the UI
+    and changing the current shot for each of them. These side effects are applied once at the end. Eg:
+        with batch_edit_shots(shot_manager):
+            for i in range(500):
+                add_shot(shot_manager, name=f"Sh{i:03}", start=i * 10, end=i * 10 + 9)
+    """
+    return shot_manager.batchEditShots()
+
+
+def add_shots(shot_manager: UAS_ShotManager_Props, shots_args: list, at_index: int = -1, take_index: int = -1):
+    """Add several shots at once in the specified take
+    Return the list of the newly added shots
+    Args:
+        shots_args: list of dictionaries of the arguments of each shot, named as in props.addShot(),
+                    eg: [{"name": "Sh010", "start": 10, "end": 20, "camera": cam}]
+        at_index:   index of the first added shot, the other ones being placed after it. If -1 the shots are
+                    added at the end of the shots list
+    """
+    return shot_manager.addShots(shots_args, atIndex=at_index, takeIndex=take_index)
+
+
+def update_shots(shot_manager: UAS_ShotManager_Props, shots_values: list):
+    """Set the values of the properties of several shots at once
+    Args:
+        shots_values: list of tupples made of a shot and of a dictionary of the values to set to its properties,
+                      eg: [(shot, {"start": 10, "end": 20, "enabled": False})]
+    """
+    shot_manager.updateShots(shots_values)
+
+
 def copy_shot(
     shot_manager: UAS_ShotManager_Props,
     shot: UAS_ShotManager_Shot,
@@ -162,6 +193,10 @@ def remove_shot(shot_manager: UAS_ShotManager_Props, shot: UAS_ShotManager_Shot)
     shot_manager.removeShot(shot)
 
 
+def remove_shots(shot_manager: UAS_ShotManager_Props, shots: list, delete_camera: bool = False):
+    shot_manager.removeShots(shots, deleteCamera=delete_camera)
+
+
 def move_shot_to_index(shot_manager: UAS_ShotManager_Props, shot: UAS_ShotManager_Shot, new_index: int):
     shot_manager.moveShotToIndex(shot, new_index)
 
@@ -370,6 +405,17 @@ def get_edit_time(
     return shot_manager.getEditTime(reference_shot, frame_index_in_3D_time, referenceLevel=reference_level)
 
 
+def get_frame_from_edit_time(
+    shot_manager: UAS_ShotManager_Props, edit_time: int, reference_level: str = "TAKE", take_index: int = -1
+):
+    """Return a tupple made of the shot at the specified edit time and the corresponding frame in the 3D time,
+    (None, -1) if the edit time is out of the edit. This is the reverse of get_edit_time().
+    Disabled shots are always ignored and considered as not belonging to the edit.
+    reference_level can be "TAKE" or "GLOBAL_EDIT"
+    """
+    return shot_manager.getFrameFromEditTime(edit_time, referenceLevel=reference_level, takeIndex=take_index)
+
+
 def get_edit_current_time(shot_manager: UAS_ShotManager_Props, reference_level: str = "TAKE"):
     """Return edit current time in frames, -1 if no shots or if current shot is disabled
     works only on current take
@@ -157,6 +157,7 @@ def getLoggingTags():
     tags["INIT_AND_DATA"] = False
 
     tags["SHOTS_PLAY_MODE"] = False
+    tags["SHOTS_INDEX"] = False
 
     tags["RENDER"] = False
     tags["LAYOUT"] = False
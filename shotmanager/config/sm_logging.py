@@ -35,6 +35,14 @@ import logging
 from ..utils.utils_python import asciiColor
 from ..config import config
 
+_levels = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+}
+
 
 def getLogger(name):
     return _logger
@@ -96,8 +104,69 @@ class SM_Logger(logging.getLoggerClass()):
             "OTHER": self._formatter_other,
         }
 
+        # when True the debug messages are not even formatted, see setNoOpMode()
+        self._noOpMode = False
+
         self.tags = config.getLoggingTags()
 
+    @property
+    def tags(self):
+        return self._tags
+
+    @tags.setter
+    def tags(self, value):
+        """Set the dictionary of the tags and resolve it into the cached mask of the enabled tags.
+        Note: changing the value of a tag of the dictionary afterward has to be done with setTagEnabled()
+        """
+        self._tags = value
+        self._tagsBits = dict()
+        self._enabledTagsMask = 0
+        for i, (tag, enabled) in enumerate(self._tags.items()):
+            self._tagsBits[tag] = 1 << i
+            if enabled:
+                self._enabledTagsMask |= 1 << i
+
+    def setTagEnabled(self, tag, enabled):
+        if tag not in self._tagsBits:
+            self._tagsBits[tag] = 1 << len(self._tagsBits)
+        self._tags[tag] = enabled
+        if enabled:
+            self._enabledTagsMask |= self._tagsBits[tag]
+        else:
+            self._enabledTagsMask &= ~self._tagsBits[tag]
+
+    def isTagEnabled(self, tag):
+        """Return True if the messages with the specified tag are displayed. Tags not listed are displayed"""
+        if tag is None:
+            return True
+        bit = self._tagsBits.get(tag, 0)
+        return 0 == bit or 0 != self._enabledTagsMask & bit
+
+    def isDebugEnabled(self, tag=None):
+        """Fast check to use in the hot code paths (frame handlers, draw and event functions) before
+        building costly debug information
+        eg:
+        if _logger.isDebugEnabled(tag="TIMELINE_EVENT"):
+            _logger.debug_ext(f"items: {getItemsDescription()}", tag="TIMELINE_EVENT")
+        """
+        return not self._noOpMode and self.isEnabledFor(logging.DEBUG) and self.isTagEnabled(tag)
+
+    def setNoOpMode(self, enabled):
+        """When enabled, debug_ext() does nothing, which removes the formatting cost of the debug messages
+        from every callsite. This is the production mode, set at initialization when config.devDebug is False.
+        Setting the logger level to DEBUG disables it.
+        """
+        self._noOpMode = enabled
+        if enabled:
+            self.debug_ext = self._debug_ext_noOp
+        elif "debug_ext" in self.__dict__:
+            del self.debug_ext
+
+    def setLevel(self, level):
+        super(SM_Logger, self).setLevel(level)
+        if self._noOpMode and self.isEnabledFor(logging.DEBUG):
+            self.setNoOpMode(False)
+
     @property
     def prefix(self):
         return self._prefix
@@ -173,19 +242,28 @@ class SM_Logger(logging.getLoggerClass()):
         ch.setLevel(logging.DEBUG)
         _logger.handlers[0].setFormatter(self._getFormatter(col, form))
 
-    def _print_ext(self, mode, msg, extra=None, col="", form="STD", tag=None, display=True):
+    def _print_ext(self, mode, msg, args=(), extra=None, col="", form="STD", tag=None, display=True):
         """
         Args:
             mode: "DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"
+            msg: the message, or a callable returning it. It is evaluated only if the message is displayed
+            args: arguments merged into msg with the % operator, only if the message is displayed
         """
         if not display:
             return
 
+        # level and tags are checked before any formatting is done
+        if not self.isEnabledFor(_levels[mode]):
+            return
+
         # accept or silence message display according to tags (if return is enabled then tag is ignored)
-        if tag is not None:
-            if tag in self.tags:
-                if not self.tags[tag]:
-                    return
+        if not self.isTagEnabled(tag):
+            return
+
+        if callable(msg):
+            msg = msg()
+        elif len(args):
+            msg = msg % args
 
         if "DEPRECATED" == tag:
             form = "DEPRECATED"
@@ -212,27 +290,34 @@ class SM_Logger(logging.getLoggerClass()):
 
         _logger.handlers[0].setFormatter(self._getFormatter(self._defaultColor, self._defaultForm))
 
-    def debug_ext(self, msg, extra=None, col="", form="STD", tag=None, display=True):
+    def debug_ext(self, msg, *args, extra=None, col="", form="STD", tag=None, display=True):
         """
         eg:
         _logger.debug_ext(f"message: {text}", tag="DEPRECATED")
         _logger.warning_ext(f"message: {text}")
+
+        In hot code paths use deferred formatting, the message is then built only if it is displayed:
+        _logger.debug_ext("current frame: %s", currentFrame, tag="SHOTS_PLAY_MODE")
+        _logger.debug_ext(lambda: f"shots: {getShotsNames()}", tag="SHOTS_PLAY_MODE")
         """
         if form in ["REG", "UNREG"]:
             tag = form
-        self._print_ext("DEBUG", msg, extra=extra, col=col, form=form, tag=tag, display=display)
+        self._print_ext("DEBUG", msg, args, extra=extra, col=col, form=form, tag=tag, display=display)
 
-    def info_ext(self, msg, extra=None, col="DEFAULT", form="INFO", tag=None, display=True):
-        self._print_ext("INFO", msg, extra=extra, col=col, form=form, tag=tag, display=display)
+    def _debug_ext_noOp(self, msg, *args, **kwargs):
+        pass
 
-    def warning_ext(self, msg, extra=None, col="ORANGE", form="WARNING", tag=None, display=True):
-        self._print_ext("WARNING", msg, extra=extra, col=col, form=form, tag=tag, display=display)
+    def info_ext(self, msg, *args, extra=None, col="DEFAULT", form="INFO", tag=None, display=True):
+        self._print_ext("INFO", msg, args, extra=extra, col=col, form=form, tag=tag, display=display)
 
-    def error_ext(self, msg, extra=None, col="RED", form="ERROR", tag=None, display=True):
-        self._print_ext("ERROR", msg, extra=extra, col=col, form=form, tag=tag, display=display)
+    def warning_ext(self, msg, *args, extra=None, col="ORANGE", form="WARNING", tag=None, display=True):
+        self._print_ext("WARNING", msg, args, extra=extra, col=col, form=form, tag=tag, display=display)
 
-    def critical_ext(self, msg, extra=None, col="RED_BG", form="CRITICAL", tag=None, display=True):
-        self._print_ext("CRITICAL", msg, extra=extra, col=col, form=form, tag=tag, display=display)
+    def error_ext(self, msg, *args, extra=None, col="RED", form="ERROR", tag=None, display=True):
+        self._print_ext("ERROR", msg, args, extra=extra, col=col, form=form, tag=tag, display=display)
+
+    def critical_ext(self, msg, *args, extra=None, col="RED_BG", form="CRITICAL", tag=None, display=True):
+        self._print_ext("CRITICAL", msg, args, extra=extra, col=col, form=form, tag=tag, display=display)
 
     # custom function
     def print_ext(self, msg, col="DEFAULT", tag=None, display=True):
@@ -321,6 +406,9 @@ def initialize(addonName="", prefix=""):
     _logger.addon_name = addonName
     _logger.prefix = prefix
 
+    # production mode: debug messages are not formatted at all
+    _logger.setNoOpMode(not config.devDebug)
+
     # _logger.setLevel(logging.DEBUG)
     formatter = None
 
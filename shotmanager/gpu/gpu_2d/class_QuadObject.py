@@ -79,6 +79,9 @@ class QuadObject(Object2D, Mesh2D):
 
         self.displayOverRuler = displayOverRuler
 
+        # set to True when the fill is drawn by the owner of the quad, in a batch gathering several quads
+        self.fillIsBatched = False
+
         self.rebuild_rectangle_mesh(0, 0, 1, 1)
 
     # # override Object2D
@@ -130,11 +133,11 @@ class QuadObject(Object2D, Mesh2D):
 
     #################################################################
 
-    # override Mesh2D
-    def draw(self, shader=None, region=None, draw_types="TRIS", cap_lines=False, preDrawOnly=False):
-        # if not self.isVisible:
-        #     return
-
+    def computeTransformedVertices(self, region):
+        """Compute the position of the quad in the region and update its bounding boxes
+        Return the vertices of the quad clamped to the region, in pixels in region CS, or None if
+        the quad is fully out of the region
+        """
         # aligment to region ###############
         alignmentsR = self.alignmentToRegion.split("_")
         alignmentR_x = alignmentsR[1]
@@ -287,11 +290,11 @@ class QuadObject(Object2D, Mesh2D):
         ]
 
         self._bBox = bBox
-        # if clamped then the quad is not drawn
+        # the quad is fully out of the region
         if clamped_transformed_vertices is None:
             self.isFullyClamped = True
             self._clamped_bBox = bBox
-            return
+            return None
 
         self.isFullyClamped = False
         clamped_bBox = [
@@ -305,6 +308,23 @@ class QuadObject(Object2D, Mesh2D):
         # rebuilt the texture coordinates
         self.updateTexCoords()
 
+        return clamped_transformed_vertices
+
+    def getDrawVertices(self, region):
+        """Return the vertices used by draw(). Override it to reuse vertices already computed for the redraw"""
+        return self.computeTransformedVertices(region)
+
+    # override Mesh2D
+    def draw(self, shader=None, region=None, draw_types="TRIS", cap_lines=False, preDrawOnly=False):
+        # if not self.isVisible:
+        #     return
+
+        clamped_transformed_vertices = self.getDrawVertices(region)
+
+        # if clamped then the quad is not drawn
+        if clamped_transformed_vertices is None:
+            return
+
         ########################################
         # effective draw
         ########################################
@@ -312,7 +332,11 @@ class QuadObject(Object2D, Mesh2D):
         if not self.isVisible:
             return
 
-        if self.hasFill:
+        bBox = self._bBox
+        clamped_bBox = self._clamped_bBox
+
+        # the fill may have been drawn by the parent widget in a batch shared with other quads
+        if self.hasFill and not self.fillIsBatched:
             fillShader = shader
             # fillShader = None
             if not fillShader:
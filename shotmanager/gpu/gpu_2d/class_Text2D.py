@@ -38,6 +38,25 @@ _logger = sm_logging.getLogger(__name__)
 
 UNIFORM_SHADER_2D = gpu.shader.from_builtin("2D_UNIFORM_COLOR")
 
+# dimensions of the texts already measured, keyed by (text, font size)
+_textDimensions = dict()
+_textDimensions_maxSize = 4096
+
+
+def getTextDimensions(text, fontSize):
+    """Return the dimensions of the text drawn with the default font at the specified size, in pixels
+    The layout is computed by blf only the first time the text is measured at this size
+    """
+    key = (text, fontSize)
+    dimensions = _textDimensions.get(key, None)
+    if dimensions is None:
+        if len(_textDimensions) >= _textDimensions_maxSize:
+            _textDimensions.clear()
+        blf.size(0, fontSize, 72)
+        dimensions = blf.dimensions(0, text)
+        _textDimensions[key] = dimensions
+    return dimensions
+
 
 class Text2D(Object2D):
     def __init__(
@@ -173,9 +192,7 @@ class Text2D(Object2D):
         #         posX_inRegion = region.view2d.view_to_region(self.posX, 0, clip=False)[0]
 
         #     width = region.view2d.view_to_region(posX_inView + self.width, 0, clip=False)[0] - posX_inRegion
-        blf.size(0, self._getFontSizeForGlDraw(), 72)
-        width = blf.dimensions(0, self.text)[0]
-        height = blf.dimensions(0, self.text)[1]
+        width, height = getTextDimensions(self.text, self._getFontSizeForGlDraw())
 
         # if self.heightIsInRegionCS:
         #     height = self.height
@@ -33,6 +33,10 @@ from .sm_check_data_handlers import shotMngHandler_load_post_checkDataVersion
 from shotmanager.overlay_tools.viewport_camera_hud.camera_hud_handlers import shotMngHandler_load_post_cameraHUD
 
 from .sm_overlay_tools_handlers import shotMngHandler_frame_change_pre_jumpToShot
+from shotmanager.ui.sm_ui_snapshot import shotMngHandler_depsgraph_update_post_uiSnapshot
+from shotmanager.warnings import warnings
+from shotmanager.utils import utils
+from shotmanager.utils import utils_markers
 
 
 from shotmanager.config import sm_logging
@@ -85,6 +89,34 @@ def register():
     bpy.app.handlers.redo_pre.append(sm_handlers.shotMngHandler_redo_pre)
     bpy.app.handlers.redo_post.append(sm_handlers.shotMngHandler_redo_post)
 
+    # snapshot of the state read by the UI
+    utils_handlers.removeAllHandlerOccurences(
+        shotMngHandler_depsgraph_update_post_uiSnapshot, handlerCateg=bpy.app.handlers.depsgraph_update_post
+    )
+    bpy.app.handlers.depsgraph_update_post.append(shotMngHandler_depsgraph_update_post_uiSnapshot)
+
+    # warnings
+    utils_handlers.removeAllHandlerOccurences(
+        warnings.shotMngHandler_depsgraph_update_post_warnings, handlerCateg=bpy.app.handlers.depsgraph_update_post
+    )
+    bpy.app.handlers.depsgraph_update_post.append(warnings.shotMngHandler_depsgraph_update_post_warnings)
+    bpy.app.handlers.save_post.append(sm_handlers.shotMngHandler_save_post)
+    if not bpy.app.timers.is_registered(warnings.filesystemChecksTimer):
+        bpy.app.timers.register(warnings.filesystemChecksTimer, persistent=True)
+
+    # markers index
+    utils_handlers.removeAllHandlerOccurences(
+        utils_markers.shotMngHandler_depsgraph_update_post_markersIndex,
+        handlerCateg=bpy.app.handlers.depsgraph_update_post,
+    )
+    bpy.app.handlers.depsgraph_update_post.append(utils_markers.shotMngHandler_depsgraph_update_post_markersIndex)
+
+    # objects children index
+    utils_handlers.removeAllHandlerOccurences(
+        utils.shotMngHandler_depsgraph_update_post_objectsChildren, handlerCateg=bpy.app.handlers.depsgraph_update_post
+    )
+    bpy.app.handlers.depsgraph_update_post.append(utils.shotMngHandler_depsgraph_update_post_objectsChildren)
+
     # if config.devDebug:
     #     utils_handlers.displayHandlers(handlerCategName="load_post")
 
@@ -137,6 +169,30 @@ def unregister():
     bpy.app.handlers.redo_pre.remove(sm_handlers.shotMngHandler_redo_pre)
     bpy.app.handlers.redo_post.remove(sm_handlers.shotMngHandler_redo_post)
 
+    # snapshot of the state read by the UI
+    utils_handlers.removeAllHandlerOccurences(
+        shotMngHandler_depsgraph_update_post_uiSnapshot, handlerCateg=bpy.app.handlers.depsgraph_update_post
+    )
+
+    # warnings
+    utils_handlers.removeAllHandlerOccurences(
+        warnings.shotMngHandler_depsgraph_update_post_warnings, handlerCateg=bpy.app.handlers.depsgraph_update_post
+    )
+    bpy.app.handlers.save_post.remove(sm_handlers.shotMngHandler_save_post)
+    if bpy.app.timers.is_registered(warnings.filesystemChecksTimer):
+        bpy.app.timers.unregister(warnings.filesystemChecksTimer)
+
+    # markers index
+    utils_handlers.removeAllHandlerOccurences(
+        utils_markers.shotMngHandler_depsgraph_update_post_markersIndex,
+        handlerCateg=bpy.app.handlers.depsgraph_update_post,
+    )
+
+    # objects children index
+    utils_handlers.removeAllHandlerOccurences(
+        utils.shotMngHandler_depsgraph_update_post_objectsChildren, handlerCateg=bpy.app.handlers.depsgraph_update_post
+    )
+
     # load
     bpy.app.handlers.load_pre.remove(sm_handlers.shotMngHandler_load_pre)
     bpy.app.handlers.load_post.remove(sm_handlers.shotMngHandler_load_post)
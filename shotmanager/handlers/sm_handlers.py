@@ -23,6 +23,11 @@ import bpy
 from bpy.app.handlers import persistent
 
 from shotmanager.config import config
+from shotmanager.properties import shots_index
+from shotmanager.ui import sm_ui_snapshot
+from shotmanager.warnings import warnings
+from shotmanager.utils import utils
+from shotmanager.utils import utils_markers
 from shotmanager.config import sm_logging
 
 _logger = sm_logging.getLogger(__name__)
@@ -41,6 +46,11 @@ def shotMngHandler_undo_pre(self, context):
 @persistent
 def shotMngHandler_undo_post(self, context):
     _logger.debug_ext("Handler: Undo Post", col="GREEN_LIGHT", tag="HANDLER")
+    shots_index.invalidateShotsIndex()
+    sm_ui_snapshot.invalidateUISnapshots()
+    warnings.invalidateWarnings()
+    utils_markers.invalidateMarkersIndex()
+    utils.invalidateObjectsChildren()
 
 
 @persistent
@@ -56,6 +66,18 @@ def shotMngHandler_redo_pre(self, context):
 @persistent
 def shotMngHandler_redo_post(self, context):
     _logger.debug_ext("Handler: Redo Post", col="GREEN_LIGHT", tag="HANDLER")
+    shots_index.invalidateShotsIndex()
+    sm_ui_snapshot.invalidateUISnapshots()
+    warnings.invalidateWarnings()
+    utils_markers.invalidateMarkersIndex()
+    utils.invalidateObjectsChildren()
+
+
+@persistent
+def shotMngHandler_save_post(self, context):
+    _logger.debug_ext("Handler: Save Post", col="GREEN_LIGHT", tag="HANDLER")
+    # the file path and its read-only state may have changed
+    warnings.invalidateWarnings(filesystemChecks=True)
 
 
 @persistent
@@ -67,6 +89,11 @@ def shotMngHandler_load_pre(self, context):
 @persistent
 def shotMngHandler_load_post(self, context):
     _logger.debug_ext("Handler: Load Post", col="GREEN_LIGHT", tag="HANDLER")
+    shots_index.invalidateShotsIndex()
+    sm_ui_snapshot.invalidateUISnapshots()
+    warnings.invalidateWarnings(filesystemChecks=True)
+    utils_markers.invalidateMarkersIndex()
+    utils.invalidateObjectsChildren()
 
     # bpy.ops.uas_shot_manager.sequence_timeline.cancel(bpy.context)
 
@@ -40,11 +40,12 @@ def install_handler_for_shot(self, context):
         self.UAS_shot_manager_shots_play_mode
         and shotMngHandler_frame_change_pre_jumpToShot not in bpy.app.handlers.frame_change_pre
     ):
-        shots = scene.UAS_shot_manager_props.get_shots()
-        for i, shot in enumerate(shots):
-            if shot.start <= scene.frame_current <= shot.end:
-                scene.UAS_shot_manager_props.current_shot_index = i
-                break
+        props = scene.UAS_shot_manager_props
+        shotInd = props.getFirstShotIndexContainingFrame(scene.frame_current)
+        if -1 != shotInd:
+            props.current_shot_index = shotInd
+        # the jump table is built before the play starts
+        getShotsPlayModeTable(scene, props)
         bpy.app.handlers.frame_change_pre.append(shotMngHandler_frame_change_pre_jumpToShot)
     #     bpy.app.handlers.frame_change_post.append(shotMngHandler_frame_change_pre_jumpToShot__frame_change_post)
 
@@ -100,99 +101,137 @@ def toggle_overlay_tools_display(context):
     # context.scene.frame_current = context.scene.frame_current
 
 
-def shotMngHandler_frame_change_pre_jumpToShot(scene):
-    props = scene.UAS_shot_manager_props
+class ShotsPlayModeTable:
+    """Jump table used by the shots play mode handler
+    For each shot of the take it stores where the play head has to go when leaving the shot, according to the
+    animation range. It is built from the cached shots index of the take so no RNA access is done per frame.
+    """
+
+    def __init__(self, takeShotsIndex, rangeStart, rangeEnd):
+        self.takeShotsIndex = takeShotsIndex
+        self.rangeStart = rangeStart
+        self.rangeEnd = rangeEnd
+
+        starts = takeShotsIndex.starts
+        ends = takeShotsIndex.ends
+        enabled = takeShotsIndex.enabled
+        numShots = takeShotsIndex.numShots
+        self.starts = starts
+        self.ends = ends
+        self.numShots = numShots
+
+        enabledIndices = takeShotsIndex.enabledShots.shotIndices
+        self.firstEnabledShotIndex = enabledIndices[0] if len(enabledIndices) else -1
+        self.lastEnabledShotIndex = enabledIndices[-1] if len(enabledIndices) else -1
+
+        # previous enabled shot, -1 if none
+        self.previousShot = [-1] * numShots
+        previousEnabled = -1
+        for i in range(numShots):
+            self.previousShot[i] = previousEnabled
+            if enabled[i]:
+                previousEnabled = i
+
+        # next enabled shot, -1 if none or if its start is out of the anim range
+        self.nextShot = [-1] * numShots
+        nextEnabled = -1
+        for i in range(numShots - 1, -1, -1):
+            if -1 != nextEnabled and rangeStart <= starts[nextEnabled] <= rangeEnd:
+                self.nextShot[i] = nextEnabled
+            if enabled[i]:
+                nextEnabled = i
+
+        # index of the first enabled shot that is:
+        #   - before the shot (or the shot itself)
+        #   - either completely in the anim range or has just its start out (not the end!)
+        #   - that can be reached by going back in the shot list from the shot without meeting
+        #     a shot that has its end out
+        # The search stops on the previous enabled shot or continues the same way as from this one, hence
+        # the values are deduced from the ones of the previous shots
+        self.firstContinuousShot = [-1] * numShots
+        for i in range(numShots):
+            firstInd = i
+            previousInd = self.previousShot[i]
+            if rangeStart <= starts[i] and -1 != previousInd:
+                if ends[previousInd] > rangeEnd or ends[previousInd] < rangeStart:
+                    firstInd = i
+                elif starts[previousInd] < rangeStart:
+                    firstInd = previousInd
+                else:
+                    firstInd = self.firstContinuousShot[previousInd]
+            self.firstContinuousShot[i] = firstInd
 
-    def _get_range_start():
-        return scene.frame_preview_start if scene.use_preview_range else scene.frame_start
+    def isValid(self, takeShotsIndex, rangeStart, rangeEnd):
+        return self.takeShotsIndex is takeShotsIndex and self.rangeStart == rangeStart and self.rangeEnd == rangeEnd
 
-    def _get_range_end():
-        return scene.frame_preview_end if scene.use_preview_range else scene.frame_end
+    def getMaxStartFrame(self, shotIndex):
+        """Return the max between the start of the shot and the start of the anim range"""
+        start = self.starts[shotIndex]
+        if self.rangeStart <= start <= self.rangeEnd:
+            return start
+        return self.rangeStart
 
-    def _get_previous_shot(shots, current_shot_index):
-        index = current_shot_index
-        if index > 0:
-            previous_shots = [s for s in shots[:index] if s.enabled]
-            if len(previous_shots):
-                return previous_shots[-1]
 
-        return None
+_playModeTable = None
 
-    def _get_next_shot(shots, current_shot_index):
-        """If next shot is out of the anim range then return None"""
-        index = current_shot_index + 1
-        # if index < len(shots) - 1:
-        #     next_shots = [s for s in shots[index + 1 :] if s.enabled]
-        #     if len(next_shots):
-        #         return next_shots[0]
-
-        while index < len(shots):
-            if shots[index].enabled:
-                if shots[index].start <= _get_range_end() and shots[index].start >= _get_range_start():
-                    return shots[index]
-                else:
-                    return None
-            else:
-                index += 1
+# is_scrubbing is available from Blender 2.90
+_useIsScrubbing = (2, 90, 0) <= bpy.app.version
+
+
+def getShotsPlayModeTable(scene, props):
+    """Return the jump table of the current take for the current anim range, rebuilt only if the
+    edit or the range have changed. Return None if the current take is not valid
+    """
+    global _playModeTable
+
+    takeShotsIndex = props.getShotsIndex()
+    if takeShotsIndex is None:
         return None
 
-    def _get_max_start_frame(shot):
-        """Return the max between the start of the shot and the start of the anim range"""
-        time = _get_range_start()
-        if shot.start >= _get_range_start() and shot.start <= _get_range_end():
-            time = shot.start
-        return time
-
-    def _get_first_continuous_shot_index(shots, current_shot_index):
-        """Return the index of the first enabled shot that is:
-            - before current_shot_index
-            - either completely in the anim range or has just its start out (not the end!)
-            - that can be reached by going back in the shot list from current_shot_index without meeting
-              a shot that has its end out
-        If no such shot is found them we use current shot
-        """
-
-        if shots[current_shot_index].start < _get_range_start():
-            return current_shot_index
-
-        lastValidShotInd = current_shot_index
-        i = current_shot_index - 1
-        while 0 <= i:
-            if shots[i].enabled:
-                if shots[i].end > _get_range_end():
-                    break
-                if shots[i].end < _get_range_start():
-                    break
-                if shots[i].start < _get_range_start():
-                    lastValidShotInd = i
-                    break
-                if shots[i].start >= _get_range_start():
-                    lastValidShotInd = i
-            i -= 1
-
-        return lastValidShotInd
-
-    shotList = props.get_shots()
-    if len(shotList) <= 0:
-        return
+    if scene.use_preview_range:
+        rangeStart, rangeEnd = scene.frame_preview_start, scene.frame_preview_end
+    else:
+        rangeStart, rangeEnd = scene.frame_start, scene.frame_end
 
-    props.restartPlay = False
+    if _playModeTable is None or not _playModeTable.isValid(takeShotsIndex, rangeStart, rangeEnd):
+        _logger.debug_ext("Building shots play mode jump table", col="YELLOW", tag="SHOTS_PLAY_MODE")
+        _playModeTable = ShotsPlayModeTable(takeShotsIndex, rangeStart, rangeEnd)
+
+    return _playModeTable
 
-    current_shot_index = props.current_shot_index
-    current_shot = shotList[current_shot_index]
-    current_frame = scene.frame_current
 
-    # clip shot to scene timeframe. Might not be necessary
-    current_shot_start = current_shot.start
-    current_shot_end = current_shot.end
+def _jumpToFirstContinuousShot(scene, props, table, currentShotIndex):
+    firstShotInd = table.firstContinuousShot[currentShotIndex]
+    if currentShotIndex != firstShotInd:
+        props.setCurrentShotByIndex(firstShotInd, changeTime=False)
+    # if we put this condition we avoid the frame to be played 2 times but we don't see the new shot becoming current
+    # if firstFrame != current_frame:
+    scene.frame_current = table.getMaxStartFrame(firstShotInd)
 
+
+def shotMngHandler_frame_change_pre_jumpToShot(scene):
     if not bpy.context.screen.is_animation_playing:
         return
 
-    if (2, 90, 0) <= bpy.app.version:
+    props = scene.UAS_shot_manager_props
+    table = getShotsPlayModeTable(scene, props)
+    if table is None or 0 >= table.numShots:
+        return
+
+    if props.restartPlay:
+        props.restartPlay = False
+
+    current_shot_index = props.current_shot_index
+    if not 0 <= current_shot_index < table.numShots:
+        return
+    current_frame = scene.frame_current
+    current_shot_start = table.starts[current_shot_index]
+    current_shot_end = table.ends[current_shot_index]
+
+    if _useIsScrubbing:
         scrubbing = bpy.context.screen.is_scrubbing
     else:
-        scrubbing = not bpy.context.screen.is_animation_playing
+        scrubbing = False
 
     #########################################
     ## animation is playing
@@ -200,179 +239,82 @@ def shotMngHandler_frame_change_pre_jumpToShot(scene):
     if not scrubbing:
         # Order of if clauses is very important.
 
-        #   _logger.debug_ext("*** Not Scrubbing:", col="RED", tag="SHOTS_PLAY_MODE")
-
-        # messages for range start and end
-        inforStr = ""
-        if _get_range_start() == current_frame:
-            inforStr = "  ** Range Start **"
-        if _get_range_end() == current_frame:
-            inforStr = "  ** Range End **"
-
-        _logger.debug_ext(f"current_frame: {current_frame}  {inforStr}", col="YELLOW", tag="SHOTS_PLAY_MODE")
-
-        if current_frame == current_shot.start:
-            _logger.debug_ext(
-                f"   current frame is at start of current shot: {current_shot.name}",
-                col="GREEN_LIGHT",
-                tag="SHOTS_PLAY_MODE",
-            )
-        elif current_frame == current_shot.end:
-            _logger.debug_ext(
-                f"   current frame is at end of current shot: {current_frame}", col="ORANGE", tag="SHOTS_PLAY_MODE"
-            )
-
-        if current_frame == _get_range_start():
+        if current_frame == table.rangeStart:
             # we are here when the play head reached the anim range end and has been put back by Blender
             # to the start of the range
 
-            if current_frame == current_shot.start:
+            if current_frame == current_shot_start:
                 # case where the current shot is not the first one of the edit, starts at the same time as the first one and
                 # this time is also the anim range start. Then we want to preserve the current shot
-                _logger.debug_ext(
-                    f"1 current_frame == range start and current_frame == current_shot.start, current shot: {current_shot.name}",
-                    col="GREEN",
-                    tag="SHOTS_PLAY_MODE",
-                )
                 pass
             else:
-                lookForFirstShot = True
-                if _get_range_end() == current_shot.end:
-                    next_shot = _get_next_shot(shotList, current_shot_index)
-                    if next_shot is not None:
-                        # next_shot_index = props.getShotIndex(next_shot)
-
-                        _logger.debug_ext(
-                            f"2 current_frame == range start, current shot: {current_shot.name}, next_shot: {next_shot.name}",
-                            col="GREEN",
-                            tag="SHOTS_PLAY_MODE",
-                        )
-
-                        props.setCurrentShot(next_shot, changeTime=False)
-                        scene.frame_current = next_shot.start
-
-                        lookForFirstShot = False
-
-                if lookForFirstShot:
-                    # if True:
-                    firstShotInd = _get_first_continuous_shot_index(shotList, current_shot_index)
+                nextShotInd = table.nextShot[current_shot_index]
+                if table.rangeEnd == current_shot_end and -1 != nextShotInd:
                     _logger.debug_ext(
-                        f"3 current_frame == range start, current shot: {current_shot.name}, first conti: {shotList[firstShotInd].name}",
+                        "current_frame == range start, jump to next shot %s",
+                        nextShotInd,
                         col="GREEN",
                         tag="SHOTS_PLAY_MODE",
                     )
-                    firstFrame = _get_max_start_frame(shotList[firstShotInd])
-                    if current_shot_index != firstShotInd:
-                        props.setCurrentShot(shotList[firstShotInd], changeTime=False)
-                    # if we put this condition we avoid the frame to be played 2 times but we don't see the new shot becoming current
-                    # if firstFrame != current_frame:
-                    scene.frame_current = firstFrame
-        elif (
-            current_frame == _get_range_end() and _get_previous_shot(shotList, current_shot_index) is None
-        ):  # While backward playing if we hit the last frame and we are playing the first shot jump to the last shot.
-            _logger.debug_ext("current_frame == _get_range_end()", col="PURPLE", tag="SHOTS_PLAY_MODE")
-            firstShotInd = _get_first_continuous_shot_index(shotList, current_shot_index)
-            firstFrame = _get_max_start_frame(shotList[firstShotInd])
-            if current_shot_index != firstShotInd:
-                props.setCurrentShot(shotList[firstShotInd], changeTime=False)
-            # if we put this condition we avoid the frame to be played 2 times but we don't see the new shot becoming current
-            # if firstFrame != current_frame:
-            scene.frame_current = firstFrame
-
-            # last_enabled = [s for s in shotList if s.enabled][-1]
-            # props.setCurrentShot(last_enabled, changeTime=False)
-            # scene.frame_current = last_enabled.end
+                    props.setCurrentShotByIndex(nextShotInd, changeTime=False)
+                    scene.frame_current = table.starts[nextShotInd]
+                else:
+                    _jumpToFirstContinuousShot(scene, props, table, current_shot_index)
+
+        elif current_frame == table.rangeEnd and -1 == table.previousShot[current_shot_index]:
+            # While backward playing if we hit the last frame and we are playing the first shot jump to the last shot.
+            _logger.debug_ext("current_frame == range end", col="PURPLE", tag="SHOTS_PLAY_MODE")
+            _jumpToFirstContinuousShot(scene, props, table, current_shot_index)
+
         elif current_frame > current_shot_end:
-            _logger.debug_ext("current_frame > current_shot_end", col="PURPLE", tag="SHOTS_PLAY_MODE")
-            disp = current_frame - current_shot_end
-            next_shot = _get_next_shot(shotList, current_shot_index)
-
-            if next_shot is None:
-                _logger.debug_ext("next shot is none", col="PURPLE", tag="SHOTS_PLAY_MODE")
-
-                firstShotInd = _get_first_continuous_shot_index(shotList, current_shot_index)
-                firstFrame = _get_max_start_frame(shotList[firstShotInd])
-                if current_shot_index != firstShotInd:
-                    props.setCurrentShot(shotList[firstShotInd], changeTime=False)
-                # if we put this condition we avoid the frame to be played 2 times but we don't see the new shot becoming current
-                # if firstFrame != current_frame:
-                scene.frame_current = firstFrame
+            nextShotInd = table.nextShot[current_shot_index]
+            _logger.debug_ext(
+                "current_frame > current_shot_end, next shot: %s", nextShotInd, col="PURPLE", tag="SHOTS_PLAY_MODE"
+            )
+            if -1 == nextShotInd:
+                _jumpToFirstContinuousShot(scene, props, table, current_shot_index)
             else:
-                _logger.debug_ext("next shot is NOT none", col="PURPLE", tag="SHOTS_PLAY_MODE")
-                if current_shot != next_shot:
-                    _logger.debug_ext("   next shot is NOT none 01", col="PURPLE", tag="SHOTS_PLAY_MODE")
-                    props.setCurrentShot(next_shot, changeTime=False)
-                _logger.debug_ext(f"   next shot is {next_shot.name}", col="PURPLE", tag="SHOTS_PLAY_MODE")
-                scene.frame_current = next_shot.start
-
-            # while next_shot is not None:
-            #     if disp < next_shot.getDuration():
-            #         props.setCurrentShot(next_shot, changeTime=False)
-            #         scene.frame_current = next_shot.start + disp
-            #         break
-            #     disp -= next_shot.getDuration()
-            #     next_shot = _get_next_shot(shotList, current_shot_index)
-            # else:
-            #     # Scene end is farther than the last shot so loop back.
-            #     props.setCurrentShot([s for s in shotList if s.enabled][0], changeTime=False)
-        elif (
-            current_frame == _get_range_start() and _get_next_shot(shotList, current_shot_index) is None
-        ):  # While forward playing if we hit the first frame and we are playing the last shot jump to the first shot.
-            # Seems that the first frame is always hit even in frame dropping playblack
-            _logger.debug_ext("current_frame == _get_range_start()", col="PURPLE")
-            props.setCurrentShot([s for s in shotList if s.enabled][0], changeTime=False)
+                props.setCurrentShotByIndex(nextShotInd, changeTime=False)
+                scene.frame_current = table.starts[nextShotInd]
+
         elif current_frame < current_shot_start:
-            _logger.debug_ext("current_frame < current_shot_start", col="ORANGE")
-            disp = current_shot_start - current_frame
-            previous_shot = _get_previous_shot(shotList, current_shot_index)
-            while previous_shot is not None:
-                if disp < previous_shot.getDuration():
-                    props.setCurrentShot(previous_shot, changeTime=False)
-                    scene.frame_current = previous_shot.end - disp
-                    break
-                disp -= previous_shot.getDuration()
-                previous_shot = _get_previous_shot(shotList, current_shot_index)
+            _logger.debug_ext("current_frame < current_shot_start", col="ORANGE", tag="SHOTS_PLAY_MODE")
+            previousShotInd = table.previousShot[current_shot_index]
+            if -1 != previousShotInd:
+                # the displacement is wrapped in the duration of the previous shot
+                disp = current_shot_start - current_frame
+                previousShotDuration = table.ends[previousShotInd] - table.starts[previousShotInd] + 1
+                props.setCurrentShotByIndex(previousShotInd, changeTime=False)
+                scene.frame_current = table.ends[previousShotInd] - disp % previousShotDuration
             else:
                 # Scene end is farther than the first shot so loop back.
-                last_enabled = [s for s in shotList if s.enabled][-1]
-                props.setCurrentShot(last_enabled, changeTime=False)
-                scene.frame_current = last_enabled.end
-        else:
-            # _logger.debug_ext("current_frame Else", col="RED")
-            pass
+                lastEnabledInd = table.lastEnabledShotIndex
+                props.setCurrentShotByIndex(lastEnabledInd, changeTime=False)
+                scene.frame_current = table.ends[lastEnabledInd]
 
     #########################################
     ## user is scrubbing
     #########################################
     else:
-        #   _logger.debug_ext("--- Scrubbing:", col="BLUE", tag="SHOTS_PLAY_MODE")
-
         # User is scrubbing in the timeline so try to guess a shot in the range of the timeline.
-        if not (current_shot.start <= current_frame <= current_shot.end):
-            candidates = list()
-            for i, shot in enumerate(shotList):
-                # wk
-                if shot.enabled and shot.start <= current_frame <= shot.end:
-                    candidates.append((i, shot))
-
-            if 0 < len(candidates):
-                props.setCurrentShot(candidates[0][1], changeTime=False)
+        if not (current_shot_start <= current_frame <= current_shot_end):
+            enabledShots = table.takeShotsIndex.enabledShots
+            shotInd = enabledShots.getFirstShotIndexContainingFrame(current_frame)
+
+            if -1 != shotInd:
+                props.setCurrentShotByIndex(shotInd, changeTime=False)
                 scene.frame_current = current_frame
             else:
                 # case were the new current time is out of every shots
                 # we then get the first shot BEFORE current time, or the very first shot if there is no shots after
-                prevShotInd = props.getFirstShotIndexBeforeFrame(current_frame, ignoreDisabled=True)
+                prevShotInd = enabledShots.getFirstShotIndexBeforeFrame(current_frame)
                 if -1 != prevShotInd:
-                    props.setCurrentShot(shotList[prevShotInd], changeTime=False)
                     # don't change current time in order to let the user see changes in the scene
-                    # scene.frame_current = shotList[prevShotInd].start
+                    props.setCurrentShotByIndex(prevShotInd, changeTime=False)
                 else:
-                    nextShotInd = props.getFirstShotIndexAfterFrame(current_frame, ignoreDisabled=True)
+                    nextShotInd = enabledShots.getFirstShotIndexAfterFrame(current_frame)
                     if -1 != nextShotInd:
-                        props.setCurrentShot(shotList[nextShotInd], changeTime=False)
                         # don't change current time in order to let the user see changes in the scene
-                        # scene.frame_current = shotList[nextShotInd].start
+                        props.setCurrentShotByIndex(nextShotInd, changeTime=False)
                     else:
-                        # paf what to do?
-                        # props.setCurrentShot(candidates[0][1], changeTime=False)
                         _logger.error("SM: Paf in shotMngHandler_frame_change_pre_jumpToShot: No valid shot found")
@@ -23,6 +23,8 @@ import bpy
 from bpy.types import Operator
 from bpy.props import StringProperty, BoolProperty, IntProperty
 
+from shotmanager.properties import shots_index
+
 
 class UAS_ShotManager_TakeAdd(Operator):
     bl_idname = "uas_shot_manager.take_add"
@@ -208,6 +210,7 @@ class UAS_ShotManager_TakeRemove(Operator):
         else:
             props["current_take_name"] = currentTakeInd - 1
             props.takes.remove(currentTakeInd)
+        shots_index.invalidateShotsIndex(props)
 
         props.setCurrentShotByIndex(0)
 
@@ -356,6 +359,7 @@ class UAS_ShotManager_ResetTakesToDefault(Operator):
 
         for i in range(len(takes), -1, -1):
             takes.remove(i)
+        shots_index.invalidateShotsIndex(props)
 
         props.createDefaultTake()
 
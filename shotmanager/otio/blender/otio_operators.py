@@ -297,6 +297,13 @@ class UAS_ShotManager_OT_Create_Shots_From_OTIO_Adv(Operator):
         default=True,
     )
 
+    previewChangesOnly: BoolProperty(
+        name="Preview Changes Only",
+        description="List the changes that the update would make to the shots of the take in the conformation log,"
+        "\nwithout modifying the take nor the VSE",
+        default=False,
+    )
+
     ############
     # VSE
     ############
@@ -714,6 +721,7 @@ class UAS_ShotManager_OT_Create_Shots_From_OTIO_Adv(Operator):
         # Update UI
         ############
         else:
+            box.prop(self, "previewChangesOnly")
             boxRow = box.row(align=True)
             boxRow.prop(self, "changeShotsTiming")
             # boxRow = box.row(align=True)
@@ -903,6 +911,7 @@ class UAS_ShotManager_OT_Create_Shots_From_OTIO_Adv(Operator):
                 mediaHaveHandles=self.mediaHaveHandles,
                 mediaHandlesDuration=self.mediaHandlesDuration,
                 useMediaSoundtrackForCameraBG=self.useMediaSoundtrackForCameraBG,
+                dryRun=self.previewChangesOnly,
                 #########
                 # VSE - No imports anymore
                 # importVideoInVSE=self.importVideoInVSE,
@@ -911,17 +920,20 @@ class UAS_ShotManager_OT_Create_Shots_From_OTIO_Adv(Operator):
                 # audioTracksList=audioTracksToImport,
                 # animaticFile=self.animaticFile if self.importAnimaticInVSE else None,
             )
-            props.setCurrentShotByIndex(0)
-            props.setSelectedShotByIndex(0)
-            props.display_camerabgtools_in_properties = True
-            # props.renderContext.useOverlays = True
+            if self.previewChangesOnly:
+                self.report({"INFO"}, "Preview only, the take has not been modified. Changes listed in the log")
+            else:
+                props.setCurrentShotByIndex(0)
+                props.setSelectedShotByIndex(0)
+                props.display_camerabgtools_in_properties = True
+                # props.renderContext.useOverlays = True
 
-            try:
-                bpy.context.space_data.overlay.show_overlays = True
-            except Exception as e:
-                _logger.error_ext(f"Cannot set Overlay state back: error: {e}")
+                try:
+                    bpy.context.space_data.overlay.show_overlays = True
+                except Exception as e:
+                    _logger.error_ext(f"Cannot set Overlay state back: error: {e}")
 
-            props.getCurrentLayout().display_notes_in_properties = True
+                props.getCurrentLayout().display_notes_in_properties = True
 
             # update track list in VSM
             #            context.scene.uas_video_shot_manager.update_tracks_list()
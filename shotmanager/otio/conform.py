@@ -0,0 +1,234 @@
+# GPLv3 License
+#
+# Copyright (C) 2021 Ubisoft
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Indexed matching of the shots of a take with the shots of a reference montage, used by the conformation
+"""
+
+from pathlib import Path
+
+from ..config import sm_logging
+
+_logger = sm_logging.getLogger(__name__)
+
+
+def getRefShotName(refShot):
+    """Return the name used to match the specified reference shot with the shots of a take"""
+    return Path(refShot.get_name()).stem
+
+
+class ShotsNameIndex:
+    """Names of the shots of a take, in the order of the take, with their positions and the dictionary of these
+    names keyed by the name returned by shot.get_name(), used to match them with the shots of a reference montage
+
+    The index does not keep the shots themselves since moving shots in a collection changes the shots the
+    references are pointing to. Its functions move() and append() have to be called to mirror
+    the changes made to the shots of the take.
+    """
+
+    def __init__(self, props, takeIndex):
+        # shot.get_name() is the shot name prefixed by the sequence name and without spaces
+        self.prefix = props.getSequenceName("FULL", addSeparator=True)
+        self.shotsNames = [shot.name for shot in props.get_shots(takeIndex=takeIndex)]
+
+        # dictionary of the indices of the shots in the take, keyed by shot name
+        self._positions = {shotName: i for i, shotName in enumerate(self.shotsNames)}
+
+        self._namesByKey = dict()
+        for shotName in self.shotsNames:
+            self._namesByKey.setdefault(self.getKey(shotName), shotName)
+
+    def getKey(self, shotName):
+        """Return the value of shot.get_name() for a shot named shotName"""
+        return self.prefix + shotName.replace(" ", "_")
+
+    def getShotIndex(self, key):
+        """Return the index in the take of the shot whose get_name() is key, -1 if not found"""
+        shotName = self._namesByKey.get(key, None)
+        return -1 if shotName is None else self._positions[shotName]
+
+    def getShotIndexByName(self, shotName):
+        """Return the index in the take of the shot named shotName, -1 if not found"""
+        return self._positions.get(shotName, -1)
+
+    def move(self, fromIndex, toIndex):
+        self.shotsNames.insert(toIndex, self.shotsNames.pop(fromIndex))
+        # only the positions of the shots between the two indices change
+        for i in range(min(fromIndex, toIndex), max(fromIndex, toIndex) + 1):
+            self._positions[self.shotsNames[i]] = i
+
+    def append(self, shotName):
+        self._positions[shotName] = len(self.shotsNames)
+        self.shotsNames.append(shotName)
+        self._namesByKey.setdefault(self.getKey(shotName), shotName)
+
+
+class ConformEntry:
+    """Change to make to the take for a shot of the reference sequence"""
+
+    def __init__(self, refShot, refShotName):
+        self.refShot = refShot
+        self.refShotName = refShotName
+
+        # can be "MATCHED" for a shot found in the take, "ADDED" for a shot to create, "SKIPPED" for a reference
+        # shot belonging to another sequence, or "MISSING" for a shot not found and not created
+        self.action = "MISSING"
+
+        # name of the shot in the take, or of the shot to create
+        self.shotName = None
+        # index of the shot in the take once the previous entries have been applied, and its index once conformed
+        self.fromIndex = -1
+        self.toIndex = -1
+
+        # True if the shot is disabled and has to be enabled
+        self.enable = False
+
+        # offset to apply to the start of the shot, and its duration before and after the conformation.
+        # newDuration is None when the timing of the shots is not changed
+        self.deltaStart = 0
+        self.previousDuration = None
+        self.newDuration = None
+
+
+class ConformDiff:
+    """Changes that conformToRefMontage() makes to the shots of a take to match a reference sequence
+    Nothing is modified in the take: the diff is reported by a dry run and applied by the conformation,
+    which consumes its entries in order
+    """
+
+    def __init__(
+        self,
+        props,
+        refSeq,
+        takeIndex,
+        mediaInEDLHandlesDuration=0,
+        changeShotsTiming=True,
+        createMissingShots=True,
+    ):
+        # ConformEntry instances, in the order of the shots of the reference sequence
+        self.entries = list()
+
+        # names of the shots to create
+        self.added = list()
+        # names of the reference shots not found and not belonging to the sequence of the take
+        self.skipped = list()
+        # tupples made of the name of a shot, its current index and its index once conformed
+        self.reordered = list()
+        # tupples made of the name of a shot, the offset applied to its start and its current and new durations
+        self.retimed = list()
+        # names of the disabled shots to enable
+        self.enabled = list()
+        # names of the shots not used by the reference sequence, to disable
+        self.removed = list()
+
+        shots = props.get_shots(takeIndex=takeIndex)
+        nameIndex = ShotsNameIndex(props, takeIndex)
+        initialIndices = {shotName: i for i, shotName in enumerate(nameIndex.shotsNames)}
+
+        expectedInd = 0
+        for refShot in refSeq.getEditShots():
+            refShotName = getRefShotName(refShot)
+            entry = ConformEntry(refShot, refShotName)
+            self.entries.append(entry)
+            shotInd = nameIndex.getShotIndex(refShotName)
+
+            if -1 == shotInd:
+                if createMissingShots:
+                    if 0 == refShotName.find(nameIndex.prefix):
+                        newShotName = refShotName[len(nameIndex.prefix) :]
+                        entry.action = "ADDED"
+                        entry.shotName = newShotName
+                        entry.toIndex = expectedInd
+                        self.added.append(newShotName)
+                        nameIndex.append(newShotName)
+                        nameIndex.move(len(nameIndex.shotsNames) - 1, expectedInd)
+                        expectedInd += 1
+                    else:
+                        entry.action = "SKIPPED"
+                        self.skipped.append(refShotName)
+                continue
+
+            shotName = nameIndex.shotsNames[shotInd]
+            entry.action = "MATCHED"
+            entry.shotName = shotName
+            entry.fromIndex = shotInd
+            entry.toIndex = expectedInd
+            nameIndex.move(shotInd, expectedInd)
+            expectedInd += 1
+            if shotName not in initialIndices:
+                continue
+
+            # the take is not modified so the initial indices are still valid
+            shot = shots[initialIndices[shotName]]
+            if not shot.enabled and shotName not in self.enabled:
+                entry.enable = True
+                self.enabled.append(shotName)
+
+            if changeShotsTiming:
+                deltaStart = 0
+                if "Clip" == refShot.get_type():
+                    deltaStart = refShot.get_frame_offset_start() - mediaInEDLHandlesDuration
+                previousDuration = shot.get_frame_final_duration()
+                if 0 != deltaStart and not shot.durationLocked:
+                    previousDuration = max(1, previousDuration - deltaStart)
+                newDuration = refShot.get_frame_final_duration()
+                entry.deltaStart = deltaStart
+                entry.previousDuration = previousDuration
+                entry.newDuration = newDuration
+                if 0 != deltaStart or previousDuration != newDuration:
+                    self.retimed.append((shotName, deltaStart, previousDuration, newDuration))
+
+        addedNames = set(self.added)
+        for i, shotName in enumerate(nameIndex.shotsNames[:expectedInd]):
+            if shotName not in addedNames and initialIndices[shotName] != i:
+                self.reordered.append((shotName, initialIndices[shotName], i))
+        self.removed = nameIndex.shotsNames[expectedInd:]
+
+    def hasChanges(self):
+        return bool(
+            len(self.added) or len(self.reordered) or len(self.retimed) or len(self.enabled) or len(self.removed)
+        )
+
+    def getReport(self):
+        """Return the description of the changes as a text"""
+        if not self.hasChanges():
+            return "\n   No changes"
+
+        infoStr = ""
+
+        def _addSection(title, lines):
+            nonlocal infoStr
+            if len(lines):
+                infoStr += f"\n\n   {title} ({len(lines)}):"
+                for line in lines:
+                    infoStr += f"\n      - {line}"
+
+        _addSection("New shots", self.added)
+        _addSection("Enabled shots", self.enabled)
+        _addSection(
+            "Reordered shots", [f"{name}: from {prevInd} to {newInd}" for name, prevInd, newInd in self.reordered]
+        )
+        _addSection(
+            "Retimed shots",
+            [
+                f"{name}: offset start {deltaStart}, duration {prevDuration} -> {newDuration} fr."
+                for name, deltaStart, prevDuration, newDuration in self.retimed
+            ],
+        )
+        _addSection("Shots not used in the reference sequence (to disable)", self.removed)
+        _addSection("Reference shots from another sequence (not created)", self.skipped)
+        return infoStr
@@ -34,6 +34,8 @@ from ..utils import utils
 from ..utils import utils_vse
 
 from . import otio_wrapper as ow
+from .conform import ShotsNameIndex, ConformDiff
+from ..properties import shots_index
 
 from .. import config
 
@@ -653,7 +655,15 @@ def importAnimatic(montageOtio, sequenceName, animaticFile, offsetFrameNumber=0)
 
 # used only in functions here
 def _addNewShot(
-    props, shotName, start, end, createCameras, useMediaAsCameraBG=False, media_path=None, handlesDuration=0
+    props,
+    shotName,
+    start,
+    end,
+    createCameras,
+    useMediaAsCameraBG=False,
+    media_path=None,
+    handlesDuration=0,
+    takeIndex=-1,
 ):
 
     clipName = shotName
@@ -691,6 +701,7 @@ def _addNewShot(
                 )
 
     shot = props.addShot(
+        takeIndex=takeIndex,
         name=clipName,
         start=start,
         end=end,
@@ -727,10 +738,12 @@ def conformToRefMontage(
     videoTracksList=None,
     audioTracksList=None,
     animaticFile=None,
+    dryRun=False,
 ):
     """
     Conform / update current montage to match specified montage
     If ref_sequence_name is specified then only this sequence is compared
+    If dryRun is True then nothing is modified, the changes that would be made are only listed in the log
     """
 
     # scene = bpy.context.scene
@@ -830,6 +843,23 @@ def conformToRefMontage(
         print(infoStr)
         return _writeToLogFile(infoStr)
 
+    # the changes are computed first, then either reported (dry run) or applied to the take
+    conformDiff = ConformDiff(
+        props,
+        refSeq,
+        takeInd,
+        mediaInEDLHandlesDuration=mediaInEDLHandlesDuration,
+        changeShotsTiming=changeShotsTiming,
+        createMissingShots=createMissingShots,
+    )
+
+    if dryRun:
+        infoStr += "\n\n  Dry run, changes to apply (nothing has been modified):"
+        infoStr += conformDiff.getReport()
+        infoStr += "\n"
+        print(infoStr)
+        return _writeToLogFile(infoStr)
+
     ###################
     # update take infos
     ###################
@@ -848,316 +878,301 @@ def conformToRefMontage(
         vse_render.clearAllChannels(scene)
     utils_vse.showSecondsInVSE(False)
 
-    ###################
-    # conform order and enable state
-    ###################
-
-    # comparedShotsList = selfSeq.getEditShots(ignoreDisabled=False)  # .copy()  # .getEditShots()
-
-    # newEditShots = list()
-    numShotsInRefEdit = len(refSeq.getEditShots())
-    expectedIndInSelfEdit = 0
-    previousShotSelf = None
-    shotIndForBGCam = 0
-    for indInRefEdit, shot in enumerate(refSeq.getEditShots()):
-        shotRef = shot
-        textRef = shotRef.get_name()
-        shotRefName = Path(shotRef.get_name()).stem
-        shotRefType = shotRef.get_type()
-
-        shotSelfModifs = []
-
-        shotSelf = None
-        for sh in shotList:
-            # if sh.get_name() == shotRef.get_name():
-            # shotName = props.getRenderShotPrefix() + "_" + sh.get_name()
-            shotName = sh.get_name()
-
-            # print(f"shotName: {shotName}, shotRefName: {shotRefName}")
-            if shotName == shotRefName:
-                shotSelf = sh
-                break
-
-        if shotSelf is None:
-            # wkip pb: we have no idea of the timing for the new shot...
-
-            # media_path = Path(utils.file_path_from_url(clip.media_reference.target_url))
-            # print("Import Otio media_path: ", media_path)
-            # if not media_path.exists():
-            #     # Lets find it inside next to the xml
-            #     media_path = Path(otioFile).parent.joinpath(media_path.name)
-            #     print("** not found, so Path(self.otioFile).parent: ", Path(otioFile).parent)
-            #     print("   and new media_path: ", media_path)
-
-            if createMissingShots:
-                # seqSelfName = props.getRenderShotPrefix() + "_"
-                seqSelfName = props.getSequenceName("FULL", addSeparator=True)
-                # print(
-                #     f"here 01: seqSelfName: {seqSelfName}, shotRefName: {shotRefName}, {shotRefName.find(seqSelfName)}"
-                # )
-                # if the current ref shot name starts with the current sequence name then it is a valid shot for this sequence
-                if 0 == shotRefName.find(seqSelfName):
-                    shotRefNameWithoutPrefix = shotRefName[len(seqSelfName) :]
-
-                    frame_start_3D = 25 if previousShotSelf is None else previousShotSelf.end + 1
-                    frame_end_3D = frame_start_3D + shotRef.get_frame_final_duration() - 1
-
-                    shotSelf = _addNewShot(
-                        props,
-                        shotRefNameWithoutPrefix,
-                        frame_start_3D,
-                        frame_end_3D,
-                        createCameras,
-                        useMediaAsCameraBG=False,  # useMediaAsCameraBG,
-                        media_path="",  # media_path,
-                        handlesDuration=mediaHandlesDuration,
-                    )
-                    if shotSelf.camera is not None:
-                        shotSelf.camera.color = [0, 0, 1, 1]
+    # shots are added, moved and modified in a batch so that the UI and the current shot are updated only once
+    with props.batchEditShots():
+        ###################
+        # conform order and enable state
+        ###################
 
-                    noteStr = "New shot added from "
-                    noteStr += ref_montage.get_name()
-                    shotSelf.note01 = noteStr
+        # comparedShotsList = selfSeq.getEditShots(ignoreDisabled=False)  # .copy()  # .getEditShots()
+
+        # newEditShots = list()
+        numShotsInRefEdit = len(refSeq.getEditShots())
+
+        # the shots of the take are found by name with the index instead of being compared one by one
+        nameIndex = ShotsNameIndex(props, takeInd)
+
+        def _moveShotToIndex(shotInd, newInd):
+            # same as props.moveShotToIndex() but with the index of the shot already known
+            shotList.move(shotInd, newInd)
+            shots_index.invalidateShotsIndex(props)
+            nameIndex.move(shotInd, newInd)
+            return shotList[newInd]
+
+        previousShotSelf = None
+        shotIndForBGCam = 0
+        # names of the created shots, keyed by the names they have in the diff
+        addedShotsNames = dict()
+        for indInRefEdit, entry in enumerate(conformDiff.entries):
+            shotRef = entry.refShot
+            textRef = shotRef.get_name()
+            shotRefType = shotRef.get_type()
+
+            shotSelfModifs = []
+
+            shotSelf = None
+
+            if "ADDED" == entry.action:
+                # wkip pb: we have no idea of the timing for the new shot...
+                frame_start_3D = 25 if previousShotSelf is None else previousShotSelf.end + 1
+                frame_end_3D = frame_start_3D + shotRef.get_frame_final_duration() - 1
+
+                shotSelf = _addNewShot(
+                    props,
+                    entry.shotName,
+                    frame_start_3D,
+                    frame_end_3D,
+                    createCameras,
+                    useMediaAsCameraBG=False,  # useMediaAsCameraBG,
+                    media_path="",  # media_path,
+                    handlesDuration=mediaHandlesDuration,
+                    takeIndex=takeInd,
+                )
+                addedShotsNames[entry.shotName] = shotSelf.name
+                nameIndex.append(shotSelf.name)
+                if shotSelf.camera is not None:
+                    shotSelf.camera.color = [0, 0, 1, 1]
 
-                    shotSelf = props.moveShotToIndex(shotSelf, expectedIndInSelfEdit)
-                    expectedIndInSelfEdit += 1
+                noteStr = "New shot added from "
+                noteStr += ref_montage.get_name()
+                shotSelf.note01 = noteStr
 
-                    modifStr = f"{shotSelf.get_name()}:  "
-                    modifStr += " *** New shot ***"
+                shotSelf = _moveShotToIndex(len(shotList) - 1, entry.toIndex)
 
-                    textSelf = modifStr
-                    textSelf += " / new shot"
-                    shotSelfModifs.append(modifStr)
+                modifStr = f"{shotSelf.get_name()}:  "
+                modifStr += " *** New shot ***"
 
-                else:
-                    modifStr = "- (No shot created, ref shot belongs to another sequence)"
-                    textSelf = modifStr
-                    shotSelfModifs.append(modifStr)
+                textSelf = modifStr
+                textSelf += " / new shot"
+                shotSelfModifs.append(modifStr)
 
-            else:
-                modifStr = "-"
+            elif "SKIPPED" == entry.action:
+                modifStr = "- (No shot created, ref shot belongs to another sequence)"
                 textSelf = modifStr
                 shotSelfModifs.append(modifStr)
 
-        else:
-            modifStr = f"{shotSelf.get_name()}  "
-            textSelf = modifStr
-            shotSelfModifs.append(modifStr)
-
-            # set shot position in take edit
-            shotInd = props.getShotIndex(shotSelf)
-            if expectedIndInSelfEdit != shotInd:
-                shotSelf = props.moveShotToIndex(shotSelf, expectedIndInSelfEdit)
-
-            # newEditShots.append(shotSelf)
-            if not shotSelf.enabled:
-                modifStr = "enabled"
+            elif "MISSING" == entry.action:
+                modifStr = "-"
+                textSelf = modifStr
                 shotSelfModifs.append(modifStr)
-                textSelf += f" / {modifStr}"
-            # print(f" ++ shot name before enabled: {shotSelf.name}, enabled: {shotSelf.enabled}")
-            shotSelf.enabled = True
-
-            if changeShotsTiming:
-                # we check if the start handle is used in the edit. When the clip is a Stack we cannot know if there is a clip start frame in the handle
-                if "Clip" == shotRefType:
-                    offsetStart = shotRef.get_frame_offset_start()
-                    if offsetStart != mediaInEDLHandlesDuration:
-                        deltaStart = offsetStart - mediaInEDLHandlesDuration
-                        modifStr = f"offset start modified ({offsetStart} instead of {mediaInEDLHandlesDuration} fr.) (delta:{deltaStart})"
-                        shotSelfModifs.append(modifStr)
-                        textSelf += f" / {modifStr}"
-                        shotSelf.start += deltaStart
 
-                previousDuration = shotSelf.get_frame_final_duration()
-                newDuration = shotRef.get_frame_final_duration()
-                if previousDuration != newDuration:
-                    shotSelf.setDuration(newDuration, bypassLock=True)
-                    modifStr = f"duration changed (was {previousDuration} fr.)"
-                    shotSelfModifs.append(modifStr)
-                    textSelf += f" / {modifStr}"
+            else:
+                shotSelfInd = nameIndex.getShotIndexByName(addedShotsNames.get(entry.shotName, entry.shotName))
+                shotSelf = shotList[shotSelfInd]
 
-                shotSelf.durationLocked = True
+                modifStr = f"{shotSelf.get_name()}  "
+                textSelf = modifStr
+                shotSelfModifs.append(modifStr)
 
-            expectedIndInSelfEdit += 1
+                # set shot position in take edit
+                if entry.toIndex != shotSelfInd:
+                    shotSelf = _moveShotToIndex(shotSelfInd, entry.toIndex)
 
-            # make camera unique
-            if useMediaAsCameraBG:
-                if shotSelf.camera is not None and 1 < props.getNumSharedCamera(shotSelf.camera):
-                    camName = shotSelf.camera.name
-                    shotSelf.makeCameraUnique()
-                    modifStr = (
-                        f"camera {camName} was shared with another shot, duplicated to become {shotSelf.camera.name}"
-                    )
+                if entry.enable:
+                    modifStr = "enabled"
                     shotSelfModifs.append(modifStr)
                     textSelf += f" / {modifStr}"
+                shotSelf.enabled = True
+
+                if changeShotsTiming:
+                    # when the clip is a Stack we cannot know if there is a clip start frame in the handle,
+                    # deltaStart is then 0
+                    if 0 != entry.deltaStart:
+                        offsetStart = entry.deltaStart + mediaInEDLHandlesDuration
+                        modifStr = f"offset start modified ({offsetStart} instead of {mediaInEDLHandlesDuration} fr.) (delta:{entry.deltaStart})"
+                        shotSelfModifs.append(modifStr)
+                        textSelf += f" / {modifStr}"
+                        shotSelf.start += entry.deltaStart
 
-        ###################
-        # clear camera BG and add new ones from edit
-        ###################
-        # if clearCameraBG:
-        if shotSelf is not None:
-            if shotSelf.camera is not None:
-                # print(f"--- Adding BG to: {shotSelf.get_name()}")
-                # utils.remove_background_video_from_cam(shotSelf.camera.data)
-                shotSelf.removeBGImages()
+                    previousDuration = shotSelf.get_frame_final_duration()
+                    if entry.newDuration is not None and previousDuration != entry.newDuration:
+                        shotSelf.setDuration(entry.newDuration, bypassLock=True)
+                        modifStr = f"duration changed (was {previousDuration} fr.)"
+                        shotSelfModifs.append(modifStr)
+                        textSelf += f" / {modifStr}"
 
-                if useMediaAsCameraBG:
-                    if videoShotsFolder is None or "" == videoShotsFolder:
-                        media_path = Path(shotRef.get_media_filename())
-                    else:
-                        media_path = Path(videoShotsFolder + "/" + shotRef.get_name())
+                    shotSelf.durationLocked = True
 
-                    if "" == media_path.suffix:
-                        media_path = Path(str(media_path) + ".mp4")
+                # make camera unique
+                if useMediaAsCameraBG:
+                    if shotSelf.camera is not None and 1 < props.getNumSharedCamera(shotSelf.camera):
+                        camName = shotSelf.camera.name
+                        shotSelf.makeCameraUnique()
+                        modifStr = f"camera {camName} was shared with another shot, duplicated to become {shotSelf.camera.name}"
+                        shotSelfModifs.append(modifStr)
+                        textSelf += f" / {modifStr}"
 
-                    modifStr = f"New cam BG: {media_path.name}"
-                    textSelf += f" / {modifStr}"
+            ###################
+            # clear camera BG and add new ones from edit
+            ###################
+            # if clearCameraBG:
+            if shotSelf is not None:
+                if shotSelf.camera is not None:
+                    # print(f"--- Adding BG to: {shotSelf.get_name()}")
+                    # utils.remove_background_video_from_cam(shotSelf.camera.data)
+                    shotSelf.removeBGImages()
+
+                    if useMediaAsCameraBG:
+                        if videoShotsFolder is None or "" == videoShotsFolder:
+                            media_path = Path(shotRef.get_media_filename())
+                        else:
+                            media_path = Path(videoShotsFolder + "/" + shotRef.get_name())
+
+                        if "" == media_path.suffix:
+                            media_path = Path(str(media_path) + ".mp4")
+
+                        modifStr = f"New cam BG: {media_path.name}"
+                        textSelf += f" / {modifStr}"
 
-                    if not media_path.exists():
-                        print(f"** BG video shot not found: {media_path}")
-                        modifStr += f" (!!! Not Found in {media_path.parent})"
-                        textSelf += f" (!!! Not Found in {media_path.parent})"
-                    else:
-                        # if True:
-                        # start frame of the background video is not set here since it will be linked to the shot start frame
-                        videoAdded = utils.add_background_video_to_cam(
-                            shotSelf.camera.data, str(media_path), 0, alpha=props.shotsGlobalSettings.backgroundAlpha
-                        )
-                        if not videoAdded:
-                            utils.ShowMessageBox(
-                                message=f"The following video cannot be imported:\n   {media_path}",
-                                title="Video Not Found",
-                                icon="ERROR",
+                        if not media_path.exists():
+                            print(f"** BG video shot not found: {media_path}")
+                            modifStr += f" (!!! Not Found in {media_path.parent})"
+                            textSelf += f" (!!! Not Found in {media_path.parent})"
+                        else:
+                            # if True:
+                            # start frame of the background video is not set here since it will be linked to the shot start frame
+                            videoAdded = utils.add_background_video_to_cam(
+                                shotSelf.camera.data,
+                                str(media_path),
+                                0,
+                                alpha=props.shotsGlobalSettings.backgroundAlpha,
                             )
+                            if not videoAdded:
+                                utils.ShowMessageBox(
+                                    message=f"The following video cannot be imported:\n   {media_path}",
+                                    title="Video Not Found",
+                                    icon="ERROR",
+                                )
 
-                        # modifStr += f" (BG Added, new BG: {shotSelf.camera.data.background_images[0].clip.name})"
-                        # print(f"shotSelf.camera.data BG:{shotSelf.camera.data.background_images[0].clip.name}")
+                            # modifStr += f" (BG Added, new BG: {shotSelf.camera.data.background_images[0].clip.name})"
+                            # print(f"shotSelf.camera.data BG:{shotSelf.camera.data.background_images[0].clip.name}")
 
-                        shotSelf.bgImages_linkToShotStart = True
-                        if mediaHaveHandles:
-                            shotSelf.bgImages_offset = -1 * mediaHandlesDuration
+                            shotSelf.bgImages_linkToShotStart = True
+                            if mediaHaveHandles:
+                                shotSelf.bgImages_offset = -1 * mediaHandlesDuration
 
-                    shotSelfModifs.append(modifStr)
-
-                    ###################
-                    # use sound for cam BG
-                    ###################
-                    if useMediaSoundtrackForCameraBG:
-
-                        # store current workspace cause it may not be the Layout one
-                        # currentWorkspace = bpy.context.window.workspace
-
-                        # # creation VSE si existe pas
-                        # vse = utils.getSceneVSE(scene.name, createVseTab=True)
-                        # bpy.context.window.workspace = bpy.data.workspaces["Video Editing"]
-
-                        # for indInRefEdit, shot in enumerate(refSeq.getEditShots()):
-                        #     shotRef = shot
-                        #     textRef = shotRef.get_name()
-                        #     shotRefName = Path(shotRef.get_name()).stem
-
-                        #     media_path = Path(videoShotsFolder + "/" + shotRef.get_name())
-                        #     if "" == media_path.suffix:
-                        #         media_path = Path(str(media_path) + ".mp4")
-
-                        # if not media_path.exists():
-                        #     print(f"** Edit video shot not found for VSE: {media_path}")
-                        # else:
-
-                        #####################
-                        # trackInd = 4 + shotIndForBGCam
-                        # newClipInVSE = vse_render.createNewClip(
-                        #     scene,
-                        #     str(media_path),
-                        #     trackInd,
-                        #     # shotRef.get_frame_final_start(),  # shotSelf.start + offsetFrameNumber
-                        #     shotSelf.start,
-                        #     importVideo=False,
-                        #     importAudio=True,
-                        #     clipName=shotRefName,
-                        # )
-                        # if newClipInVSE is not None:
-                        #     shotSelf.bgImages_sound_trackIndex = newClipInVSE.channel
-
-                        trackInd = 4 + shotIndForBGCam
-                        props.addBGSoundToShot(str(media_path), shotSelf)
-
-                        # refresh properties and their update function
-                        shotSelf.bgImages_linkToShotStart = shotSelf.bgImages_linkToShotStart
-                        shotSelf.bgImages_offset = shotSelf.bgImages_offset
-
-                        shotIndForBGCam += 1
-                        pass
-
-        infoStr += printInfoLine(
-            str(indInRefEdit),
-            f"{textRef}  ({shotRefType} - {shotRef.get_frame_final_duration()} fr.)",
-            modifsSelf=shotSelfModifs,
-        )
-
-        if shotSelf is not None:
-            previousShotSelf = shotSelf
+                        shotSelfModifs.append(modifStr)
 
-    ###################
-    # fit time range
-    ###################
-    scene.use_preview_range = False
-    if len(take.shots):
-        scene.frame_start = take.shots[0].start
+                        ###################
+                        # use sound for cam BG
+                        ###################
+                        if useMediaSoundtrackForCameraBG:
+
+                            # store current workspace cause it may not be the Layout one
+                            # currentWorkspace = bpy.context.window.workspace
+
+                            # # creation VSE si existe pas
+                            # vse = utils.getSceneVSE(scene.name, createVseTab=True)
+                            # bpy.context.window.workspace = bpy.data.workspaces["Video Editing"]
+
+                            # for indInRefEdit, shot in enumerate(refSeq.getEditShots()):
+                            #     shotRef = shot
+                            #     textRef = shotRef.get_name()
+                            #     shotRefName = Path(shotRef.get_name()).stem
+
+                            #     media_path = Path(videoShotsFolder + "/" + shotRef.get_name())
+                            #     if "" == media_path.suffix:
+                            #         media_path = Path(str(media_path) + ".mp4")
+
+                            # if not media_path.exists():
+                            #     print(f"** Edit video shot not found for VSE: {media_path}")
+                            # else:
+
+                            #####################
+                            # trackInd = 4 + shotIndForBGCam
+                            # newClipInVSE = vse_render.createNewClip(
+                            #     scene,
+                            #     str(media_path),
+                            #     trackInd,
+                            #     # shotRef.get_frame_final_start(),  # shotSelf.start + offsetFrameNumber
+                            #     shotSelf.start,
+                            #     importVideo=False,
+                            #     importAudio=True,
+                            #     clipName=shotRefName,
+                            # )
+                            # if newClipInVSE is not None:
+                            #     shotSelf.bgImages_sound_trackIndex = newClipInVSE.channel
+
+                            trackInd = 4 + shotIndForBGCam
+                            props.addBGSoundToShot(str(media_path), shotSelf)
+
+                            # refresh properties and their update function
+                            shotSelf.bgImages_linkToShotStart = shotSelf.bgImages_linkToShotStart
+                            shotSelf.bgImages_offset = shotSelf.bgImages_offset
+
+                            shotIndForBGCam += 1
+                            pass
+
+            infoStr += printInfoLine(
+                str(indInRefEdit),
+                f"{textRef}  ({shotRefType} - {shotRef.get_frame_final_duration()} fr.)",
+                modifsSelf=shotSelfModifs,
+            )
 
-    if previousShotSelf is not None:
-        scene.frame_end = previousShotSelf.end
+            if shotSelf is not None:
+                previousShotSelf = shotSelf
 
-    ###################
-    # list other shots and disabled them
-    ###################
-    infoStr += f"\n\n   Shots not used in current sequence (and then disabled):"
-    infoStr += f"\n   -------------------------------------------------------\n"
+        ###################
+        # fit time range
+        ###################
+        scene.use_preview_range = False
+        if len(take.shots):
+            scene.frame_start = take.shots[0].start
 
-    ind = 0
-    for i in range(expectedIndInSelfEdit, len(shotList)):
-        shotSelfModifs = []
+        if previousShotSelf is not None:
+            scene.frame_end = previousShotSelf.end
 
-        # if shotList[i] not in newEditShots:
-        if not shotList[i].name.endswith("_removed"):
-            shotList[i].name += "__removed"
-        textSelf = shotList[i].get_name()
+        ###################
+        # list other shots and disabled them
+        ###################
+        infoStr += f"\n\n   Shots not used in current sequence (and then disabled):"
+        infoStr += f"\n   -------------------------------------------------------\n"
+
+        ind = 0
+        for removedShotName in conformDiff.removed:
+            i = nameIndex.getShotIndexByName(removedShotName)
+            shotSelfModifs = []
+
+            # if shotList[i] not in newEditShots:
+            if not shotList[i].name.endswith("_removed"):
+                shotList[i].name += "__removed"
+            textSelf = shotList[i].get_name()
+
+            # following code removed because a camera can be shared by several shots
+            # if shotList[i].camera is not None:
+            #     shotList[i].camera.color = [1, 0, 0, 1]
+
+            noteStr = "Shot removed from "
+            if "RRSpecial_ACT01_AQ_201103_TECH" == ref_montage.get_name():
+                noteStr += "Act01_Edit_Previz.xml (Oct. 4th, 2020)"
+            else:
+                noteStr += ref_montage.get_name()
+            shotList[i].note01 = noteStr
 
-        # following code removed because a camera can be shared by several shots
-        # if shotList[i].camera is not None:
-        #     shotList[i].camera.color = [1, 0, 0, 1]
+            if shotList[i].enabled:
+                shotList[i].enabled = False
+                textSelf += " / disabled"
 
-        noteStr = "Shot removed from "
-        if "RRSpecial_ACT01_AQ_201103_TECH" == ref_montage.get_name():
-            noteStr += "Act01_Edit_Previz.xml (Oct. 4th, 2020)"
-        else:
-            noteStr += ref_montage.get_name()
-        shotList[i].note01 = noteStr
+            shotSelfModifs.append(textSelf)
 
-        if shotList[i].enabled:
-            shotList[i].enabled = False
-            textSelf += " / disabled"
+            # infoStr += printInfoLine(str(ind + numShotsInRefEdit), "-", modifsSelf=shotSelfModifs)
+            infoStr += printInfoLine("", "-", modifsSelf=shotSelfModifs, jumpLine=False)
+            ind += 1
 
-        shotSelfModifs.append(textSelf)
+            ###################
+            # clear camera BG
+            ###################
+            # if clearCameraBG:
+            #     if shotList[i].camera is not None:
+            #         utils.remove_background_video_from_cam(shotList[i].camera.data)
 
-        # infoStr += printInfoLine(str(ind + numShotsInRefEdit), "-", modifsSelf=shotSelfModifs)
-        infoStr += printInfoLine("", "-", modifsSelf=shotSelfModifs, jumpLine=False)
-        ind += 1
+        if 0 == ind:
+            infoStr += printInfoLine("", "-", "-")
 
         ###################
-        # clear camera BG
+        # sort disabled shots
         ###################
-        # if clearCameraBG:
-        #     if shotList[i].camera is not None:
-        #         utils.remove_background_video_from_cam(shotList[i].camera.data)
-
-    if 0 == ind:
-        infoStr += printInfoLine("", "-", "-")
-
-    ###################
-    # sort disabled shots
-    ###################
-    props.sortShotsVersions()
+        props.sortShotsVersions()
 
     ###################
     # import sound tracks in VSE
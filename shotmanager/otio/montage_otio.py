@@ -24,7 +24,6 @@ from pathlib import Path
 
 # paths are relative in order to make the package not dependent on an add-on name
 from ..utils.utils import file_path_from_url
-from ..utils import utils_xml
 from ..properties.montage_interface import MontageInterface, SequenceInterface, ShotInterface
 
 # from ..otio import otio_wrapper as ow
@@ -36,6 +35,89 @@ from ..config import sm_logging
 _logger = sm_logging.getLogger(__name__)
 
 
+class FcpXmlIndex:
+    """Names of the clip items and video characteristics of the first sequence of a Final Cut Pro xml file,
+    read in a single streaming pass instead of loading the whole document
+    """
+
+    # path from the first sequence to its video sample characteristics
+    _samplecharacteristicsPath = ("media", "video", "format", "samplecharacteristics")
+
+    def __init__(self, xmlFile):
+        # dictionary of the names of the clip items, keyed by clip item id. As in a document search, the name of a
+        # clip item is its first descendant name element and the first clip item with a given id is used
+        self.clipNames = dict()
+
+        # rate, width and height of the video of the first sequence, None if not found
+        self.videoCharacteristics = None
+
+        self._parse(xmlFile)
+
+    def _parse(self, xmlFile):
+        from xml.etree.ElementTree import iterparse
+
+        # list of the [id, name] of the clip items being read
+        openClipItems = []
+
+        # open elements, each one being a tupple made of its tag, the set of the tags of its children already met
+        # and True if it is the first child of its parent with this tag
+        openElements = []
+
+        # depth of the first sequence in openElements, -1 before it is met and None once it is closed
+        sequenceDepth = -1
+        sampleValues = dict()
+
+        for event, elem in iterparse(xmlFile, events=("start", "end")):
+            tag = elem.tag
+            if "start" == event:
+                isFirstChild = True
+                if len(openElements):
+                    parentChildrenTags = openElements[-1][1]
+                    isFirstChild = tag not in parentChildrenTags
+                    parentChildrenTags.add(tag)
+                openElements.append((tag, set(), isFirstChild))
+
+                if "clipitem" == tag:
+                    openClipItems.append([elem.get("id", ""), None])
+                elif "sequence" == tag and -1 == sequenceDepth:
+                    sequenceDepth = len(openElements) - 1
+                continue
+
+            if "name" == tag:
+                for clipItem in openClipItems:
+                    if clipItem[1] is None:
+                        clipItem[1] = elem.text
+            elif "clipitem" == tag:
+                clipId, clipName = openClipItems.pop()
+                if clipName is not None and clipId not in self.clipNames:
+                    self.clipNames[clipId] = clipName
+
+            # values of the sample characteristics of the first sequence, reached through the first child
+            # with each tag, as utils_xml.getFirstChildWithName() does
+            if sequenceDepth is not None and 0 <= sequenceDepth:
+                if sequenceDepth == len(openElements) - 1:
+                    sequenceDepth = None
+                else:
+                    childElements = openElements[sequenceDepth + 1 :]
+                    path = tuple(e[0] for e in childElements)
+                    if path[:4] == self._samplecharacteristicsPath and 4 < len(path):
+                        if all(e[2] for e in childElements):
+                            sampleValues[path[4:]] = elem.text
+
+            openElements.pop()
+            elem.clear()
+
+        if ("width",) in sampleValues:
+            self.videoCharacteristics = {
+                "rate": {
+                    "timebase": float(sampleValues[("rate", "timebase")]),
+                    "ntsc": sampleValues[("rate", "ntsc")],
+                },
+                "width": int(sampleValues[("width",)]),
+                "height": int(sampleValues[("height",)]),
+            }
+
+
 class MontageOtio(MontageInterface):
     """ """
 
@@ -45,6 +127,10 @@ class MontageOtio(MontageInterface):
         # new properties:
         self.otioFile = None
         self.timeline = None
+
+        # index of the xml edit file, see getXmlIndex()
+        self._xmlIndex = None
+        self._xmlIndexKey = None
         # self.seqCharacteristics = None
         # self.videoCharacteristics = None
 
@@ -96,6 +182,20 @@ class MontageOtio(MontageInterface):
         duration = int(time.value)
         return duration
 
+    def getXmlIndex(self):
+        """Return the FcpXmlIndex of the edit file if it is an xml file, None otherwise
+        The index is kept by the montage and built again only when the path or the modification time of the file change
+        """
+        if self.otioFile is None or ".xml" != Path(self.otioFile).suffix.lower():
+            return None
+
+        xmlIndexKey = (str(self.otioFile), os.path.getmtime(self.otioFile))
+        if self._xmlIndexKey != xmlIndexKey:
+            _logger.debug_ext("Indexing xml edit file %s", self.otioFile, col="GRAY", tag="EDIT_IO")
+            self._xmlIndex = FcpXmlIndex(self.otioFile)
+            self._xmlIndexKey = xmlIndexKey
+        return self._xmlIndex
+
     def newSequence(self):
         if self.sequencesList is None:
             self.sequencesList = list()
@@ -134,123 +234,24 @@ class MontageOtio(MontageInterface):
 
             return -1
 
-        def _getVideoCharacteristicsFromXML(xmlDom):
-            #    print("_getVideoCharacteristicsFromXML")
-
-            # from xml.dom.minidom import parse
-            # xmlDom = parse(self.otioFile)
-
-            seq = xmlDom.getElementsByTagName("sequence")[0]
-
-            # seqCharacteristics = dict()
-
-            # seqDuration = utils_xml.getFirstChildWithName(seq, "duration")
-            # if seqDuration is not None:
-            #     seqCharacteristics = {"duration": int(seqDuration.childNodes[0].nodeValue)}
-            # seqRate = utils_xml.getFirstChildWithName(seq, "rate")
-            # if seqRate is not None:
-            #     seqRateDict = {
-            #         "timebase": float(utils_xml.getFirstChildWithName(seqRate, "timebase").childNodes[0].nodeValue),
-            #         "ntsc": utils_xml.getFirstChildWithName(seqRate, "ntsc").childNodes[0].nodeValue,
-            #     }
-            #     self.seqCharacteristics = {"rate": seqRateDict}
-
-            seqMedia = None
-            seqMediaVideo = None
-            seqMediaVideoFormat = None
-            videoSampleCharacteristics = None
-
-            videoCharacteristics = dict()
-
-            seqMedia = utils_xml.getFirstChildWithName(seq, "media")
-            if seqMedia is not None:
-                seqMediaVideo = utils_xml.getFirstChildWithName(seqMedia, "video")
-
-            if seqMediaVideo is not None:
-                seqMediaVideoFormat = utils_xml.getFirstChildWithName(seqMediaVideo, "format")
-
-            if seqMediaVideoFormat is not None:
-                videoSampleCharacteristics = utils_xml.getFirstChildWithName(
-                    seqMediaVideoFormat, "samplecharacteristics"
-                )
-
-            #    print(f"videoSampleCharacteristics: {videoSampleCharacteristics}")
-
-            if videoSampleCharacteristics is not None:
-                seqRate = utils_xml.getFirstChildWithName(videoSampleCharacteristics, "rate")
-
-                seqRateDict = {
-                    "timebase": float(utils_xml.getFirstChildWithName(seqRate, "timebase").childNodes[0].nodeValue),
-                    "ntsc": utils_xml.getFirstChildWithName(seqRate, "ntsc").childNodes[0].nodeValue,
-                }
-
-                videoCharacteristics["rate"] = seqRateDict
-                videoCharacteristics["width"] = int(
-                    utils_xml.getFirstChildWithName(videoSampleCharacteristics, "width").childNodes[0].nodeValue
-                )
-                videoCharacteristics["height"] = int(
-                    utils_xml.getFirstChildWithName(videoSampleCharacteristics, "height").childNodes[0].nodeValue
-                )
-                # videoCharacteristics["anamorphic"] = (
-                #     utils_xml.getFirstChildWithName(videoSampleCharacteristics, "anamorphic").childNodes[0].nodeValue
-                # )
-                # videoCharacteristics["pixelaspectratio"] = (
-                #     utils_xml.getFirstChildWithName(videoSampleCharacteristics, "pixelaspectratio").childNodes[0].nodeValue
-                # )
-                # videoCharacteristics["fielddominance"] = (
-                #     utils_xml.getFirstChildWithName(videoSampleCharacteristics, "fielddominance").childNodes[0].nodeValue
-                # )
-                # videoCharacteristics["colordepth"] = int(
-                #     utils_xml.getFirstChildWithName(videoSampleCharacteristics, "colordepth").childNodes[0].nodeValue
-                # )
-                # videoCharacteristics["width"] = elem.nodeValue
-                # print(f"width: {videoCharacteristics['width']}")
-                # print(f"videoCharacteristics: {videoCharacteristics}")
-
-                self.set_montage_characteristics(
-                    #  videoCharacteristics["rate"]["timebase"],
-                    resolution_x=videoCharacteristics["width"],
-                    resolution_y=videoCharacteristics["height"],
-                    #  duration=seqCharacteristics["duration"],
-                )
-
-            return ()
-
-        def _getXmlClipNames(xmlDom):
-
-            # from xml.dom.minidom import parse
-            # xmlDom = parse(self.parent.parent.otioFile)
-
-            xmlClipNamesArr = []
-
-            clipItems = xmlDom.getElementsByTagName("clipitem")
-            for item in clipItems:
-                nameItem = item.getElementsByTagName("name")[0]
-                xmlClipNamesArr.append((item.getAttribute("id"), nameItem.childNodes[0].nodeValue))
-
-            return xmlClipNamesArr
-
-        def _get_name_from_xml_clip_name(clip, xmlClipNames):
+        def _get_name_from_xml_clip_name(clip, xmlIndex):
             newName = clip.name
-            if "Stack" == type(clip).__name__:
+            if xmlIndex is not None and "Stack" == type(clip).__name__:
                 if hasattr(clip, "metadata"):
                     if "fcp_xml" in clip.metadata:
                         if "@id" in clip.metadata["fcp_xml"]:
                             clipId = clip.metadata["fcp_xml"]["@id"]
-                            for item in xmlClipNames:
-                                if item[0] == clipId:
-                                    # self.name = item[1]
-                                    newName = item[1]
-                                    break
+                            newName = xmlIndex.clipNames.get(clipId, newName)
             return newName
 
-        xmlClipNames = []
-        if ".xml" == (Path(self.otioFile).suffix).lower():
-            from xml.dom.minidom import parse
-
-            xmlDom = parse(self.otioFile)
-            _getVideoCharacteristicsFromXML(xmlDom)
-            xmlClipNames = _getXmlClipNames(xmlDom)
+        xmlIndex = self.getXmlIndex()
+        if xmlIndex is not None:
+            videoCharacteristics = xmlIndex.videoCharacteristics
+            if videoCharacteristics is not None:
+                self.set_montage_characteristics(
+                    resolution_x=videoCharacteristics["width"],
+                    resolution_y=videoCharacteristics["height"],
+                )
 
         self.sequencesList = None
         self.sequencesList = list()
@@ -310,7 +311,7 @@ class MontageOtio(MontageInterface):
                     # clip can be a nested edit (called a stack)
                     else:
                         # stackName = clip.name
-                        stackName = _get_name_from_xml_clip_name(clip, xmlClipNames)
+                        stackName = _get_name_from_xml_clip_name(clip, xmlIndex)
                         #  if config.devDebug:
                         # print(f"\n** clip: {clip.name}")
                         # print(f"Stack Seq Name: {stackName}, seq: {self.getSequenceNameFromMediaName(stackName)}")
@@ -427,56 +428,14 @@ class ShotOtio(ShotInterface):
 
         InfoStr = ""
 
-        ###############
-        # wkip note: this is SLOW SLOW becauce the whole xml file is parsed every time. It should be parsed once for all
-
         if "Stack" == clipType:
-            # InfoStr += ", b stack "
-            if self.parent.parent.otioFile is not None:
-                # InfoStr += ", in otio "
-                # InfoStr += f"\n   Otio file: {self.parent.parent.otioFile}"
-                # InfoStr += f"\n   Otio file ext: {str(Path(self.parent.parent.otioFile).suffix).lower()}"
-                if ".xml" == str(Path(self.parent.parent.otioFile).suffix).lower():
-                    # InfoStr += ", in xml "
-                    # print(f" dir clip:{dir(self.clip)}")
-                    # if "metadata" in self.clip:
-                    # print("metadata in ")
-                    if hasattr(self.clip, "metadata"):
-                        # print(f" la")
-
-                        if "fcp_xml" in self.clip.metadata:
-                            # print(f"  la la la")
-                            # InfoStr += ", in fcp_xml "
-                            if "@id" in self.clip.metadata["fcp_xml"]:
-                                # print(f"  la la la encore")
-                                # InfoStr += ", in @id "
-                                clipId = self.clip.metadata["fcp_xml"]["@id"]
-                                InfoStr += f", clip ID: {clipId}"
-
-                                from xml.dom.minidom import parse
-
-                                xmlDom = parse(self.parent.parent.otioFile)
-                                clipItems = xmlDom.getElementsByTagName("clipitem")
-
-                                for item in clipItems:
-                                    if item.getAttribute("id") == clipId:
-                                        #   print(f'item.getAttribute("id"): {item.getAttribute("id")}')
-                                        nameItem = item.getElementsByTagName("name")[0]
-                                        #   print(f"nameItem: {nameItem}")
-                                        clipName = nameItem.childNodes[0].nodeValue
-                                        # for child in nameItem.childNodes:
-                                        #     clipName = child.nodeValue
-                                        #     print(f"   child.nodeValue: {clipName}")
-                                        break
-
-                                #         subXml = item.toxml()
-                                #         # print(f" To XML: {subXml}")
-                                #         clipNameItem = item.getElementsByTagName("name")
-                                #         print(f"    clipNameItem {clipNameItem}")
-                                #         clipName = clipNameItem.data
-                                #         print(f"    clipName {clipName}")
-                                # print(f"- item: {item.getAttribute('id')}")
-                                # if item.getAttribute('id') == '':
+            xmlIndex = self.parent.parent.getXmlIndex()
+            if xmlIndex is not None and hasattr(self.clip, "metadata"):
+                if "fcp_xml" in self.clip.metadata:
+                    if "@id" in self.clip.metadata["fcp_xml"]:
+                        clipId = self.clip.metadata["fcp_xml"]["@id"]
+                        InfoStr += f", clip ID: {clipId}"
+                        clipName = xmlIndex.clipNames.get(clipId, clipName)
 
         # print(f" Clip ID: {InfoStr}")
 
@@ -102,6 +102,11 @@ class ShotClipComponent(Component2D):
         # filled when isManipulated changes
         self.manipulatedChildren = None
 
+        # True when prepareDraw() has been called before draw()
+        self._isPrepared = False
+        # vertices computed by prepareDraw(), reused by draw()
+        self._preparedVertices = None
+
         # text component #########
         self.textComponent = Text2D(
             posXIsInRegionCS=True, posYIsInRegionCS=True, posY=0, alignment="MID_LEFT", parent=self
@@ -174,8 +179,8 @@ class ShotClipComponent(Component2D):
     # functions ########
     #################################################################
 
-    # override QuadObject
-    def _getFillShader(self):
+    def getFillColor(self):
+        """Return the color of the fill of the clip, in sRGB space"""
         widColor = self.color
         opacity = self.opacity
 
@@ -196,9 +201,12 @@ class ShotClipComponent(Component2D):
             opacity = clamp(1.2 * opacity, 0, 1)
 
         color = set_color_alpha(widColor, alpha_to_linear(widColor[3] * opacity))
+        return color_to_sRGB(color)
 
+    # override QuadObject
+    def _getFillShader(self):
         UNIFORM_SHADER_2D.bind()
-        UNIFORM_SHADER_2D.uniform_float("color", color_to_sRGB(color))
+        UNIFORM_SHADER_2D.uniform_float("color", self.getFillColor())
         shader = UNIFORM_SHADER_2D
 
         return shader
@@ -226,9 +234,17 @@ class ShotClipComponent(Component2D):
 
         return shader
 
-    # override Component2D
-    def draw(self, shader=None, region=None, draw_types="TRIS", cap_lines=False, preDrawOnly=False):
+    def prepareDraw(self, region):
+        """Update the clip from its shot and compute its geometry before the draw. Used by the
+        shots stack widget to draw the fills of all the clips in a single batch
+        Return the vertices of the clip clamped to the region, None if the clip is out of the region
+        """
+        self.updateFromShot()
+        self._isPrepared = True
+        self._preparedVertices = self.computeTransformedVertices(region)
+        return self._preparedVertices
 
+    def updateFromShot(self):
         # wkip put all that in the FillShader fct?
         if self.shot.enabled:
             self.color = self.shot.color
@@ -351,9 +367,23 @@ class ShotClipComponent(Component2D):
         # handles #####################
         # -
 
+    # override QuadObject
+    def getDrawVertices(self, region):
+        if self._isPrepared:
+            return self._preparedVertices
+        return self.computeTransformedVertices(region)
+
+    # override Component2D
+    def draw(self, shader=None, region=None, draw_types="TRIS", cap_lines=False, preDrawOnly=False):
+        if not self._isPrepared:
+            self.updateFromShot()
+
         # children such as the text2D are drawn in Component2D
         Component2D.draw(self, None, region, draw_types, cap_lines, preDrawOnly=preDrawOnly)
 
+        self._isPrepared = False
+        self._preparedVertices = None
+
     ######################################################################
 
     # event actions ##############
@@ -19,14 +19,14 @@
 UI in BGL for the Interactive Shots Stack overlay tool
 """
 
-from collections import defaultdict
+from heapq import heappush, heappop
 
 import os
 from mathutils import Vector
 
 import bgl
 import gpu
-
+from gpu_extras.batch import batch_for_shader
 
 from ..shots_stack_bgl import get_lane_origin_y
 
@@ -50,6 +50,35 @@ from shotmanager.config import sm_logging
 _logger = sm_logging.getLogger(__name__)
 
 UNIFORM_SHADER_2D = gpu.shader.from_builtin("2D_UNIFORM_COLOR")
+SMOOTH_COLOR_SHADER_2D = gpu.shader.from_builtin("2D_SMOOTH_COLOR")
+
+
+def computeCompactLanes(shotIndices, starts, ends, firstLane):
+    """Sweep line allocation of the lanes of the compact mode
+    The shots are placed by increasing start and each shot goes to the lowest lane in which all the
+    shots end before its start. A new lane is created if none is available.
+    Args:
+        shotIndices: indices of the shots to place
+        starts, ends: lists of the start and end frames of all the shots, indexed by shot index
+        firstLane: index of the first lane
+    Returns:
+        the list of (shot index, lane) tupples of the placed shots, sorted by shot start
+    """
+    busyLanes = []  # heap of (end of the last shot of the lane, lane)
+    freeLanes = []  # heap of lanes
+    numLanes = 0
+    lanes = list()
+    for i in sorted(shotIndices, key=lambda i: starts[i]):
+        while len(busyLanes) and busyLanes[0][0] < starts[i]:
+            heappush(freeLanes, heappop(busyLanes)[1])
+        if len(freeLanes):
+            lane = heappop(freeLanes)
+        else:
+            lane = firstLane + numLanes
+            numLanes += 1
+        heappush(busyLanes, (ends[i], lane))
+        lanes.append((i, lane))
+    return lanes
 
 
 class ShotStackWidget:
@@ -73,6 +102,12 @@ class ShotStackWidget:
         self.previousMouseFrame = -1
 
         self.previousDrawWasInAClip = False
+
+        # lanes of the compact mode, computed only when the edit changes
+        self._compactLanes = list()
+        self._compactLanesKey = None
+        self._compactLanesTakeIndex = None
+        self._compactLanesComponents = None
         self.manipulatedComponent = None
 
         self.debug_mesh = None
@@ -247,6 +282,41 @@ class ShotStackWidget:
         else:
             self.currentShotBorder.isVisible = False
 
+    def getViewFrameRange(self):
+        """Return the range of frames, as floats, visible in the region of the widget"""
+        region = self.context.region
+        return (region.view2d.region_to_view(0, 0)[0], region.view2d.region_to_view(region.width, 0)[0])
+
+    def drawShotComponents(self, shotComponents, preDrawOnly=False):
+        """Draw the specified shot clip components. The fills of all the clips are drawn in a single batch,
+        then the lines, images and texts of each clip are drawn over them
+        """
+        region = self.context.region
+        vertices = list()
+        colors = list()
+        indices = list()
+        for shotCompo in shotComponents:
+            clampedVertices = shotCompo.prepareDraw(region)
+            shotCompo.fillIsBatched = True
+            if clampedVertices is not None and shotCompo.hasFill:
+                i = len(vertices)
+                color = shotCompo.getFillColor()
+                vertices.extend(clampedVertices)
+                colors.extend((color, color, color, color))
+                indices.extend(((i, i + 3, i + 1), (i + 1, i + 3, i + 2)))
+
+        if len(vertices) and not preDrawOnly:
+            batch = batch_for_shader(
+                SMOOTH_COLOR_SHADER_2D, "TRIS", {"pos": vertices, "color": colors}, indices=indices
+            )
+            SMOOTH_COLOR_SHADER_2D.bind()
+            bgl.glEnable(bgl.GL_BLEND)
+            batch.draw(SMOOTH_COLOR_SHADER_2D)
+            bgl.glDisable(bgl.GL_BLEND)
+
+        for shotCompo in shotComponents:
+            shotCompo.draw(None, region, preDrawOnly=preDrawOnly)
+
     def drawShots(self, preDrawOnly=False):
         props = self.context.scene.UAS_shot_manager_props
         prefs = config.getShotManagerPrefs()
@@ -254,11 +324,14 @@ class ShotStackWidget:
 
         currentShotInd = props.getCurrentShotIndex()
         selectedShotInd = props.getSelectedShotIndex()
+        takeShotsIndex = props.getShotsIndex()
+        viewStart, viewEnd = self.getViewFrameRange()
 
         debug_maxShots = 5000  # 6
 
         lane = 1 + prefs.shtStack_firstLineIndex
         shotCompoCurrent = None
+        visibleComponents = list()
         for i, shotCompo in enumerate(self.shotComponents):
             shotCompo.isCurrent = i == currentShotInd
 
@@ -270,68 +343,98 @@ class ShotStackWidget:
             if debug_maxShots < i:
                 shotCompo.isVisible = False
                 continue
-            if not shotCompo.shot.enabled and not props.interactShotsStack_displayDisabledShots:
+            if not takeShotsIndex.enabled[i] and not props.interactShotsStack_displayDisabledShots:
                 shotCompo.isVisible = False
                 continue
 
+            # clips out of the visible frame range keep their lane but are not drawn
+            if shotCompo is not self.manipulatedComponent and (
+                takeShotsIndex.ends[i] + 1 < viewStart or viewEnd < takeShotsIndex.starts[i]
+            ):
+                shotCompo.isVisible = False
+                shotCompo.isFullyClamped = True
+                lane += 1
+                continue
+
             if i == currentShotInd:
                 shotCompoCurrent = shotCompo
             shotCompo.isVisible = True
             shotCompo.posY = lane
-
-            shotCompo.draw(None, self.context.region, preDrawOnly=preDrawOnly)
+            visibleComponents.append(shotCompo)
             lane += 1
 
+        self.drawShotComponents(visibleComponents, preDrawOnly=preDrawOnly)
+
         # draw quad for current shot over the result
         self.drawCurrentShotDecoration(shotCompoCurrent, preDrawOnly=preDrawOnly)
 
+    def getCompactLanes(self):
+        """Return the list of (shot index, lane) tupples of the shots displayed in compact mode
+        The lanes are computed again only when the shots index of the take is rebuilt, meaning when shots
+        are added, removed, moved or changed in time, or when the display settings change
+        """
+        props = self.context.scene.UAS_shot_manager_props
+        prefs = config.getShotManagerPrefs()
+
+        takeShotsIndex = props.getShotsIndex()
+        if takeShotsIndex is None:
+            return []
+
+        lanesKey = (props.interactShotsStack_displayDisabledShots, prefs.shtStack_firstLineIndex)
+        if (
+            self._compactLanesTakeIndex is not takeShotsIndex
+            or self._compactLanesComponents is not self.shotComponents
+            or self._compactLanesKey != lanesKey
+        ):
+            intervals = takeShotsIndex.getIntervals(ignoreDisabled=not props.interactShotsStack_displayDisabledShots)
+            self._compactLanes = computeCompactLanes(
+                intervals.shotIndices, takeShotsIndex.starts, takeShotsIndex.ends, 1 + prefs.shtStack_firstLineIndex
+            )
+            self._compactLanesKey = lanesKey
+            self._compactLanesTakeIndex = takeShotsIndex
+            self._compactLanesComponents = self.shotComponents
+
+        return self._compactLanes
+
     def drawShots_compactMode(self, preDrawOnly=False):
         # return
         props = self.context.scene.UAS_shot_manager_props
-        prefs = config.getShotManagerPrefs()
         self.rebuildShotComponents()
 
-        currentShot = props.getCurrentShot()
-        selectedShot = props.getSelectedShot()
-
-        shotComponentsSorted = sorted(self.shotComponents, key=lambda shotCompo: shotCompo.shot.start)
+        currentShotInd = props.getCurrentShotIndex()
+        selectedShotInd = props.getSelectedShotIndex()
+        takeShotsIndex = props.getShotsIndex()
+        viewStart, viewEnd = self.getViewFrameRange()
 
-        shots_from_lane = defaultdict(list)
+        for shotCompo in self.shotComponents:
+            shotCompo.isVisible = False
 
         shotCompoCurrent = None
-        for i, shotCompo in enumerate(shotComponentsSorted):
-            if not props.interactShotsStack_displayDisabledShots and not shotCompo.shot.enabled:
-                shotCompo.isVisible = False
+        visibleComponents = list()
+        for i, lane in self.getCompactLanes():
+            shotCompo = self.shotComponents[i]
+
+            # clips out of the visible frame range are not drawn
+            if shotCompo is not self.manipulatedComponent and (
+                takeShotsIndex.ends[i] + 1 < viewStart or viewEnd < takeShotsIndex.starts[i]
+            ):
+                shotCompo.isFullyClamped = True
                 continue
-            lane = 1 + prefs.shtStack_firstLineIndex
-            if i > 0:
-                for ln, shots_in_lane in shots_from_lane.items():
-                    for s in shots_in_lane:
-                        if s.start <= shotCompo.shot.start <= s.end:
-                            break
-                    else:
-                        lane = ln
-                        break
-                else:
-                    if len(shots_from_lane):
-                        lane = max(shots_from_lane) + 1  # No free lane, make a new one.
-                    else:
-                        #   lane = ln
-                        pass
-            shots_from_lane[lane].append(shotCompo.shot)
-
-            shotCompo.isCurrent = shotCompo.shot == currentShot
+
+            shotCompo.isCurrent = i == currentShotInd
 
             # NOTE: we use _isSelected instead of the property isSelected in order
             # to avoid the call of the callback function _on_selected_changed, otherwise
             # the event loops and keep redrawing all the time
-            shotCompo._isSelected = shotCompo.shot == selectedShot
+            shotCompo._isSelected = i == selectedShotInd
 
             if shotCompo.isCurrent:
                 shotCompoCurrent = shotCompo
             shotCompo.isVisible = True
             shotCompo.posY = lane
-            shotCompo.draw(None, self.context.region, preDrawOnly=preDrawOnly)
+            visibleComponents.append(shotCompo)
+
+        self.drawShotComponents(visibleComponents, preDrawOnly=preDrawOnly)
 
         # draw quad for current shot over the result
         self.drawCurrentShotDecoration(shotCompoCurrent, preDrawOnly=preDrawOnly)
@@ -424,7 +527,7 @@ class ShotStackWidget:
         #     self.infoComponent.setModifierKeyState(False)
 
         if event.type not in ["TIMER"]:
-            _logger.debug_ext(f"event: type: {event.type}, value: {event.value}", col="GREEN", tag="SHOTSTACK_EVENT")
+            _logger.debug_ext("event: type: %s, value: %s", event.type, event.value, col="GREEN", tag="SHOTSTACK_EVENT")
 
         for shotCompo in self.shotComponents:
             if not shotCompo.isVisible:
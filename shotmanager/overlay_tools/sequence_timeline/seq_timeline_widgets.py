@@ -32,6 +32,8 @@ from shotmanager.utils.utils import clamp, color_to_sRGB, darken_color, remap, c
 from shotmanager.utils.utils_ogl import get_region_at_xy, Square
 from shotmanager.utils import utils
 from shotmanager.utils import utils_editors_3dview
+from shotmanager.properties import shots_index
+from shotmanager.ui import sm_ui_snapshot
 
 # import mathutils
 
@@ -41,6 +43,14 @@ from shotmanager.config import sm_logging
 _logger = sm_logging.getLogger(__name__)
 
 
+def _appendRect(vertices, colors, indices, x, y, sx, sy, color):
+    """Append a rectangle, defined from its bottom left corner, to the vertex buffers of a batch"""
+    i = len(vertices)
+    vertices.extend(((x, y), (x, y + sy), (x + sx, y + sy), (x + sx, y)))
+    colors.extend((color, color, color, color))
+    indices.extend(((i, i + 1, i + 2), (i, i + 2, i + 3)))
+
+
 class BL_UI_Cursor:
     def __init__(self, move_callback=None):
         self.context = None
@@ -230,7 +240,7 @@ class BL_UI_Cursor:
 
     def handle_event(self, event):
         """handle event for BL_UI_Cursor"""
-        _logger.debug_ext(f"*** handle event for BL_UI_Cursor", col="GREEN", tag="TIMELINE_EVENT")
+        _logger.debug_ext("*** handle event for BL_UI_Cursor", col="GREEN", tag="TIMELINE_EVENT")
 
         x = event.mouse_x
         y = event.mouse_y
@@ -291,220 +301,10 @@ class BL_UI_Cursor:
                 self._move_callback()
 
 
-class BL_UI_Shot:
-    def __init__(self, x, y, width, height, name, enabled, shotIsCurrent, shotIsSelected):
-        self.x = x
-        self.y = y
-        self.x_screen = x
-        self.y_screen = y
-        self.width = width
-        self.height = height
-
-        self.name = name
-        self._name_color_light = (0.9, 0.9, 0.9, 1)
-        self._name_color_dark = (0.12, 0.12, 0.12, 1)
-        self._name_color_disabled = (0.6, 0.6, 0.6, 1)
-
-        self.enabled = enabled
-        self.shotIsCurrent = shotIsCurrent
-        self.shotIsSelected = shotIsSelected
-
-        self._shot_color = (0.8, 0.3, 0.3, 1.0)
-        self._shot_color_disabled = (0.23, 0.23, 0.23, 1)
-
-        self.context = None
-        self.__inrect = False
-        self._mouse_down = False
-
-        self.color_currentShot_border = (0.92, 0.5, 0.12, 1.0)
-        self.color_currentShot_border_shadow = (0.5, 0.3, 0.1, 1.0)
-        self.color_currentShot_border_mix = (0.94, 0.3, 0.1, 1.0)
-
-        # to change also in Timeline class
-        self._bg_color = (0.14, 0.14, 0.14, 1.0)
-
-        # self.color_selectedShot_border = (0.9, 0.9, 0.2, 0.99)
-        #    self.color_selectedShot_border = (0.2, 0.2, 0.2, 0.99)  # dark gray
-        self.color_selectedShot_border = (0.95, 0.95, 0.95, 0.9)  # white
-
-    def set_location(self, x, y):
-        self.x = x
-        self.y = y
-        self.x_screen = x
-        self.y_screen = y
-
-    @property
-    def shot_color(self):
-        return self._shot_color
-
-    @shot_color.setter
-    def shot_color(self, value):
-        self._shot_color = value
-
-    def init(self, context):
-        self.context = context
-
-    def draw(self):
-        area_height = self.get_area_height()
-
-        self.x_screen = self.x
-        self.y_screen = area_height - self.y
-
-        indices = ((0, 1, 2), (0, 2, 3))
-
-        y_screen_flip = area_height - self.y_screen
-        # bottom left, top left, top right, bottom right
-        vertices = (
-            (self.x_screen, y_screen_flip),
-            (self.x_screen, y_screen_flip - self.height),
-            (self.x_screen + self.width, y_screen_flip - self.height),
-            (self.x_screen + self.width, y_screen_flip),
-        )
-
-        shader = gpu.shader.from_builtin("2D_UNIFORM_COLOR")
-        batch_panel = batch_for_shader(shader, "TRIS", {"pos": vertices}, indices=indices)
-
-        shader.bind()
-        shader.uniform_float("color", self._shot_color if self.enabled else self._shot_color_disabled)
-        bgl.glEnable(bgl.GL_BLEND)
-        batch_panel.draw(shader)
-        bgl.glDisable(bgl.GL_BLEND)
-
-        # draw vertical separators
-        line_thickness = 1
-        currentBboxBG = Square(
-            self.x_screen,
-            y_screen_flip - self.height + 1,
-            line_thickness,
-            self.height,
-            color=self._bg_color,
-            origin="BOTTOM_LEFT",
-        )
-        currentBboxBG.draw()
-
-        # draw linebar bg
-        line_thickness = 4
-        currentBboxBG = Square(
-            self.x_screen,
-            y_screen_flip - self.height + 1,
-            self.width,
-            line_thickness,
-            color=self._bg_color,
-            origin="BOTTOM_LEFT",
-        )
-        currentBboxBG.draw()
-
-        # draw line for current shot
-        if self.shotIsSelected:
-            currentBbox = Square(
-                self.x_screen,
-                y_screen_flip - self.height,
-                self.width,
-                line_thickness,
-                color=self.color_selectedShot_border,
-                origin="BOTTOM_LEFT",
-            )
-            currentBbox.draw()
-
-        if self.shotIsCurrent:
-            if self.shotIsSelected:
-                currentBbox = Square(
-                    self.x_screen,
-                    y_screen_flip - self.height,
-                    self.width,
-                    line_thickness // 2 + 1,
-                    color=self.color_currentShot_border,
-                    origin="BOTTOM_LEFT",
-                )
-                currentBbox.draw()
-            else:
-                currentBbox = Square(
-                    self.x_screen,
-                    y_screen_flip - self.height,
-                    self.width,
-                    line_thickness,
-                    color=self.color_currentShot_border,
-                    origin="BOTTOM_LEFT",
-                )
-                currentBbox.draw()
-
-        blf.position(0, self.x_screen + 3, y_screen_flip - self.height * 0.5, 0)
-
-        if self.enabled:
-            if color_is_dark(self._shot_color, 0.4):
-                blf.color(0, *self._name_color_light)
-            else:
-                blf.color(0, *self._name_color_dark)
-        else:
-            blf.color(0, *self._name_color_disabled)
-
-        blf.shadow(0, 3, 0.1, 0.1, 0.1, 1)
-        blf.size(0, 12, 72)
-        blf.draw(0, self.name)
-
-    def handle_event(self, event):
-        """handle event for BL_UI_Shot"""
-        _logger.debug_ext(f"*** handle event for BL_UI_Shot", col="GREEN", tag="TIMELINE_EVENT")
-
-        x = event.mouse_region_x
-        y = event.mouse_region_y
-
-        if event.type == "LEFTMOUSE":
-            if event.value == "PRESS":
-                self._mouse_down = True
-                return self.mouse_down(x, y)
-            else:
-                self._mouse_down = False
-                self.mouse_up(x, y)
-
-        elif event.type == "MOUSEMOVE":
-            self.mouse_move(x, y)
-
-            inrect = self.is_in_rect(x, y)
-
-            # we enter the rect
-            if not self.__inrect and inrect:
-                self.__inrect = True
-                self.mouse_enter(event, x, y)
-
-            # we are leaving the rect
-            elif self.__inrect and not inrect:
-                self.__inrect = False
-                self.mouse_exit(event, x, y)
-
-            return False
-
-        return False
-
-    def get_area_height(self):
-        return self.context.area.height
-
-    def is_in_rect(self, x, y):
-        area_height = self.get_area_height()
-
-        widget_y = area_height - self.y_screen
-        if (self.x_screen <= x <= (self.x_screen + self.width)) and (widget_y >= y >= (widget_y - self.height)):
-            return True
-
-        return False
-
-    def mouse_down(self, x, y):
-        return self.is_in_rect(x, y)
-
-    def mouse_up(self, x, y):
-        pass
-
-    def mouse_enter(self, event, x, y):
-        pass
-
-    def mouse_exit(self, event, x, y):
-        pass
-
-    def mouse_move(self, x, y):
-        pass
+class BL_UI_Timeline:
 
+    SMOOTH_COLOR_SHADER_2D = gpu.shader.from_builtin("2D_SMOOTH_COLOR")
 
-class BL_UI_Timeline:
     def __init__(self, x, y, width, height, target_area=None):
         self.context = None
         self.x = x
@@ -522,7 +322,25 @@ class BL_UI_Timeline:
         # to change also in shot class, except for opacity
         self._bg_color = (0.14, 0.14, 0.14, 0.85)
 
-        self.ui_shots = list()
+        # same as in shot class
+        self._shot_bg_color = (0.14, 0.14, 0.14, 1.0)
+        self._shot_color_disabled = (0.23, 0.23, 0.23, 1)
+        self._name_color_light = (0.9, 0.9, 0.9, 1)
+        self._name_color_dark = (0.12, 0.12, 0.12, 1)
+        self._name_color_disabled = (0.6, 0.6, 0.6, 1)
+        self.color_currentShot_border = (0.92, 0.5, 0.12, 1.0)
+        self.color_selectedShot_border = (0.95, 0.95, 0.95, 0.9)  # white
+
+        # the background and the shots are drawn with a single batch, rebuilt only when the data of the file
+        # has been updated (depsgraph updates, invalidations of the shots index) or when the area size changes.
+        # The carets are the only per-frame geometry
+        self._shotsBatch = None
+        self._shotsBatchKey = None
+        # list of (shot index, x, width, start, end) of the displayed shots
+        self._shotsLayout = list()
+        # list of (x, y, name, color) of the shot names
+        self._shotsLabels = list()
+        self._currentShotIndex = -1
         self.frame_cursor = BL_UI_Cursor(self.frame_cursor_moved)
         self.frame_cursor_forShotPlayMode = BL_UI_Cursor(self.frame_cursor_moved)
 
@@ -545,111 +363,162 @@ class BL_UI_Timeline:
         self.frame_cursor.init(context)
         self.frame_cursor_forShotPlayMode.init(context, cursor_forShotPlayMode=True)
 
-    def draw_caret(self, x, color):
-        caret_width = 3
-        area_height = self.get_area_height()
-
-        y = self.height + self.y_offset
-        x_screen = x
+    def _buildShotsBatch(self, props):
+        """Build the batch of the background and of the rectangles of the shots, as well as the layout
+        of the shots used to place the carets and the names"""
+        currentShotIndex = props.getCurrentShotIndex()
+        selectedShotIndex = props.getSelectedShotIndex()
+        takeShotsIndex = props.getShotsIndex()
+        shots = props.get_shots()
+        self._currentShotIndex = currentShotIndex
 
-        indices = ((0, 1, 2), (0, 2, 3))
+        vertices = list()
+        colors = list()
+        indices = list()
+        self._shotsLayout = list()
+        self._shotsLabels = list()
 
-        y_screen_flip = area_height - self.y_screen
-        # bottom left, top left, top right, bottom right
-        vertices = (
-            (x_screen, y_screen_flip),
-            (x_screen, y_screen_flip - self.height),
-            (x_screen + caret_width, y_screen_flip - self.height),
-            (x_screen + caret_width, y_screen_flip),
+        # timeline background. We add +1 to get a thin bg line at the top of the timeline
+        _appendRect(
+            vertices, colors, indices, self.x, self.y + 1 - self.height, self.width, self.height, self._bg_color
         )
 
-        shader = gpu.shader.from_builtin("2D_UNIFORM_COLOR")
-        batch_panel = batch_for_shader(shader, "TRIS", {"pos": vertices}, indices=indices)
-
-        shader.bind()
-        # shader.uniform_float ( "color", ( 1., .1, .1, 1 ) )
-        shader.uniform_float("color", color)
-        bgl.glEnable(bgl.GL_BLEND)
-        batch_panel.draw(shader)
-        bgl.glDisable(bgl.GL_BLEND)
-
-    def draw_frame_caret(self, x, frame_width, color):
-        caret_width = frame_width
-        caret_height = self.height * 0.35
-        area_height = self.get_area_height()
+        if takeShotsIndex is not None:
+            intervals = takeShotsIndex.getIntervals(ignoreDisabled=not props.seqTimeline_displayDisabledShots)
+            total_range = intervals.getEditDuration()
+            y_bottom = self.y - self.height
+            line_thickness = 4
+            offset_x = 0
+            for i in intervals.shotIndices:
+                start = takeShotsIndex.starts[i]
+                end = takeShotsIndex.ends[i]
+                enabled = takeShotsIndex.enabled[i]
+                size_x = int(self.width * float(end + 1 - start) / total_range)
+                shot_color = tuple(color_to_sRGB(shots[i].color))
+
+                _appendRect(
+                    vertices,
+                    colors,
+                    indices,
+                    offset_x,
+                    y_bottom,
+                    size_x,
+                    self.height,
+                    shot_color if enabled else self._shot_color_disabled,
+                )
+                # vertical separator
+                _appendRect(vertices, colors, indices, offset_x, y_bottom + 1, 1, self.height, self._shot_bg_color)
+                # linebar bg
+                _appendRect(
+                    vertices, colors, indices, offset_x, y_bottom + 1, size_x, line_thickness, self._shot_bg_color
+                )
+                if i == selectedShotIndex:
+                    _appendRect(
+                        vertices,
+                        colors,
+                        indices,
+                        offset_x,
+                        y_bottom,
+                        size_x,
+                        line_thickness,
+                        self.color_selectedShot_border,
+                    )
+                if i == currentShotIndex:
+                    _appendRect(
+                        vertices,
+                        colors,
+                        indices,
+                        offset_x,
+                        y_bottom,
+                        size_x,
+                        line_thickness // 2 + 1 if i == selectedShotIndex else line_thickness,
+                        self.color_currentShot_border,
+                    )
 
-        y = caret_height + self.y_offset
-        x_screen = x
+                if enabled:
+                    if color_is_dark(shot_color, 0.4):
+                        name_color = self._name_color_light
+                    else:
+                        name_color = self._name_color_dark
+                else:
+                    name_color = self._name_color_disabled
+                self._shotsLabels.append((offset_x + 3, self.y - self.height * 0.5, shots[i].name, name_color))
 
-        indices = ((0, 1, 2), (0, 2, 3))
+                self._shotsLayout.append((i, offset_x, size_x, start, end))
+                offset_x += size_x
 
-        y_screen_flip = area_height - self.y_screen
-        # bottom left, top left, top right, bottom right
-        vertices = (
-            (x_screen, y_screen_flip - self.height),
-            (x_screen, y_screen_flip - self.height + caret_height),
-            (x_screen + caret_width, y_screen_flip - self.height + caret_height),
-            (x_screen + caret_width, y_screen_flip - self.height),
+        self._shotsBatch = batch_for_shader(
+            self.SMOOTH_COLOR_SHADER_2D, "TRIS", {"pos": vertices, "color": colors}, indices=indices
         )
 
-        shader = gpu.shader.from_builtin("2D_UNIFORM_COLOR")
-        batch_panel = batch_for_shader(shader, "TRIS", {"pos": vertices}, indices=indices)
-
-        shader.bind()
-        # shader.uniform_float("color", (1.0, 0.1, 0.1, 1))
-        shader.uniform_float("color", color)
-        bgl.glEnable(bgl.GL_BLEND)
-        batch_panel.draw(shader)
-        bgl.glDisable(bgl.GL_BLEND)
+    def draw_carets(self, currentShotIndex):
+        """Draw the carets of the current frame in a single batch"""
+        current_frame = self.context.scene.frame_current
+        shots_play_mode = self.context.window_manager.UAS_shot_manager_shots_play_mode
+        caret_color = (1.0, 0.1, 0.1, 1) if shots_play_mode else (0.1, 1.0, 0.1, 1)
+        frame_caret_color = darken_color(caret_color)
+        caret_width = 3
+        caret_height = self.height * 0.35
+        y_bottom = self.y - self.height
+
+        vertices = list()
+        colors = list()
+        indices = list()
+        for i, offset_x, size_x, start, end in self._shotsLayout:
+            if shots_play_mode:
+                if currentShotIndex != i:
+                    continue
+            elif not start <= current_frame <= end:
+                continue
+            frame_width = size_x / float(end + 1 - start)
+            caret_pos = offset_x + (current_frame - start) * frame_width
+            _appendRect(vertices, colors, indices, caret_pos, y_bottom, frame_width, caret_height, frame_caret_color)
+            _appendRect(vertices, colors, indices, caret_pos, y_bottom, caret_width, self.height, caret_color)
+
+        if len(vertices):
+            batch = batch_for_shader(
+                self.SMOOTH_COLOR_SHADER_2D, "TRIS", {"pos": vertices, "color": colors}, indices=indices
+            )
+            self.SMOOTH_COLOR_SHADER_2D.bind()
+            bgl.glEnable(bgl.GL_BLEND)
+            batch.draw(self.SMOOTH_COLOR_SHADER_2D)
+            bgl.glDisable(bgl.GL_BLEND)
 
     def draw_shots(self):
         props = self.context.scene.UAS_shot_manager_props
 
-        shots = props.get_shots()
-        currentShotIndex = props.getCurrentShotIndex()
-        selectedShotIndex = props.getSelectedShotIndex()
-
-        self.ui_shots.clear()
-
-        total_range = props.getEditDuration(ignoreDisabled=not props.seqTimeline_displayDisabledShots)
-        offset_x = 0
-        for i, shot in enumerate(shots):
-            if not props.seqTimeline_displayDisabledShots and not shot.enabled:
-                continue
-            size_x = int(self.width * float(shot.end + 1 - shot.start) / total_range)
-            s = BL_UI_Shot(
-                offset_x,
-                self.y,
-                size_x,
-                self.height,
-                shot.name,
-                shot.enabled,
-                i == currentShotIndex,
-                i == selectedShotIndex,
-            )
-            s.init(self.context)
-            s.shot_color = tuple(color_to_sRGB(shot.color))
-            self.ui_shots.append(s)
-
-            s.draw()
+        # the edits of the shots, their colors and the changes of current take or shot all come with a depsgraph
+        # update or an invalidation of the shots index, so the shots are not read at each redraw
+        batchKey = (
+            sm_ui_snapshot.getUpdatesCounter(),
+            shots_index.getGeneration(),
+            props.as_pointer(),
+            props.current_take_name,
+            props.current_shot_index,
+            props.selected_shot_index,
+            props.seqTimeline_displayDisabledShots,
+            self.width,
+            self.height,
+            self.y,
+            self._bg_color,
+        )
+        if self._shotsBatch is None or self._shotsBatchKey != batchKey:
+            self._buildShotsBatch(props)
+            self._shotsBatchKey = batchKey
 
-            caret_pos = offset_x + (self.context.scene.frame_current - shot.start) * size_x / float(
-                shot.end + 1 - shot.start
-            )
-            frame_width = size_x / float(shot.end + 1 - shot.start)
+        self.SMOOTH_COLOR_SHADER_2D.bind()
+        bgl.glEnable(bgl.GL_BLEND)
+        self._shotsBatch.draw(self.SMOOTH_COLOR_SHADER_2D)
+        bgl.glDisable(bgl.GL_BLEND)
 
-            if self.context.window_manager.UAS_shot_manager_shots_play_mode:
-                if currentShotIndex == i:
-                    caret_color = (1.0, 0.1, 0.1, 1)
-                    self.draw_frame_caret(caret_pos, frame_width, darken_color(caret_color))
-                    self.draw_caret(caret_pos, caret_color)
-            else:
-                if shot.start <= self.context.scene.frame_current and self.context.scene.frame_current <= shot.end:
-                    caret_color = (0.1, 1.0, 0.1, 1)
-                    self.draw_frame_caret(caret_pos, frame_width, darken_color(caret_color))
-                    self.draw_caret(caret_pos, caret_color)
+        blf.shadow(0, 3, 0.1, 0.1, 0.1, 1)
+        blf.size(0, 12, 72)
+        for x, y, name, name_color in self._shotsLabels:
+            blf.position(0, x, y, 0)
+            blf.color(0, *name_color)
+            blf.draw(0, name)
 
-            offset_x += int(self.width * float(shot.end + 1 - shot.start) / total_range)
+        self.draw_carets(self._currentShotIndex)
 
     def draw(self):
         if self.target_area is not None and self.context.area != self.target_area:
@@ -662,27 +531,6 @@ class BL_UI_Timeline:
         self.x_screen = self.x
         self.y_screen = area_height - self.y
 
-        indices = ((0, 1, 2), (0, 2, 3))
-
-        # we add +1 to get a thin bg line at the top of the timeline
-        y_screen_flip = area_height - self.y_screen + 1
-        # bottom left, top left, top right, bottom right
-        vertices = (
-            (self.x_screen, y_screen_flip),
-            (self.x_screen, y_screen_flip - self.height),
-            (self.x_screen + self.width, y_screen_flip - self.height),
-            (self.x_screen + self.width, y_screen_flip),
-        )
-
-        shader = gpu.shader.from_builtin("2D_UNIFORM_COLOR")
-        batch_panel = batch_for_shader(shader, "TRIS", {"pos": vertices}, indices=indices)
-
-        shader.bind()
-        shader.uniform_float("color", self._bg_color)
-        bgl.glEnable(bgl.GL_BLEND)
-        batch_panel.draw(shader)
-        bgl.glDisable(bgl.GL_BLEND)
-
         self.draw_shots()
         if self.context.window_manager.UAS_shot_manager_shots_play_mode:
             self.frame_cursor_forShotPlayMode.draw()
@@ -185,7 +185,13 @@ class MontageInterface(object):
         ###################
 
         comparedShotsList = selfSeq.getEditShots(ignoreDisabled=False)
-        newEditShots = list()
+
+        # indices of the compared shots keyed by name, the first shot being used when names are the same
+        comparedShotsIndices = dict()
+        for i, sh in enumerate(comparedShotsList):
+            comparedShotsIndices.setdefault(sh.get_name(), i)
+        newEditShotsIndices = set()
+
         numShotsInRefEdit = len(refSeq.getEditShots())
         for i, shot in enumerate(refSeq.getEditShots()):
             shotRef = shot
@@ -193,14 +199,10 @@ class MontageInterface(object):
             shotRefName = Path(shotRef.get_name()).stem
 
             shotSelf = None
-            for sh in comparedShotsList:
-                # if sh.get_name() == shotRef.get_name():
-                shotName = sh.get_name()
-                # print(f"shotName: {shotName}, shotRefName: {shotRefName}")
-                if shotName == shotRefName:
-                    shotSelf = sh
-                    newEditShots.append(shotSelf)
-                    break
+            shotSelfInd = comparedShotsIndices.get(shotRefName, None)
+            if shotSelfInd is not None:
+                shotSelf = comparedShotsList[shotSelfInd]
+                newEditShotsIndices.add(shotSelfInd)
 
             if shotSelf is None:
                 textSelf = "** Not found **"
@@ -230,7 +232,7 @@ class MontageInterface(object):
         print("\n\n       Shots not used in current sequence (set to disabled):")
         ind = 0
         for i, sh in enumerate(comparedShotsList):
-            if sh not in newEditShots:
+            if i not in newEditShotsIndices:
                 # sh.enabled = False
                 textSelf = sh.get_name() + " / to disable"
                 printInfoLine(str(ind + numShotsInRefEdit), "-", textSelf)
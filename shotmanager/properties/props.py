@@ -47,6 +47,9 @@ from .shot import UAS_ShotManager_Shot
 from .shots_global_settings import UAS_ShotManager_ShotsGlobalSettings
 from .take import UAS_ShotManager_Take
 from .layout_settings import UAS_ShotManager_LayoutSettings
+from . import shots_index
+from . import storyboard_frames_display
+from . import shots_batch_edit
 
 from shotmanager.warnings import warnings
 from ..retimer.retimer_props import UAS_Retimer_Properties
@@ -1245,6 +1248,11 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
         currentTakeInd = self.getCurrentTakeIndex()
         currentShotInd = self.getCurrentShotIndex()
 
+        # when only the current shot has changed since the last full update then only the frames of the
+        # previous and of the new current shots can have a different display state
+        if not forceHide and self._updateStoryboardFramesDisplay_currentShotOnly(currentTakeInd, currentShotInd):
+            return
+
         # first all the stb frames of all the takes are hidden
         for tInd, take in enumerate(self.getTakes()):
             for shotInd, sh in enumerate(take.shots):
@@ -1278,6 +1286,61 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
                         sh.showGreasePencil()
                 break
 
+        if forceHide:
+            storyboard_frames_display.invalidateDisplayState(self)
+        else:
+            state = storyboard_frames_display.StoryboardFramesDisplayState(
+                currentTakeInd, self.getShotsIndex(currentTakeInd), self.use_greasepencil, currentShotInd
+            )
+            if -1 != currentTakeInd:
+                for shotInd, sh in enumerate(self.getTakes()[currentTakeInd].shots):
+                    gp_child = sh.getGreasePencilObject(mode="STORYBOARD")
+                    if gp_child is not None and sh.getGreasePencilProps(mode="STORYBOARD") is not None:
+                        state.framesOwners[gp_child.as_pointer()] = shotInd
+            storyboard_frames_display.setDisplayState(self, state)
+
+    def _updateStoryboardFramesDisplay_currentShotOnly(self, currentTakeInd, currentShotInd):
+        """Update the display of the storyboard frames of the previous and of the new current shots from the
+        state cached by the last full call to updateStoryboardFramesDisplay()
+        Return False, without changing anything, if the cached state cannot be used
+        """
+        state = storyboard_frames_display.getDisplayState(self)
+        if state is None or -1 == currentTakeInd or not state.isValidFor(self, currentTakeInd):
+            return False
+
+        # a call with the same current shot is an explicit refresh
+        if state.currentShotIndex == currentShotInd:
+            return False
+
+        shots = self.getTakes()[currentTakeInd].shots
+        ownersToUpdate = list()
+        for shotInd in (state.currentShotIndex, currentShotInd):
+            if not 0 <= shotInd < len(shots):
+                continue
+            gp_child = shots[shotInd].getGreasePencilObject(mode="STORYBOARD")
+            if gp_child is None:
+                continue
+            ownerInd = state.framesOwners.get(gp_child.as_pointer(), None)
+            if ownerInd is None:
+                return False
+            # the owner may have a different frame if its camera has been changed
+            if ownerInd != shotInd and shots[ownerInd].getGreasePencilObject(mode="STORYBOARD") != gp_child:
+                return False
+            if ownerInd not in ownersToUpdate:
+                ownersToUpdate.append(ownerInd)
+
+        _logger.debug_ext(
+            "Updating storyboard frames display from shot %s to shot %s",
+            state.currentShotIndex,
+            currentShotInd,
+            col="GRAY",
+            tag="GREASE_PENCIL",
+        )
+        for ownerInd in ownersToUpdate:
+            shots[ownerInd].showGreasePencil()
+        state.currentShotIndex = currentShotInd
+        return True
+
     # def updateGreasePencilVisibility(self, take):
     #     """Update the display of grease pencil objects of the specified take"""
     #     for sh in take.shots:
@@ -2534,6 +2597,7 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
             atValidIndex = min(atValidIndex, len(takes) - 1)
             takes.move(len(takes) - 1, atValidIndex)
             newTake = takes[atValidIndex]
+        shots_index.invalidateShotsIndex(self)
 
         # after a move newTake is different!
         # print(f"new added take name02: {newTake.name}")
@@ -2573,6 +2637,7 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
                 return -1
 
         self.takes.move(takeInd, newInd)
+        shots_index.invalidateShotsIndex(self)
         self.setCurrentTakeByIndex(newInd)
 
         return newInd
@@ -2797,23 +2862,11 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
 
     def getEditDuration(self, ignoreDisabled=True, takeIndex=-1):
         """Return edit duration in frames"""
-        takeInd = (
-            self.getCurrentTakeIndex()
-            if -1 == takeIndex
-            else (takeIndex if 0 <= takeIndex and takeIndex < len(self.getTakes()) else -1)
-        )
-        duration = -1
-        if -1 == takeInd:
+        takeShotsIndex = self.getShotsIndex(takeIndex=takeIndex)
+        if takeShotsIndex is None:
             return -1
 
-        shotList = self.getShotsList(ignoreDisabled=ignoreDisabled, takeIndex=takeIndex)
-
-        if 0 < len(shotList):
-            duration = 0
-            for sh in shotList:
-                duration += sh.getDuration()
-
-        return duration
+        return takeShotsIndex.getIntervals(ignoreDisabled).getEditDuration()
 
     def getEditTime(self, referenceShot, frameIndexIn3DTime, referenceLevel="TAKE", ignoreDisabled=True):
         """Return edit current time in frames, -1 if no shots or if current shot is disabled
@@ -2826,38 +2879,59 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
         if referenceShot is None:
             return frameIndInEdit
 
-        takeInd = referenceShot.getParentTakeIndex()
-        # ignoreDisabled = True
-
         # case where specified shot is disabled -- current shot may not be in the shot list if shotList is not the whole list
         if ignoreDisabled and not referenceShot.enabled:
             return -1
 
         # specified time must be in the range of the specifed shot!!!
-        # get the whole shots list
-        shotList = self.getShotsList(ignoreDisabled=ignoreDisabled, takeIndex=takeInd)
+        if not (referenceShot.start <= frameIndexIn3DTime and frameIndexIn3DTime <= referenceShot.end):
+            return -1
 
-        if 0 < len(shotList):
-            if referenceShot.start <= frameIndexIn3DTime and frameIndexIn3DTime <= referenceShot.end:
-                frameIndInEdit = 0
-                shotInd = 0
-                while shotInd < len(shotList) and referenceShot != shotList[shotInd]:
-                    #         print("    While: shotInd: " + str(shotInd) + ", referenceShot: " + str(referenceShot) + ", shotList[shotInd]: " + str(shots[shotInd]))
-                    #         print("    frameIndInEdit: ", frameIndInEdit)
-                    if not ignoreDisabled or shotList[shotInd].enabled:
-                        frameIndInEdit += shotList[shotInd].getDuration()
-                    shotInd += 1
-
-                frameIndInEdit += frameIndexIn3DTime - referenceShot.start
-
-                if "GLOBAL_EDIT" == referenceLevel:
-                    frameIndInEdit += referenceShot.getParentTake().startInGlobalEdit
-                else:
-                    # at take level
-                    frameIndInEdit += self.editStartFrame  # at project level
+        location = shots_index.getShotLocation(self, referenceShot)
+        if location is None:
+            return -1
+        takeInd, shotInd = location
+
+        # the durations of the previous shots are summed in the cached shots index
+        takeShotsIndex = shots_index.getTakeShotsIndex(self, takeInd)
+        frameIndInEdit = takeShotsIndex.getIntervals(ignoreDisabled).getEditStart(shotInd)
+        frameIndInEdit += frameIndexIn3DTime - referenceShot.start
+
+        if "GLOBAL_EDIT" == referenceLevel:
+            frameIndInEdit += self.takes[takeInd].startInGlobalEdit
+        else:
+            # at take level
+            frameIndInEdit += self.editStartFrame  # at project level
 
         return frameIndInEdit
 
+    def getFrameFromEditTime(self, editTime, referenceLevel="TAKE", ignoreDisabled=True, takeIndex=-1):
+        """Return a tupple made of the shot at the specified edit time and the corresponding frame in the 3D time,
+        (None, -1) if the edit time is out of the edit.
+        This is the reverse of getEditTime().
+        referenceLevel can be "TAKE" or "GLOBAL_EDIT"
+        """
+        takeInd = (
+            self.getCurrentTakeIndex()
+            if -1 == takeIndex
+            else (takeIndex if 0 <= takeIndex and takeIndex < len(self.getTakes()) else -1)
+        )
+        if -1 == takeInd:
+            return (None, -1)
+
+        if "GLOBAL_EDIT" == referenceLevel:
+            editTimeInTake = editTime - self.takes[takeInd].startInGlobalEdit
+        else:
+            editTimeInTake = editTime - self.editStartFrame
+
+        takeShotsIndex = shots_index.getTakeShotsIndex(self, takeInd)
+        shotInd, offset = takeShotsIndex.getIntervals(ignoreDisabled).getShotIndexAtEditTime(editTimeInTake)
+        if -1 == shotInd:
+            return (None, -1)
+
+        shot = self.takes[takeInd].shots[shotInd]
+        return (shot, shot.start + offset)
+
     def getEditCurrentTime(self, referenceLevel="TAKE", ignoreDisabled=True):
         """Return edit current time in frames, -1 if no shots or if current shot is disabled and ignoreDisabled is True
         works only on current take
@@ -2943,20 +3017,14 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
             else (takeIndex if 0 <= takeIndex and takeIndex < len(self.getTakes()) else -1)
         )
         if -1 == takeInd:
-            return uniqueName
+            return nameToMakeUnique
 
-        shotList = self.getShotsList(ignoreDisabled=False, takeIndex=takeIndex)
+        shotsNames = {s.name.lower() for s in self.getShotsList(ignoreDisabled=False, takeIndex=takeInd)}
         uniqueName = nameToMakeUnique
         ind = 1
-        restartLoop = True
-        while restartLoop:
-            restartLoop = False
-            for s in shotList:
-                if uniqueName.lower() == s.name.lower():
-                    uniqueName = f"{nameToMakeUnique}.{ind:03}"
-                    ind += 1
-                    restartLoop = True
-                    break
+        while uniqueName.lower() in shotsNames:
+            uniqueName = f"{nameToMakeUnique}.{ind:03}"
+            ind += 1
 
         # dup_name = False
         # for shot in shotList:
@@ -3000,12 +3068,21 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
         newShot = None
         shots = self.get_shots(takeIndex=takeInd)
 
+        # in a batch edition the unique name is found with the names set of the batch instead of
+        # the name setter, which walks the whole shots list
+        batchEdit = shots_batch_edit.getBatchEdit(self)
+        if batchEdit is not None:
+            uniqueName = batchEdit.getUniqueShotName(self, name, takeInd)
+
         newShot = shots.add()  # shot is added at the end
         newShot.parentScene = self.getParentScene()
         # newShot.parentTakeIndex = takeInd
         newShot.shotType = shotType
         newShot.initialize(self.getTakeByIndex(currentTakeInd))
-        newShot.name = name
+        if batchEdit is None:
+            newShot.name = name
+        else:
+            newShot["name"] = uniqueName
         newShot.enabled = enabled
         newShot.end = 9999999  # mandatory cause start is clamped by end
         newShot.start = start
@@ -3023,6 +3100,7 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
             shots.move(len(shots) - 1, atValidIndex)
             newShot = shots[atValidIndex]
             newShotInd = atValidIndex
+        shots_index.invalidateShotsIndex(self)
 
         if addGreasePencilStoryboard:
             # newShot.addGreasePencil(mode=shotType)
@@ -3030,8 +3108,13 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
 
         # update the current take if needed
         if takeInd == currentTakeInd:
-            self.setCurrentShotByIndex(newShotInd)
-            self.setSelectedShotByIndex(newShotInd)
+            if batchEdit is None:
+                self.setCurrentShotByIndex(newShotInd)
+                self.setSelectedShotByIndex(newShotInd)
+            else:
+                batchEdit.currentShotIndex = newShotInd
+                batchEdit.selectedShotIndex = newShotInd
+                batchEdit.currentTakeChanged = True
 
         # warning: by reordering the shots it looks like newShot is not pointing anymore on the new shot
         # we then get it again
@@ -3039,6 +3122,63 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
 
         return newShot
 
+    def batchEditShots(self):
+        """Return a context manager in which shots can be added, modified and removed without triggering
+        the UI refresh and the change of the current shot for each of them. These side effects are applied
+        once, when the context is exited. Eg:
+            with props.batchEditShots():
+                for i in range(500):
+                    props.addShot(name=f"Sh{i:03}", start=i * 10, end=i * 10 + 9)
+        """
+        return shots_batch_edit.batchEditShots(self)
+
+    def addShots(self, shotsArgs, atIndex=-1, takeIndex=-1):
+        """Add several shots at once in the specified take
+        Return the list of the newly added shots
+        Args:
+            shotsArgs:  list of dictionaries of the arguments of addShot() for each shot, except atIndex and takeIndex
+            atIndex:    index of the first added shot, the other ones being placed after it. If -1 the shots are
+                        added at the end of the shots list
+        """
+        takeInd = (
+            self.getCurrentTakeIndex()
+            if -1 == takeIndex
+            else (takeIndex if 0 <= takeIndex and takeIndex < len(self.getTakes()) else -1)
+        )
+        if -1 == takeInd:
+            print("AddShots: Failed")
+            return []
+
+        shots = self.get_shots(takeIndex=takeInd)
+        firstShotInd = len(shots) if -1 == atIndex else min(max(atIndex, 0), len(shots))
+        with self.batchEditShots():
+            for i, shotArgs in enumerate(shotsArgs):
+                self.addShot(atIndex=-1 if -1 == atIndex else firstShotInd + i, takeIndex=takeInd, **shotArgs)
+
+        # shots have to be got again since adding items to a collection may reallocate it
+        return [shots[i] for i in range(firstShotInd, firstShotInd + len(shotsArgs))]
+
+    def updateShots(self, shotsValues):
+        """Set the values of the properties of several shots at once
+        Args:
+            shotsValues: list of tupples made of a shot and of a dictionary of the values to set to its properties,
+                         keyed by property name. Eg: [(shot, {"start": 10, "end": 20, "enabled": False})]
+        """
+        with self.batchEditShots():
+            for shot, values in shotsValues:
+                values = dict(values)
+                if "start" in values and "end" in values:
+                    # both bounds are written directly so that neither is clamped by the current value of
+                    # the other one nor shifted twice when the duration is locked. Setting start again then
+                    # fires the update of the shot once, with the new duration
+                    start = values.pop("start")
+                    end = max(start, values.pop("end"))
+                    shot["start"] = start
+                    shot["end"] = end
+                    shot.start = start
+                for propName, value in values.items():
+                    setattr(shot, propName, value)
+
     def copyCameraFromShot(self, sourceShot, targetShot=None, duplicateHierarchy=False):
         """Copy the camera from the given shot
         Return the copied camera
@@ -3187,6 +3327,18 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
             if deleteCamera:
                 self.deleteShotCamera(shots[shotIndex])
             shots.remove(shotIndex)
+            shots_index.invalidateShotsIndex(self)
+
+            batchEdit = shots_batch_edit.getBatchEdit(self)
+            if batchEdit is not None:
+                batchEdit.invalidateShotsNames()
+                if takeInd == self.getCurrentTakeIndex():
+                    batchEdit.currentTakeChanged = True
+                    # the pending current and selected shots are shifted as if they were already set
+                    for attr in ("currentShotIndex", "selectedShotIndex"):
+                        pendingInd = getattr(batchEdit, attr)
+                        if pendingInd is not None and shotIndex < pendingInd:
+                            setattr(batchEdit, attr, pendingInd - 1)
 
     def removeShot(self, shot, deleteCamera=False):
         """Remove the shot from its parent take
@@ -3195,6 +3347,16 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
         shotInd = self.getShotIndex(shot)
         self.removeShotByIndex(shotInd, deleteCamera=deleteCamera, takeIndex=shot.getParentTakeIndex())
 
+    def removeShots(self, shots, deleteCamera=False):
+        """Remove several shots at once from their parent takes
+        If deleteCamera is True the cameras are deleted only if they are not shared with any other shots
+        """
+        # locations are got before any removal since removing a shot changes the indices of the following ones
+        locations = [shots_index.getShotLocation(self, shot) for shot in shots]
+        with self.batchEditShots():
+            for takeInd, shotInd in sorted({loc for loc in locations if loc is not None}, reverse=True):
+                self.removeShotByIndex(shotInd, deleteCamera=deleteCamera, takeIndex=takeInd)
+
     def removeShot_UIupdate(self, shot, deleteCamera=False):
         # TODO: Need refactorisation to put the UI part in an operator
 
@@ -3249,6 +3411,7 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
             # print(f"La: takeInd: {takeInd}, currentTakeInd: {currentTakeInd}, shot Ind: {shotInd}")
             self.removeShot(shot, deleteCamera=deleteCamera)
             shots.remove(shotInd)
+            shots_index.invalidateShotsIndex(self)
 
     def moveShotToIndex(self, shot, newIndex):
         """
@@ -3279,6 +3442,7 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
         newInd = min(newInd, len(shots) - 1)
 
         shots.move(shotInd, newInd)
+        shots_index.invalidateShotsIndex(self)
 
         # wkipwkipwkip test if shot and current shot are from the same take!!
         # if currentShotInd == shotInd:
@@ -3288,39 +3452,17 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
         return self.getShotByIndex(newInd, takeIndex=takeInd)
 
     def getShotParentTakeIndex(self, shot):
-        for i, take in enumerate(self.takes):
-            for j, sh in enumerate(take.shots):
-                if sh == shot:
-                    return i
-        return None
+        location = shots_index.getShotLocation(self, shot)
+        return None if location is None else location[0]
 
     def getShotParentTake(self, shot):
-        for i, take in enumerate(self.takes):
-            for j, sh in enumerate(take.shots):
-                if sh == shot:
-                    return take
-        return -1
+        location = shots_index.getShotLocation(self, shot)
+        return -1 if location is None else self.takes[location[0]]
 
     def getShotIndex(self, shot):
         """Return the shot index in its parent take"""
-        # takeInd = shot.getParentTakeIndex()
-        # shotInd = -1
-
-        # # wkip a optimiser
-        # shotList = self.getShotsList(ignoreDisabled=False, takeIndex=takeInd)
-
-        # shotInd = 0
-        # while shotInd < len(shotList) and shot != shotList[shotInd]:  # wkip mettre shotList[shotInd].name?
-        #     shotInd += 1
-        # if shotInd == len(shotList):
-        #     shotInd = -1
-
-        # return shotInd
-        for i, take in enumerate(self.takes):
-            for j, sh in enumerate(take.shots):
-                if sh == shot:
-                    return j
-        return -1
+        location = shots_index.getShotLocation(self, shot)
+        return -1 if location is None else location[1]
 
     def getShotByIndex(self, shotIndex, ignoreDisabled=False, takeIndex=-1):
         takeInd = (
@@ -3332,16 +3474,14 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
         if -1 == takeInd:
             return None
 
-        shotList = self.getShotsList(ignoreDisabled=ignoreDisabled, takeIndex=takeIndex)
-
-        # if ignoreDisabled:
-        #     if 0 < len(shotList) and shotIndex < len(shotList):
-        #         shot = shotList[shotIndex]
-        # else if 0 < shotNumber and shotIndex < shotNumber:
-        #     shot = self.takes[takeIndex].shots[shotIndex]
-
-        if 0 < len(shotList) and shotIndex < len(shotList):
-            shot = shotList[shotIndex]
+        # the shots list is not built here: the enabled shots are found through the shots index
+        shots = self.takes[takeInd].shots
+        if ignoreDisabled:
+            enabledIndices = shots_index.getTakeShotsIndex(self, takeInd).enabledShots.shotIndices
+            if 0 < len(enabledIndices) and shotIndex < len(enabledIndices):
+                shot = shots[enabledIndices[shotIndex]]
+        elif 0 < len(shots) and shotIndex < len(shots):
+            shot = shots[shotIndex]
 
         return shot
 
@@ -3689,124 +3829,57 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
     # currentShotIndex is given in the WHOLE list of shots (including disabled)
     # returns the index of the previous enabled shot in the WHOLE list, -1 if none
     def getPreviousEnabledShotIndex(self, currentShotIndex, takeIndex=-1):
-        takeInd = (
-            self.getCurrentTakeIndex()
-            if -1 == takeIndex
-            else (takeIndex if 0 <= takeIndex and takeIndex < len(self.getTakes()) else -1)
-        )
-        previousShotInd = -1
-        if -1 == takeInd:
-            return previousShotInd
-
-        shotList = self.getShotsList(takeIndex=takeIndex)
-
-        previousShotInd = currentShotIndex - 1
-        isPreviousFound = shotList[previousShotInd].enabled
-        while 0 <= previousShotInd and not isPreviousFound:
-            previousShotInd -= 1
-            isPreviousFound = shotList[previousShotInd].enabled
-
-        return previousShotInd
+        takeShotsIndex = self.getShotsIndex(takeIndex=takeIndex)
+        if takeShotsIndex is None:
+            return -1
+        return takeShotsIndex.enabledShots.getPreviousShotIndex(currentShotIndex)
 
     # currentShotIndex is given in the WHOLE list of shots (including disabled)
     # returns the index of the next enabled shot in the WHOLE list, -1 if none
     def getNextEnabledShotIndex(self, currentShotIndex, takeIndex=-1):
+        takeShotsIndex = self.getShotsIndex(takeIndex=takeIndex)
+        if takeShotsIndex is None:
+            return -1
+        return takeShotsIndex.enabledShots.getNextShotIndex(currentShotIndex)
+
+    def getShotsIndex(self, takeIndex=-1):
+        """Return the cached frame index of the shots of the specified take, None if the take is not valid
+        The index is rebuilt only when shots are added, removed, moved or when their start, end or enabled
+        state change
+        """
         takeInd = (
             self.getCurrentTakeIndex()
             if -1 == takeIndex
             else (takeIndex if 0 <= takeIndex and takeIndex < len(self.getTakes()) else -1)
         )
-        nextShotInd = -1
         if -1 == takeInd:
-            return nextShotInd
-
-        shotList = self.getShotsList(takeIndex=takeIndex)
-
-        nextShotInd = currentShotIndex + 1
-        if len(shotList) > nextShotInd:
-            isNextFound = shotList[nextShotInd].enabled
-            while len(shotList) > nextShotInd and not isNextFound:
-                nextShotInd += 1
-                if len(shotList) > nextShotInd:
-                    isNextFound = shotList[nextShotInd].enabled
-
-        if len(shotList) <= nextShotInd:
-            nextShotInd = -1
-
-        return nextShotInd
+            return None
+        return shots_index.getTakeShotsIndex(self, takeInd)
 
-    # works only on current take
-    # TODO make this function work for any take
-    def getFirstShotIndexContainingFrame(self, frameIndex, ignoreDisabled=False):
+    def getFirstShotIndexContainingFrame(self, frameIndex, ignoreDisabled=False, takeIndex=-1):
         """Return the first shot containing the specifed frame, -1 if not found"""
-        firstShotInd = -1
-
-        shotList = self.get_shots()
-        shotFound = False
-
-        if len(shotList):
-            firstShotInd = 0
-            while firstShotInd < len(shotList) and not shotFound:
-                if not ignoreDisabled or shotList[firstShotInd].enabled:
-                    shotFound = shotList[firstShotInd].start <= frameIndex and frameIndex <= shotList[firstShotInd].end
-                firstShotInd += 1
-
-        if shotFound:
-            firstShotInd = firstShotInd - 1
-        else:
-            firstShotInd = -1
-
-        return firstShotInd
+        takeShotsIndex = self.getShotsIndex(takeIndex=takeIndex)
+        if takeShotsIndex is None:
+            return -1
+        return takeShotsIndex.getIntervals(ignoreDisabled).getFirstShotIndexContainingFrame(frameIndex)
 
-    # works only on current take
-    # TODO make this function work for any take
-    def getFirstShotIndexBeforeFrame(self, frameIndex, ignoreDisabled=False):
+    def getFirstShotIndexBeforeFrame(self, frameIndex, ignoreDisabled=False, takeIndex=-1):
         """Return the first shot before the specifed frame (supposing thanks to getFirstShotIndexContainingFrame than
         frameIndex is not in a shot), -1 if not found
         """
-        firstShotInd = -1
-
-        shotList = self.get_shots()
-        shotFound = False
-
-        if len(shotList):
-            firstShotInd = len(shotList) - 1
-            while 0 <= firstShotInd and not shotFound:
-                if not ignoreDisabled or shotList[firstShotInd].enabled:
-                    shotFound = shotList[firstShotInd].end < frameIndex
-                firstShotInd -= 1
-
-        if shotFound:
-            firstShotInd = firstShotInd + 1
-        else:
-            firstShotInd = -1
-
-        return firstShotInd
+        takeShotsIndex = self.getShotsIndex(takeIndex=takeIndex)
+        if takeShotsIndex is None:
+            return -1
+        return takeShotsIndex.getIntervals(ignoreDisabled).getFirstShotIndexBeforeFrame(frameIndex)
 
-    # works only on current take
-    # TODO make this function work for any take
-    def getFirstShotIndexAfterFrame(self, frameIndex, ignoreDisabled=False):
+    def getFirstShotIndexAfterFrame(self, frameIndex, ignoreDisabled=False, takeIndex=-1):
         """Return the first shot after the specifed frame (supposing thanks to getFirstShotIndexContainingFrame than
         frameIndex is not in a shot), -1 if not found
         """
-        firstShotInd = -1
-
-        shotList = self.get_shots()
-        shotFound = False
-
-        if len(shotList):
-            firstShotInd = 0
-            while firstShotInd < len(shotList) and not shotFound:
-                if not ignoreDisabled or shotList[firstShotInd].enabled:
-                    shotFound = frameIndex < shotList[firstShotInd].start
-                firstShotInd += 1
-
-        if shotFound:
-            firstShotInd = firstShotInd - 1
-        else:
-            firstShotInd = -1
-
-        return firstShotInd
+        takeShotsIndex = self.getShotsIndex(takeIndex=takeIndex)
+        if takeShotsIndex is None:
+            return -1
+        return takeShotsIndex.getIntervals(ignoreDisabled).getFirstShotIndexAfterFrame(frameIndex)
 
     #############################################
     # shot cameras
@@ -3827,19 +3900,13 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
         if -1 == takeInd:
             return None
 
-        takes = self.takes if fromAllTakes else [self.takes[takeInd]]
-
-        shotCameras = list()
-        for take in takes:
-            for shot in take.shots:
-                if shot.enabled or ignoreDisabled:
-                    if onlyShotsOfType is None or onlyShotsOfType == shot.shotType:
-                        if shot.isCameraValid():
-                            cam = shot.camera
-                            if cam not in shotCameras:
-                                shotCameras.append(cam)
+        takeIndices = range(len(self.takes)) if fromAllTakes else [takeInd]
+        shotCameras = shots_index.getCameras(
+            self, takeIndices, ignoreDisabled=ignoreDisabled, onlyShotsOfType=onlyShotsOfType
+        )
 
-        return shotCameras
+        # same test as shot.isCameraValid()
+        return [cam for cam in shotCameras if cam.name in bpy.context.scene.objects]
 
     def getShotsUsingCamera(self, cam, ignoreDisabled=False, takeIndex=-1):
         """Return the list of all the shots used by the specified camera in the specified take"""
@@ -3852,7 +3919,11 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
         if -1 == takeInd:
             return shotList
 
-        return self.takes[takeInd].getShotsUsingCamera(cam, ignoreDisabled=ignoreDisabled)
+        shots = self.takes[takeInd].shots
+        for t, s, enabled, _shotType in shots_index.getCameraUsages(self, cam):
+            if t == takeInd and (not ignoreDisabled or enabled):
+                shotList.append(shots[s])
+        return shotList
 
     def getShotsSharingCamera(self, cam, ignoreDisabled=False, takeIndex=-1, inAllTakes=True):
         """Return a dictionary with all the shots using the specified camera in the specified takes
@@ -3860,6 +3931,7 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
         """
         shotsDict = dict()
 
+        # as before the cameras usage index, no shots are sharing an undefined camera
         if cam is None:
             return shotsDict
 
@@ -3872,17 +3944,18 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
             if -1 == takeInd:
                 return shotsDict
 
-            shotList = self.takes[takeInd].getShotsUsingCamera(cam, ignoreDisabled=ignoreDisabled)
+            shotList = self.getShotsUsingCamera(cam, ignoreDisabled=ignoreDisabled, takeIndex=takeInd)
             if len(shotList):
                 shotsDict[self.takes[takeInd].getName_PathCompliant()] = shotList
 
         else:
-            if len(self.takes):
-                for take in self.takes:
-                    shotList = []
-                    shotList = take.getShotsUsingCamera(cam, ignoreDisabled=ignoreDisabled)
-                    if len(shotList):
-                        shotsDict[take.getName_PathCompliant()] = shotList
+            # the usages are sorted by take
+            takesShots = dict()
+            for t, s, enabled, _shotType in shots_index.getCameraUsages(self, cam):
+                if not ignoreDisabled or enabled:
+                    takesShots.setdefault(t, list()).append(self.takes[t].shots[s])
+            for t, shotList in takesShots.items():
+                shotsDict[self.takes[t].getName_PathCompliant()] = shotList
 
         return shotsDict
 
@@ -3907,11 +3980,8 @@ class UAS_ShotManager_Props(MontageInterface, PropertyGroup):
         if -1 == takeInd:
             return -1
 
-        for shot in self.takes[takeInd].shots:
-            if ignoreDisabled or shot.enabled:
-                if 1 < self.getNumSharedCamera(shot.camera, ignoreDisabled=ignoreDisabled, takeIndex=takeInd):
-                    return True
-        return False
+        # the shots are compared to the shots of all the takes
+        return shots_index.hasSharedCamera(self, takeInd, ignoreDisabled=ignoreDisabled)
 
     def getNumSharedCamera(self, cam, ignoreDisabled=False, takeIndex=-1, inAllTakes=True):
         """Return the number of times the specified camera is used by the shots of the specified takes
@@ -41,6 +41,9 @@ from shotmanager.features.greasepencil import greasepencil as gp
 from shotmanager.utils import utils
 from shotmanager.utils import utils_greasepencil
 from .montage_interface import ShotInterface
+from . import shots_index
+from . import storyboard_frames_display
+from . import shots_batch_edit
 
 from shotmanager.config import config
 
@@ -151,6 +154,9 @@ class UAS_ShotManager_Shot(ShotInterface, PropertyGroup):
 
     def _set_name(self, value):
         """Set a unique name to the shot"""
+        batchEdit = shots_batch_edit.getBatchEdit(self.parentScene.UAS_shot_manager_props)
+        if batchEdit is not None:
+            batchEdit.invalidateShotsNames()
         shots = self.parentScene.UAS_shot_manager_props.getShotsList(takeIndex=self.getParentTakeIndex())
         newName = utils.findFirstUniqueName(self, value, shots)
         self["name"] = newName
@@ -158,6 +164,7 @@ class UAS_ShotManager_Shot(ShotInterface, PropertyGroup):
     name: StringProperty(name="Name", get=_get_name, set=_set_name)
 
     def _update_enabled(self, context):
+        shots_index.invalidateShotsIndex(self.parentScene.UAS_shot_manager_props, keepShotsLocations=True)
         self.selectShotInUI()
 
     enabled: BoolProperty(
@@ -169,14 +176,24 @@ class UAS_ShotManager_Shot(ShotInterface, PropertyGroup):
     )
 
     def selectShotInUI(self):
+        # during a batch edition the selected shot is set once when the batch is closed
+        if shots_batch_edit.getBatchEdit(self.parentScene.UAS_shot_manager_props) is not None:
+            return
         currentTakeInd = self.parentScene.UAS_shot_manager_props.getCurrentTakeIndex()
         if currentTakeInd == self.getParentTakeIndex():
             self.parentScene.UAS_shot_manager_props.setSelectedShot(self)
 
+    def _update_shotType(self, context):
+        # the display rules of the storyboard frames depend on the shot type
+        if self.parentScene is not None:
+            storyboard_frames_display.invalidateDisplayState(self.parentScene.UAS_shot_manager_props)
+            shots_index.invalidateCamerasUsage(self.parentScene.UAS_shot_manager_props)
+
     shotType: EnumProperty(
         name="Type",
         description="Usage of the shot",
         items=list_shot_types,
+        update=_update_shotType,
         default=0,
     )
 
@@ -204,9 +221,11 @@ class UAS_ShotManager_Shot(ShotInterface, PropertyGroup):
                 self["start"] = self.end
 
     def _update_start(self, context):
+        shots_index.invalidateShotsIndex(self.parentScene.UAS_shot_manager_props, keepShotsLocations=True)
         self.selectShotInUI()
         self.updateClipLinkToShotStart()
-        config.gRedrawShotStack = True
+        if shots_batch_edit.getBatchEdit(self.parentScene.UAS_shot_manager_props) is None:
+            config.gRedrawShotStack = True
 
     start: IntProperty(
         name="Shot Start",
@@ -240,8 +259,10 @@ class UAS_ShotManager_Shot(ShotInterface, PropertyGroup):
                 self["end"] = self.start
 
     def _update_end(self, context):
+        shots_index.invalidateShotsIndex(self.parentScene.UAS_shot_manager_props, keepShotsLocations=True)
         self.selectShotInUI()
-        config.gRedrawShotStack = True
+        if shots_batch_edit.getBatchEdit(self.parentScene.UAS_shot_manager_props) is None:
+            config.gRedrawShotStack = True
 
     end: IntProperty(
         name="Shot End",
@@ -329,12 +350,17 @@ class UAS_ShotManager_Shot(ShotInterface, PropertyGroup):
         else:
             return False
 
+    def _update_camera(self, context):
+        if self.parentScene is not None:
+            shots_index.invalidateCamerasUsage(self.parentScene.UAS_shot_manager_props)
+
     camera: PointerProperty(
         name="Camera",
         description="Select a Camera",
         type=bpy.types.Object,
         # poll=lambda self, obj: True if obj.type == "CAMERA" else False,
         poll=_filter_cameras,
+        update=_update_camera,
     )
 
     def setCamera(self, newCamera):
@@ -694,8 +720,11 @@ class UAS_ShotManager_Shot(ShotInterface, PropertyGroup):
         """
         #    def showGreasePencil(self, visible=None, mode="STORYBOARD"):
         def _showGreasePencil(gpencil, visible):
-            gpencil.hide_viewport = not visible
-            gpencil.hide_render = not visible
+            # the values are set only when they change to avoid useless depsgraph updates
+            if gpencil.hide_viewport == visible:
+                gpencil.hide_viewport = not visible
+            if gpencil.hide_render == visible:
+                gpencil.hide_render = not visible
 
         if not self.isCameraValid():
             return
@@ -0,0 +1,129 @@
+# GPLv3 License
+#
+# Copyright (C) 2021 Ubisoft
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Batch edition of the shots, used to add, modify or remove a lot of shots at once
+
+While a batch is open the update callbacks of the shots skip their UI related work (selection of the
+shot in the list, redraw of the shots stack) and the functions adding and removing shots defer the
+change of the current shot. All these side effects are applied once when the batch is closed.
+As for the shots index the batches are stored at module level, keyed by the pointer of the Shot Manager
+properties.
+"""
+
+from contextlib import contextmanager
+
+from shotmanager.config import config
+from . import shots_index
+from . import storyboard_frames_display
+
+from shotmanager.config import sm_logging
+
+_logger = sm_logging.getLogger(__name__)
+
+
+# dictionary of ShotsBatchEdit instances, keyed by props pointer
+_batchEdits = dict()
+
+
+class ShotsBatchEdit:
+    """Pending side effects of a batch edition of the shots"""
+
+    def __init__(self):
+        # index of the shot to set as the current and selected one in the current take, None if unchanged
+        self.currentShotIndex = None
+        self.selectedShotIndex = None
+
+        # True if shots have been added to or removed from the current take
+        self.currentTakeChanged = False
+
+        # dictionary of the sets of the names of the shots, keyed by take index
+        self._shotsNames = dict()
+
+    def getUniqueShotName(self, props, name, takeIndex):
+        """Return the name the shot will get once added to the specified take, and reserve it
+        The result is the same as utils.findFirstUniqueName() but with a hashed set of names
+        """
+        names = self._shotsNames.get(takeIndex, None)
+        if names is None:
+            names = {shot.name for shot in props.takes[takeIndex].shots}
+            self._shotsNames[takeIndex] = names
+
+        newName = name
+        numDuplicatesFound = 0
+        while newName in names:
+            newName = f"{name}.{numDuplicatesFound:03}"
+            numDuplicatesFound += 1
+        names.add(newName)
+        return newName
+
+    def invalidateShotsNames(self):
+        self._shotsNames.clear()
+
+
+def getBatchEdit(props):
+    """Return the batch edition opened on the specified props, None if there is none"""
+    return _batchEdits.get(props.as_pointer(), None)
+
+
+@contextmanager
+def batchEditShots(props):
+    """Context manager opening a batch edition of the shots of the specified props
+    Nested batches are merged into the outer one, whose closing applies the pending changes
+    """
+    propsPointer = props.as_pointer()
+    batchEdit = _batchEdits.get(propsPointer, None)
+    if batchEdit is not None:
+        yield batchEdit
+        return
+
+    batchEdit = ShotsBatchEdit()
+    _batchEdits[propsPointer] = batchEdit
+    try:
+        yield batchEdit
+    finally:
+        del _batchEdits[propsPointer]
+        _applyBatchEdit(props, batchEdit)
+
+
+def _applyBatchEdit(props, batchEdit):
+    _logger.debug_ext("Applying shots batch edit", col="GRAY", tag="SHOTS_INDEX")
+    shots_index.invalidateShotsIndex(props)
+    storyboard_frames_display.invalidateDisplayState(props)
+
+    numShots = len(props.get_shots())
+    currentShotInd = batchEdit.currentShotIndex
+    if currentShotInd is None and props.getCurrentShotIndex() >= numShots:
+        currentShotInd = numShots - 1
+    selectedShotInd = batchEdit.selectedShotIndex
+    if selectedShotInd is None and props.getSelectedShotIndex() >= numShots:
+        selectedShotInd = numShots - 1
+
+    if currentShotInd is not None:
+        currentShotInd = min(currentShotInd, numShots - 1)
+    if selectedShotInd is not None:
+        selectedShotInd = min(selectedShotInd, numShots - 1)
+
+    # setCurrentShotByIndex() also updates the display of the storyboard frames
+    if currentShotInd is not None:
+        props.setCurrentShotByIndex(currentShotInd)
+    elif batchEdit.currentTakeChanged:
+        props.updateStoryboardFramesDisplay()
+    if selectedShotInd is not None:
+        props.setSelectedShotByIndex(selectedShotInd)
+
+    config.gRedrawShotStack = True
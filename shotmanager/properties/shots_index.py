@@ -0,0 +1,416 @@
+# GPLv3 License
+#
+# Copyright (C) 2021 Ubisoft
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Cached index of the shots of the takes, used to answer frame queries and to locate shots
+without walking the shots collections through RNA
+
+Property groups cannot hold Python attributes so the indices are stored at module level,
+keyed by the pointer of the Shot Manager properties and the take index.
+The indices are invalidated by the shot update callbacks (start, end, enabled), by the
+functions changing the shots or takes order and by the undo, redo and load handlers.
+
+The cameras usage index, listing the shots using each camera in all the takes, is also invalidated
+by the update callbacks of the camera and of the type of the shots.
+"""
+
+from bisect import bisect_left, bisect_right
+from heapq import heappush, heappop
+
+from shotmanager.config import sm_logging
+
+_logger = sm_logging.getLogger(__name__)
+
+
+# dictionary of TakeShotsIndex instances, keyed by (props pointer, take index)
+_takesIndices = dict()
+
+# dictionary of the locations of the shots, keyed by props pointer. Each location map is
+# a dictionary of (take index, shot index) tupples keyed by shot pointer
+_shotsLocations = dict()
+
+# dictionary of CamerasUsageIndex instances, keyed by props pointer
+_camerasUsages = dict()
+
+# number of invalidations of the indices, used by the caches depending on the shots to detect changes
+_generation = 0
+
+
+class ShotsFrameIntervals:
+    """Frame intervals of a subset of the shots of a take (all the shots or only the enabled ones)
+    All the returned shot indices are relative to the WHOLE list of shots of the take.
+    Frames are expected to be integers, as in Blender.
+    """
+
+    def __init__(self, shotIndices, starts, ends):
+        # indices of the shots in this subset, sorted in the shot list order
+        self.shotIndices = shotIndices
+
+        # edit: editStarts[k] is the sum of the durations of the k first shots of the subset,
+        # the last item being the edit duration
+        self.editStarts = [0] * (len(shotIndices) + 1)
+        for k, i in enumerate(shotIndices):
+            self.editStarts[k + 1] = self.editStarts[k] + ends[i] - starts[i] + 1
+
+        # shots containing a frame: the frame range is split in segments on which the first shot
+        # containing the frames doesn't change
+        self.breakpoints = sorted({starts[i] for i in shotIndices} | {ends[i] + 1 for i in shotIndices})
+        self.segmentShots = list()
+        byStart = sorted(shotIndices, key=lambda i: starts[i])
+        activeShots = []
+        j = 0
+        for b in self.breakpoints:
+            while j < len(byStart) and starts[byStart[j]] <= b:
+                heappush(activeShots, byStart[j])
+                j += 1
+            while len(activeShots) and ends[activeShots[0]] < b:
+                heappop(activeShots)
+            self.segmentShots.append(activeShots[0] if len(activeShots) else -1)
+
+        # shots ending before a frame: highest shot index among the shots sorted by end
+        byEnd = sorted(shotIndices, key=lambda i: ends[i])
+        self.sortedEnds = [ends[i] for i in byEnd]
+        self.endsMaxShotIndex = list()
+        maxInd = -1
+        for i in byEnd:
+            maxInd = max(maxInd, i)
+            self.endsMaxShotIndex.append(maxInd)
+
+        # shots starting after a frame: lowest shot index among the shots sorted by start
+        self.sortedStarts = [starts[i] for i in byStart]
+        self.startsMinShotIndex = [-1] * len(byStart)
+        minInd = None
+        for k in range(len(byStart) - 1, -1, -1):
+            minInd = byStart[k] if minInd is None else min(minInd, byStart[k])
+            self.startsMinShotIndex[k] = minInd
+
+    def getFirstShotIndexContainingFrame(self, frame):
+        """Return the lowest index of the shots containing the specified frame, -1 if not found"""
+        k = bisect_right(self.breakpoints, frame) - 1
+        if 0 > k:
+            return -1
+        return self.segmentShots[k]
+
+    def getFirstShotIndexBeforeFrame(self, frame):
+        """Return the highest index of the shots ending strictly before the specified frame, -1 if not found"""
+        k = bisect_left(self.sortedEnds, frame)
+        if 0 >= k:
+            return -1
+        return self.endsMaxShotIndex[k - 1]
+
+    def getFirstShotIndexAfterFrame(self, frame):
+        """Return the lowest index of the shots starting strictly after the specified frame, -1 if not found"""
+        k = bisect_right(self.sortedStarts, frame)
+        if k >= len(self.sortedStarts):
+            return -1
+        return self.startsMinShotIndex[k]
+
+    def getEditDuration(self):
+        """Return the sum of the durations of the shots of the subset, -1 if the subset is empty"""
+        return self.editStarts[-1] if len(self.shotIndices) else -1
+
+    def getEditStart(self, shotIndex):
+        """Return the edit time, relative to the start of the edit, of the first frame of the specified shot
+        The shot has to belong to the subset
+        """
+        return self.editStarts[bisect_left(self.shotIndices, shotIndex)]
+
+    def getShotIndexAtEditTime(self, editTime):
+        """Return a tupple made of the index of the shot of the subset at the specified edit time, relative to
+        the start of the edit, and of the offset of this time from the shot start. (-1, -1) is returned if the
+        time is out of the edit
+        """
+        if 0 > editTime or editTime >= self.editStarts[-1]:
+            return (-1, -1)
+        k = bisect_right(self.editStarts, editTime) - 1
+        return (self.shotIndices[k], editTime - self.editStarts[k])
+
+    def getPreviousShotIndex(self, shotIndex):
+        """Return the index of the shot of the subset placed before shotIndex in the shot list, -1 if none"""
+        k = bisect_left(self.shotIndices, shotIndex) - 1
+        return self.shotIndices[k] if 0 <= k else -1
+
+    def getNextShotIndex(self, shotIndex):
+        """Return the index of the shot of the subset placed after shotIndex in the shot list, -1 if none"""
+        k = bisect_right(self.shotIndices, shotIndex)
+        return self.shotIndices[k] if k < len(self.shotIndices) else -1
+
+
+class TakeShotsIndex:
+    """Snapshot of the time information of the shots of a take"""
+
+    def __init__(self, take):
+        shots = take.shots
+        self.numShots = len(shots)
+
+        self.starts = [0] * self.numShots
+        self.ends = [0] * self.numShots
+        self.enabled = [True] * self.numShots
+        for i, shot in enumerate(shots):
+            self.starts[i] = shot.start
+            self.ends[i] = shot.end
+            self.enabled[i] = shot.enabled
+
+        allIndices = list(range(self.numShots))
+        enabledIndices = [i for i in allIndices if self.enabled[i]]
+        self.allShots = ShotsFrameIntervals(allIndices, self.starts, self.ends)
+        self.enabledShots = ShotsFrameIntervals(enabledIndices, self.starts, self.ends)
+
+    def getIntervals(self, ignoreDisabled=False):
+        return self.enabledShots if ignoreDisabled else self.allShots
+
+
+class CamerasUsageIndex:
+    """Shots using each camera, in all the takes of the Shot Manager properties"""
+
+    def __init__(self, props):
+        self.numShots = tuple(len(take.shots) for take in props.takes)
+
+        # dictionary of the lists of the shots using a camera, keyed by camera pointer. The shots are
+        # (take index, shot index, enabled, shot type) tupples, in the order of the takes and of the shots
+        self.usages = dict()
+
+        # dictionary of the cameras, keyed by camera pointer
+        self.cameras = dict()
+
+        for takeInd, take in enumerate(props.takes):
+            for shotInd, shot in enumerate(take.shots):
+                cam = shot.camera
+                if cam is None:
+                    continue
+                camPointer = cam.as_pointer()
+                self.cameras[camPointer] = cam
+                self.usages.setdefault(camPointer, list()).append((takeInd, shotInd, shot.enabled, shot.shotType))
+
+        # cached results of getCameras() and hasSharedCamera(), keyed by their arguments
+        self._camerasLists = dict()
+        self._sharedCameras = dict()
+
+    def isValidFor(self, props):
+        return self.numShots == tuple(len(take.shots) for take in props.takes)
+
+    def _areUsagesValid(self, props, camPointer, firstOnly=False):
+        # a camera can be removed without calling the update callback of the shots, the index is then
+        # checked against the actual shots. Since the removal of a camera clears it in all the shots,
+        # checking the first shot using it is enough to detect it
+        for takeInd, shotInd, _enabled, _shotType in self.usages.get(camPointer, []):
+            cam = props.takes[takeInd].shots[shotInd].camera
+            if cam is None or cam.as_pointer() != camPointer:
+                return False
+            if firstOnly:
+                break
+        return True
+
+    def getCameraUsages(self, props, cam):
+        """Return the list of the (take index, shot index, enabled, shot type) tupples of the shots using the
+        camera, None if the index is outdated
+        """
+        camPointer = cam.as_pointer()
+        if not self._areUsagesValid(props, camPointer):
+            return None
+        return self.usages.get(camPointer, [])
+
+    def getCameras(self, props, takeIndices, ignoreDisabled=False, onlyShotsOfType=None):
+        """Return the list of the cameras used by the shots of the specified takes, in the order of the shots,
+        None if the index is outdated
+        The shots are filtered as in props.getCameras()
+        """
+        key = (tuple(takeIndices), ignoreDisabled, onlyShotsOfType)
+        camPointers = self._camerasLists.get(key, None)
+        if camPointers is None:
+            firstUses = dict()
+            takeIndicesSet = set(takeIndices)
+            for camPointer, usages in self.usages.items():
+                for takeInd, shotInd, enabled, shotType in usages:
+                    if takeInd in takeIndicesSet and (enabled or ignoreDisabled):
+                        if onlyShotsOfType is None or onlyShotsOfType == shotType:
+                            firstUses[camPointer] = (takeInd, shotInd)
+                            break
+            camPointers = sorted(firstUses, key=lambda camPointer: firstUses[camPointer])
+            self._camerasLists[key] = camPointers
+
+        for camPointer in camPointers:
+            if not self._areUsagesValid(props, camPointer, firstOnly=True):
+                return None
+        return [self.cameras[camPointer] for camPointer in camPointers]
+
+    def hasSharedCamera(self, props, takeIndex, ignoreDisabled=False):
+        """Return True if a camera used by a shot of the take is also used by at least another shot, in any take,
+        None if the index is outdated
+        The shots are filtered as in props.isThereSharedCamerasInTake()
+        """
+        key = (takeIndex, ignoreDisabled)
+        if key not in self._sharedCameras:
+            sharedCamPointer = None
+            for camPointer, usages in self.usages.items():
+                if any(t == takeIndex and (ignoreDisabled or enabled) for t, _s, enabled, _shotType in usages):
+                    if 1 < sum(1 for _t, _s, enabled, _shotType in usages if not ignoreDisabled or enabled):
+                        sharedCamPointer = camPointer
+                        break
+            self._sharedCameras[key] = sharedCamPointer
+
+        sharedCamPointer = self._sharedCameras[key]
+        if sharedCamPointer is None:
+            return False
+        if not self._areUsagesValid(props, sharedCamPointer, firstOnly=True):
+            return None
+        return True
+
+
+def getCamerasUsageIndex(props):
+    """Return the cameras usage index of the specified props, rebuilt if it has been invalidated"""
+    propsPointer = props.as_pointer()
+    camerasUsage = _camerasUsages.get(propsPointer, None)
+    if camerasUsage is None or not camerasUsage.isValidFor(props):
+        _logger.debug_ext("Rebuilding cameras usage index", col="GRAY", tag="SHOTS_INDEX")
+        camerasUsage = CamerasUsageIndex(props)
+        _camerasUsages[propsPointer] = camerasUsage
+    return camerasUsage
+
+
+def _queryCamerasUsage(props, query):
+    # the index is rebuilt once if it is found outdated by the query
+    result = query(getCamerasUsageIndex(props))
+    if result is None:
+        invalidateCamerasUsage(props)
+        result = query(getCamerasUsageIndex(props))
+    return result
+
+
+def getCameraUsages(props, cam):
+    """Return the list of the (take index, shot index, enabled, shot type) tupples of the shots using the camera,
+    in all the takes. If cam is None the shots without camera are returned
+    """
+    if cam is None:
+        # the shots without camera are not in the index: the removal of a camera clears it in the shots
+        # without calling their update callback, so they are listed from the takes
+        return [
+            (takeInd, shotInd, shot.enabled, shot.shotType)
+            for takeInd, take in enumerate(props.takes)
+            for shotInd, shot in enumerate(take.shots)
+            if shot.camera is None
+        ]
+    return _queryCamerasUsage(props, lambda index: index.getCameraUsages(props, cam))
+
+
+def getCameras(props, takeIndices, ignoreDisabled=False, onlyShotsOfType=None):
+    """Return the list of the cameras used by the shots of the specified takes"""
+    return _queryCamerasUsage(
+        props, lambda index: index.getCameras(props, takeIndices, ignoreDisabled, onlyShotsOfType)
+    )
+
+
+def hasSharedCamera(props, takeIndex, ignoreDisabled=False):
+    """Return True if a camera used by a shot of the take is also used by at least another shot, in any take"""
+    return _queryCamerasUsage(props, lambda index: index.hasSharedCamera(props, takeIndex, ignoreDisabled))
+
+
+def invalidateCamerasUsage(props=None):
+    """Invalidate the cameras usage index of the specified Shot Manager properties, of all the scenes if None"""
+    global _generation
+    _generation += 1
+
+    if props is None:
+        _camerasUsages.clear()
+    else:
+        _camerasUsages.pop(props.as_pointer(), None)
+
+
+def getGeneration():
+    """Return a counter incremented each time the indices are invalidated"""
+    return _generation
+
+
+def getTakeShotsIndex(props, takeIndex):
+    """Return the index of the specified take, rebuilt if it has been invalidated
+    takeIndex must be a valid index
+    """
+    take = props.takes[takeIndex]
+    key = (props.as_pointer(), takeIndex)
+    takeShotsIndex = _takesIndices.get(key, None)
+
+    # the shots count is checked in case a shot has been added or removed without invalidation
+    if takeShotsIndex is None or takeShotsIndex.numShots != len(take.shots):
+        _logger.debug_ext("Rebuilding shots index of take %s", takeIndex, col="GRAY", tag="SHOTS_INDEX")
+        takeShotsIndex = TakeShotsIndex(take)
+        _takesIndices[key] = takeShotsIndex
+
+    return takeShotsIndex
+
+
+def _buildShotsLocations(props):
+    locations = dict()
+    for takeInd, take in enumerate(props.takes):
+        for shotInd, shot in enumerate(take.shots):
+            locations[shot.as_pointer()] = (takeInd, shotInd)
+    return locations
+
+
+def getShotLocation(props, shot):
+    """Return a tupple made of the index of the parent take of the shot and the index of the shot in
+    this take, None if the shot is not found in the takes of props
+
+    Shots are identified by their pointer, which is the one of their slot in the shots collection of
+    their take. A cached location is always checked against the actual shot so an outdated map is
+    rebuilt instead of returning a wrong location.
+    """
+    if shot is None:
+        return None
+
+    propsPointer = props.as_pointer()
+    shotPointer = shot.as_pointer()
+    locations = _shotsLocations.get(propsPointer, None)
+
+    if locations is not None:
+        location = locations.get(shotPointer, None)
+        if location is not None:
+            takeInd, shotInd = location
+            if takeInd < len(props.takes):
+                shots = props.takes[takeInd].shots
+                if shotInd < len(shots) and shots[shotInd] == shot:
+                    return location
+
+    _logger.debug_ext("Rebuilding shots locations", col="GRAY", tag="SHOTS_INDEX")
+    locations = _buildShotsLocations(props)
+    _shotsLocations[propsPointer] = locations
+    return locations.get(shotPointer, None)
+
+
+def invalidateShotsIndex(props=None, keepShotsLocations=False):
+    """Invalidate the indices of all the takes of the specified Shot Manager properties
+    If props is None then the indices of all the scenes are invalidated
+    Args:
+        keepShotsLocations: set it to True when the shots have not been added, removed or moved, for
+                            example when only their time range changed
+    """
+    global _generation
+    _generation += 1
+
+    if props is None:
+        _takesIndices.clear()
+        _shotsLocations.clear()
+        _camerasUsages.clear()
+        return
+
+    # the number of shots using a camera depends on their enabled state
+    invalidateCamerasUsage(props)
+
+    propsPointer = props.as_pointer()
+    for key in [k for k in _takesIndices if k[0] == propsPointer]:
+        del _takesIndices[key]
+    if not keepShotsLocations:
+        _shotsLocations.pop(propsPointer, None)
@@ -0,0 +1,69 @@
+# GPLv3 License
+#
+# Copyright (C) 2021 Ubisoft
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Cached state of the display of the storyboard frames, used to update only the frames affected by
+a change of the current shot instead of all the frames of all the takes
+
+As for the shots index the states are stored at module level, keyed by the pointer of the Shot Manager
+properties. A state is valid only for the shots index it has been built with, so it is implicitly
+invalidated when shots are added, removed, moved or when the undo, redo and load handlers run.
+"""
+
+# dictionary of StoryboardFramesDisplayState instances, keyed by props pointer
+_displayStates = dict()
+
+
+class StoryboardFramesDisplayState:
+    """Display state of the storyboard frames resulting from a full update of the specified take"""
+
+    def __init__(self, takeIndex, takeShotsIndex, useGreasePencil, currentShotIndex):
+        self.takeIndex = takeIndex
+        self.takeShotsIndex = takeShotsIndex
+        self.useGreasePencil = useGreasePencil
+        self.currentShotIndex = currentShotIndex
+
+        # dictionary of the index of the shot setting the display of each storyboard frame, keyed by
+        # the pointer of the grease pencil object. When a camera is shared by several shots of the take
+        # this is the last one in the shots list, as it is the one applied last by the full update
+        self.framesOwners = dict()
+
+    def isValidFor(self, props, takeIndex):
+        return (
+            self.takeIndex == takeIndex
+            and self.takeShotsIndex is props.getShotsIndex(takeIndex)
+            and self.useGreasePencil == props.use_greasepencil
+        )
+
+
+def getDisplayState(props):
+    """Return the display state of the storyboard frames of the specified props, None if not valid"""
+    return _displayStates.get(props.as_pointer(), None)
+
+
+def setDisplayState(props, state):
+    _displayStates[props.as_pointer()] = state
+
+
+def invalidateDisplayState(props=None):
+    """Invalidate the display state of the storyboard frames of the specified Shot Manager properties
+    If props is None then the states of all the scenes are invalidated
+    """
+    if props is None:
+        _displayStates.clear()
+    else:
+        _displayStates.pop(props.as_pointer(), None)
@@ -32,6 +32,8 @@ import bpy
 from shotmanager.config import config
 from shotmanager.rendering.rendering_stampinfo import setStampInfoSettings, renderStampedInfoForShot
 from shotmanager.rendering import rendering_functions
+from shotmanager.rendering import rendering_farm
+from shotmanager.rendering import rendering_fingerprints
 
 from shotmanager.utils import utils
 from shotmanager.utils import utils_editors_3dview
@@ -52,6 +54,7 @@ def launchRenderWithVSEComposite(
     filePath="",
     stampInfoCustomSettingsDict=None,
     rerenderExistingShotVideos=True,
+    rerenderChangedShotsOnly=False,
     generateSequenceVideo=True,
     generateShotVideos=True,
     specificShotList=None,
@@ -70,6 +73,8 @@ def launchRenderWithVSEComposite(
 
     Args:
         filesDict (dict)= {"rendered_files": newMediaFiles, "failed_files": failedFiles}
+        rerenderChangedShotsOnly (bool): When set to True, the videos of the shots whose content has not changed
+                                since their last rendering are not rendered again (see rendering_fingerprints)
         specificFrame (int): When specified, only this frame is rendered. Handles are ignored and the resulting media in an image, not a video
         fileListOnly (bool):    When set to True, no rendering nor change in the scene are done, the function just
                                 returns the list of the files to generate
@@ -373,6 +378,96 @@ def launchRenderWithVSEComposite(
     _logger.debug_ext(f"Changing Color from {scene.view_settings.view_transform} to Standard", col="PINK")
     # scene.view_settings.view_transform = "Standard"
 
+    #######################
+    # find the shots that have not changed since their last rendering
+    #######################
+
+    renderManifest = None
+    shotsFingerprints = dict()
+    upToDateShots = set()
+    if rerenderChangedShotsOnly and generateShotVideos and specificFrame is None and not fileListOnly:
+        renderManifest = rendering_fingerprints.RenderManifest(rootPath)
+        for shot in shotList:
+            compositedMediaPath = shot.getOutputMediaPath("SH_VIDEO", rootPath=rootPath, insertSeqPrefix=True)
+            frameStart = shot.start - handles if renderHandles else shot.start
+            frameEnd = shot.end + handles if renderHandles else shot.end
+            fingerprint = rendering_fingerprints.getShotFingerprint(
+                scene,
+                take,
+                shot,
+                frameStart,
+                frameEnd,
+                renderPreset=renderPreset,
+                stampInfoSettings=stampInfoSettings if preset_useStampInfo else None,
+            )
+            if renderManifest.isUpToDate(compositedMediaPath, fingerprint):
+                upToDateShots.add(shot.name)
+            else:
+                shotsFingerprints[shot.name] = fingerprint
+                renderManifest.removeFingerprint(compositedMediaPath)
+        _logger.info_ext(f"Unchanged shots not rendered again: {len(upToDateShots)} / {len(shotList)}", col="GREEN")
+
+    def _isShotVideoSkipped(shot, compositedMediaPath):
+        if shot.name in upToDateShots:
+            return True
+        return not rerenderExistingShotVideos and Path(compositedMediaPath).exists()
+
+    #######################
+    # render the images of the shots in background workers
+    #######################
+
+    renderInWorkers = props.renderContext.useRenderWorkers and not fileListOnly and specificFrame is None
+    workersFailedShots = list()
+    if renderInWorkers and len(shotList):
+        workersJobs = list()
+        for shot in shotList:
+            compositedMediaPath = shot.getOutputMediaPath("SH_VIDEO", rootPath=rootPath, insertSeqPrefix=True)
+            if _isShotVideoSkipped(shot, compositedMediaPath):
+                continue
+
+            newTempRenderPath = shot.getOutputMediaPath(
+                "SH_INTERM_IMAGE_SEQ" + playblastSuffix, rootPath=rootPath, provideName=False
+            )
+            _deleteTempFiles(newTempRenderPath)
+
+            stampNote = None
+            if "PLAYBLAST" == renderMode and not preset_useStampInfo:
+                stampNote = f"Shot: {shot.name}"
+                stampNote += f"  *** Playblast Start Time: 3D: {shotList[0].start}"
+                stampNote += f", Edit: {shotList[0].getEditStart(referenceLevel='GLOBAL_EDIT')}"
+
+            frameStart = shot.start - handles if renderHandles else shot.start
+            frameEnd = shot.end + handles if renderHandles else shot.end
+            renderFilepath = shot.getOutputMediaPath(
+                "SH_INTERM_IMAGE_SEQ" + playblastSuffix, rootPath=rootPath, provideExtension=False, genericFrame=True
+            )
+            workersJobs.append(
+                rendering_farm.getShotJob(props, shot, frameStart, frameEnd, renderFilepath, stampNote=stampNote)
+            )
+
+        # OpenGL renderings are done with the GPU engine since there is no viewport in background
+        workersEngine = None
+        if renderWithOpengl and "CUSTOM" != props.renderContext.renderEngineOpengl:
+            workersEngine = props.renderContext.renderEngineOpengl
+
+        startWorkersRenderTime = time.monotonic()
+        workersFailedShots = rendering_farm.renderJobsInWorkers(
+            context,
+            scene,
+            props.getTakeIndex(take),
+            workersJobs,
+            numWorkers=props.renderContext.numRenderWorkers,
+            splitShots=props.renderContext.splitShotsInRenderWorkers,
+            engine=workersEngine,
+        )
+        allRenderTimes_workers = time.monotonic() - startWorkersRenderTime
+        _logger.info_ext(
+            f"Background workers render time: {allRenderTimes_workers:0.2f} sec.",
+            tag="RENDERTIME",
+            display=displayRenderTimes,
+            col=colorRenderTimes,
+        )
+
     #######################
     # render each shots
     #######################
@@ -409,14 +504,19 @@ def launchRenderWithVSEComposite(
             "SH_VIDEO", rootPath=rootPath, insertSeqPrefix=True, specificFrame=specificFrame
         )
 
+        # the image sequence of a shot whose background worker failed is incomplete, it is neither stamped
+        # nor composited, and the edit video is not generated
+        if shot.name in workersFailedShots:
+            _logger.error_ext(f"Shot {shot.name} not rendered entirely by the background workers, skipped")
+            continue
+
         newMediaFiles.append(compositedMediaPath)
         if shot.enabled:
             sequenceFiles.append(compositedMediaPath)
 
-        if not rerenderExistingShotVideos:
-            if Path(compositedMediaPath).exists():
-                print(f" - File {Path(compositedMediaPath).name} already computed")
-                continue
+        if _isShotVideoSkipped(shot, compositedMediaPath):
+            print(f" - File {Path(compositedMediaPath).name} already computed")
+            continue
 
         if not fileListOnly:
             startShotRenderTime = time.monotonic()
@@ -448,8 +548,10 @@ def launchRenderWithVSEComposite(
 
             _logger.info_ext(infoStr, col="GREEN")
 
-            # if False:  # debug
-            _deleteTempFiles(newTempRenderPath)
+            # the images rendered by the background workers are kept
+            if not renderInWorkers:
+                # if False:  # debug
+                _deleteTempFiles(newTempRenderPath)
 
             # wkip if bg sounds used
             #  props.enableBGSoundForShot()
@@ -489,7 +591,7 @@ def launchRenderWithVSEComposite(
             # render 3D images from scene
             #######################
 
-            renderShotContent = True
+            renderShotContent = not renderInWorkers
             if renderShotContent and not fileListOnly:
 
                 if renderFrameByFrame:
@@ -786,6 +888,13 @@ def launchRenderWithVSEComposite(
                 if deleteTempFiles:
                     _deleteTempFiles(newTempRenderPath)
 
+                # the fingerprint is saved after each shot so that the rendered videos are kept if the
+                # rendering is interrupted
+                if renderManifest is not None and shot.name in shotsFingerprints:
+                    if shot.name not in workersFailedShots and Path(compositedMediaPath).exists():
+                        renderManifest.setFingerprint(compositedMediaPath, shotsFingerprints[shot.name])
+                        renderManifest.save()
+
             else:
                 #######################
                 # Collect rendered image sequences
@@ -840,7 +949,19 @@ def launchRenderWithVSEComposite(
 
     startSequenceRenderTime = time.monotonic()
     sequenceOutputFullPath = ""
-    if generateSequenceVideo and specificFrame is None:
+    failedSequenceOutputFullPath = None
+    if generateSequenceVideo and specificFrame is None and len(workersFailedShots):
+        failedSequenceOutputFullPath = props.getOutputMediaPath(
+            "TK_VIDEO" if generateShotVideos else "TK_PLAYBLAST",
+            take,
+            rootPath=rootPath if generateShotVideos else props.renderRootPath,
+            insertSeqPrefix=generateShotVideos,
+        )
+        _logger.error_ext(
+            f"Edit video not generated, shots not rendered by the background workers: {workersFailedShots}"
+        )
+
+    elif generateSequenceVideo and specificFrame is None:
 
         if generateShotVideos:
             #######################
@@ -866,7 +987,11 @@ def launchRenderWithVSEComposite(
             if not fileListOnly:
                 # print(f"sequenceFiles: {sequenceFiles}")
                 vse_render.buildSequenceVideoFromMedia(
-                    sequenceOutputFullPath, handles, projectFps, mediaFiles=sequenceFiles
+                    sequenceOutputFullPath,
+                    handles,
+                    projectFps,
+                    mediaFiles=sequenceFiles,
+                    useStreamCopy=props.renderContext.useStreamCopyForEditVideo,
                 )
 
                 # currentTakeRenderTime = time.monotonic()
@@ -942,6 +1067,11 @@ def launchRenderWithVSEComposite(
     # startFrameInEdit = -1
 
     failedFiles = []
+    for shot in shotList:
+        if shot.name in workersFailedShots:
+            failedFiles.append(shot.getOutputMediaPath("SH_VIDEO", rootPath=rootPath, insertSeqPrefix=True))
+    if failedSequenceOutputFullPath is not None:
+        failedFiles.append(failedSequenceOutputFullPath)
     filesDict = {
         "rendered_files": newMediaFiles,
         "failed_files": failedFiles,
@@ -1175,6 +1305,7 @@ def launchRender(context, renderMode, rootPath, area=None):
                 filePath=props.renderRootPath,
                 fileListOnly=False,
                 rerenderExistingShotVideos=preset.rerenderExistingShotVideos,
+                rerenderChangedShotsOnly=preset.rerenderChangedShotsOnly,
                 generateSequenceVideo=preset.generateEditVideo,
                 renderAlsoDisabled=preset.renderAlsoDisabled,
                 area=area,
@@ -0,0 +1,298 @@
+# GPLv3 License
+#
+# Copyright (C) 2021 Ubisoft
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Rendering of the images of the shots by Blender instances running in background, on the local machine
+
+A snapshot of the current file, saved once the render settings have been applied, is opened by several
+workers. Each one renders a list of jobs, a job being a whole shot or a chunk of frames of a long shot,
+distributed by a scheduler balancing the number of frames rendered by each worker.
+Only the image sequences of the shots are rendered this way, the stamped info, the sound and the
+composite of the videos are still done in the current session.
+"""
+
+import os
+import json
+import math
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from collections import deque
+from heapq import heappush, heappop
+
+import bpy
+
+from shotmanager.config import sm_logging
+
+_logger = sm_logging.getLogger(__name__)
+
+
+# prefix of the lines printed by the workers each time an image has been written
+_FRAME_RENDERED_TAG = "SM_RENDER_FARM_FRAME_RENDERED"
+
+
+def getDefaultNumWorkers():
+    """Return the number of workers used when it is not specified
+    Each Blender instance also uses several threads so only a quarter of the cores is used
+    """
+    return max(1, min(8, (os.cpu_count() or 1) // 4))
+
+
+def getShotJob(props, shot, frameStart, frameEnd, filepath, stampNote=None):
+    """Return the job rendering the specified frames of the shot, as a dictionary that can be saved in json
+    Args:
+        filepath: render file path of the images, with the frame number placeholder
+        stampNote: text of the scene metadata note, None to leave it unchanged
+    """
+    return {
+        "shotIndex": props.getShotIndex(shot),
+        "shotName": shot.name,
+        "frameStart": frameStart,
+        "frameEnd": frameEnd,
+        "filepath": filepath,
+        "stampNote": stampNote,
+    }
+
+
+def _getJobDuration(job):
+    return job["frameEnd"] - job["frameStart"] + 1
+
+
+def splitJobs(jobs, numWorkers):
+    """Return the jobs with the ones longer than the average load of a worker split in chunks of frames,
+    so that the workers can be balanced even when there are less shots than workers
+    """
+    totalFrames = sum(_getJobDuration(job) for job in jobs)
+    maxChunkDuration = max(1, math.ceil(totalFrames / numWorkers))
+
+    splittedJobs = list()
+    for job in jobs:
+        duration = _getJobDuration(job)
+        numChunks = math.ceil(duration / maxChunkDuration)
+        chunkStart = job["frameStart"]
+        for i in range(numChunks):
+            chunkDuration = duration // numChunks + (1 if i < duration % numChunks else 0)
+            chunk = dict(job)
+            chunk["frameStart"] = chunkStart
+            chunk["frameEnd"] = chunkStart + chunkDuration - 1
+            splittedJobs.append(chunk)
+            chunkStart += chunkDuration
+    return splittedJobs
+
+
+def scheduleJobs(jobs, numWorkers):
+    """Return the lists of the jobs of the workers, balanced by number of frames
+    The longest jobs are given first, each one to the worker having the lowest number of frames to render.
+    Workers without jobs are not returned.
+    """
+    workersJobs = [list() for _ in range(numWorkers)]
+    workersLoads = [(0, i) for i in range(numWorkers)]
+    for job in sorted(jobs, key=_getJobDuration, reverse=True):
+        load, workerInd = heappop(workersLoads)
+        workersJobs[workerInd].append(job)
+        heappush(workersLoads, (load + _getJobDuration(job), workerInd))
+
+    # each worker renders its jobs in the shots order
+    return [sorted(w, key=lambda job: (job["shotIndex"], job["frameStart"])) for w in workersJobs if len(w)]
+
+
+class RenderFarmWorker:
+    """Blender instance running in background and rendering a list of jobs"""
+
+    def __init__(self, workerIndex, snapshotFile, jobsFile, jobs):
+        self.workerIndex = workerIndex
+        self.jobs = jobs
+        self.numFrames = sum(_getJobDuration(job) for job in jobs)
+        self.numFramesRendered = 0
+
+        # last lines of the output of the worker, displayed if it fails
+        self._lastLines = deque(maxlen=30)
+
+        addonName = __name__.split(".")[0]
+        pythonExpr = (
+            f"from {addonName}.rendering import rendering_farm; "
+            f"rendering_farm.renderJobsInBackground({jobsFile!r}, {workerIndex})"
+        )
+        command = [
+            bpy.app.binary_path,
+            "--background",
+            snapshotFile,
+            "--addons",
+            addonName,
+            "--python-exit-code",
+            "1",
+            "--python-expr",
+            pythonExpr,
+        ]
+        _logger.debug_ext(f"Starting render worker {workerIndex}: {command}", col="GRAY", tag="RENDER")
+
+        self._process = subprocess.Popen(
+            command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True, errors="replace"
+        )
+        # the output is read in a thread so that the pipe never gets full
+        self._readerThread = threading.Thread(target=self._readOutput, daemon=True)
+        self._readerThread.start()
+
+    def _readOutput(self):
+        for line in self._process.stdout:
+            if line.startswith(_FRAME_RENDERED_TAG):
+                self.numFramesRendered += 1
+            else:
+                self._lastLines.append(line.rstrip())
+        self._process.stdout.close()
+
+    def isRunning(self):
+        return self._process.poll() is None
+
+    def hasFailed(self):
+        return not self.isRunning() and 0 != self._process.returncode
+
+    def wait(self):
+        self._process.wait()
+        self._readerThread.join()
+
+    def terminate(self):
+        if self.isRunning():
+            self._process.terminate()
+        self.wait()
+
+    def getLastLines(self):
+        return "\n".join(self._lastLines)
+
+
+def renderJobsInWorkers(context, scene, takeIndex, jobs, numWorkers=0, splitShots=True, engine=None):
+    """Render the jobs in Blender instances running in background and wait for them to end
+    The progress is reported in the UI while waiting.
+    Return the list of the names of the shots that have not been rendered entirely
+    Args:
+        numWorkers: number of Blender instances to launch, automatic if 0
+        splitShots: if True the long shots are split in chunks of frames rendered by different workers. The
+                    simulations must then be baked, since a chunk is rendered without the previous frames
+        engine: name of the render engine to use in the workers, None to use the one of the scene
+    """
+    if not len(jobs):
+        return []
+
+    numWorkers = numWorkers if 0 < numWorkers else getDefaultNumWorkers()
+    if splitShots:
+        jobs = splitJobs(jobs, numWorkers)
+    workersJobs = scheduleJobs(jobs, numWorkers)
+    totalFrames = sum(_getJobDuration(job) for job in jobs)
+
+    farmDir = tempfile.mkdtemp(prefix="ShotManager_RenderFarm_")
+    snapshotFile = os.path.join(farmDir, "snapshot.blend")
+    jobsFile = os.path.join(farmDir, "jobs.json")
+
+    _logger.info_ext(
+        f"Rendering {totalFrames} frames with {len(workersJobs)} background workers, snapshot: {snapshotFile}",
+        col="GREEN",
+    )
+
+    # the snapshot contains the current state of the scene, including the render settings applied
+    # for this rendering
+    bpy.ops.wm.save_as_mainfile(filepath=snapshotFile, copy=True, relative_remap=True)
+    with open(jobsFile, "w") as f:
+        json.dump({"scene": scene.name, "takeIndex": takeIndex, "engine": engine, "workers": workersJobs}, f, indent=4)
+
+    workers = list()
+    wm = context.window_manager
+    wm.progress_begin(0, totalFrames)
+    try:
+        for workerInd, workerJobs in enumerate(workersJobs):
+            workers.append(RenderFarmWorker(workerInd, snapshotFile, jobsFile, workerJobs))
+
+        previousNumFramesRendered = -1
+        while any(worker.isRunning() for worker in workers):
+            time.sleep(0.5)
+            numFramesRendered = sum(worker.numFramesRendered for worker in workers)
+            if numFramesRendered != previousNumFramesRendered:
+                previousNumFramesRendered = numFramesRendered
+                _reportProgress(context, numFramesRendered, totalFrames)
+
+        for worker in workers:
+            worker.wait()
+        _reportProgress(context, sum(worker.numFramesRendered for worker in workers), totalFrames)
+
+    except BaseException:
+        # the workers are stopped if the rendering is interrupted
+        for worker in workers:
+            worker.terminate()
+        raise
+
+    finally:
+        wm.progress_end()
+        shutil.rmtree(farmDir, ignore_errors=True)
+
+    failedShots = list()
+    for worker in workers:
+        if worker.hasFailed():
+            _logger.error_ext(f"Render worker {worker.workerIndex} failed:\n{worker.getLastLines()}")
+            for job in worker.jobs:
+                if job["shotName"] not in failedShots:
+                    failedShots.append(job["shotName"])
+    return failedShots
+
+
+def _reportProgress(context, numFramesRendered, totalFrames):
+    _logger.info_ext(f"Background workers: {numFramesRendered} / {totalFrames} frames rendered", col="GREEN")
+    context.window_manager.progress_update(numFramesRendered)
+    context.window_manager.UAS_shot_manager_progressbar = numFramesRendered / totalFrames * 100.0
+    if not bpy.app.background:
+        bpy.ops.wm.redraw_timer(type="DRAW_WIN_SWAP", iterations=1)
+
+
+def renderJobsInBackground(jobsFile, workerIndex):
+    """Entry point of the workers, run in the Blender instances launched in background by renderJobsInWorkers()
+    Render the jobs of the specified worker in the snapshot file
+    """
+    with open(jobsFile) as f:
+        jobsData = json.load(f)
+
+    scene = bpy.data.scenes[jobsData["scene"]]
+    props = scene.UAS_shot_manager_props
+    take = props.takes[jobsData["takeIndex"]]
+    isCurrentTake = props.getCurrentTakeIndex() == jobsData["takeIndex"]
+    if jobsData["engine"] is not None:
+        scene.render.engine = jobsData["engine"]
+
+    def _onRenderWrite(*args):
+        print(_FRAME_RENDERED_TAG, flush=True)
+
+    bpy.app.handlers.render_write.append(_onRenderWrite)
+
+    for job in jobsData["workers"][workerIndex]:
+        shot = take.shots[job["shotIndex"]]
+        _logger.info_ext(f"Rendering shot {shot.name}, frames {job['frameStart']} to {job['frameEnd']}")
+
+        if isCurrentTake:
+            props.setCurrentShotByIndex(job["shotIndex"], changeTime=False, setCamToViewport=False)
+        props.updateStoryboardFramesDisplay(forceHide=True)
+        shot.showGreasePencil()
+        scene.camera = shot.camera
+
+        scene.frame_step = 1
+        scene.frame_start = job["frameStart"]
+        scene.frame_end = job["frameEnd"]
+        scene.render.filepath = job["filepath"]
+        if job["stampNote"] is not None:
+            scene.render.use_stamp_note = True
+            scene.render.stamp_note_text = job["stampNote"]
+
+        if "FINISHED" not in bpy.ops.render.render(animation=True, write_still=False, scene=scene.name):
+            raise RuntimeError(f"Rendering of shot {shot.name} failed")
@@ -0,0 +1,277 @@
+# GPLv3 License
+#
+# Copyright (C) 2021 Ubisoft
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Fingerprints of the content of the shots, used to re-render only the shots that have changed since their last rendering
+
+A fingerprint is a hash of the inputs of the rendering of a shot: its frame range, its camera and the
+animation of the camera, the keys of the actions of the objects of the scene in the range of the shot,
+the frames of the storyboard grease pencil, the render settings and the Stamp Info settings.
+The fingerprints of the rendered shot videos are stored in a manifest file saved in the render root folder.
+
+Changes that are not keyframed (object moved without animation, modified mesh, material...) are not
+part of the fingerprint: the shot videos have to be re-rendered explicitly in those cases.
+"""
+
+import os
+import json
+import hashlib
+from array import array
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+
+from shotmanager.config import sm_logging
+
+_logger = sm_logging.getLogger(__name__)
+
+
+# name of the manifest file, saved in the render root folder
+_MANIFEST_FILE_NAME = "_ShotManager_RenderManifest.json"
+
+# version of the content of the fingerprints, to increment when it changes so that all the shots get re-rendered
+_FINGERPRINT_VERSION = 1
+
+# settings of scene.render used to render the shots. The output file path and the stamp note are not
+# included since they are set for each shot during the rendering
+_renderSettingsNames = (
+    "engine",
+    "resolution_x",
+    "resolution_y",
+    "resolution_percentage",
+    "pixel_aspect_x",
+    "pixel_aspect_y",
+    "fps",
+    "fps_base",
+    "film_transparent",
+    "use_motion_blur",
+    "use_compositing",
+    "use_sequencer",
+    "use_stamp",
+    "use_stamp_note",
+)
+
+_viewSettingsNames = ("view_transform", "look", "exposure", "gamma")
+
+# settings of Stamp Info set for each shot by renderStampedInfoForShot(). The values they are set from are
+# hashed instead, since the settings keep the values of the last rendered shot
+_stampInfoShotSettingsNames = (
+    "isInitialized",
+    "renderRootPath",
+    "customFileFullPath",
+    "edit3DFrame",
+    "edit3DTotalNumber",
+    "sequenceName",
+    "shotName",
+    "takeName",
+    "shotHandles",
+    "cornerNoteUsed",
+    "cornerNote",
+    "bottomNoteUsed",
+    "bottomNote",
+    "notesUsed",
+    "notesLine01",
+    "notesLine02",
+    "notesLine03",
+    "debug_DontDeleteCompoNodes",
+)
+
+
+def _updateWithValue(hasher, value):
+    hasher.update(repr(value).encode("utf-8"))
+    hasher.update(b"\0")
+
+
+def _updateWithRnaProperties(hasher, struct, excludedNames=()):
+    """Hash the values of the properties of the specified RNA struct, such as a property group
+    Pointers and collections are not followed
+    """
+    if struct is None:
+        _updateWithValue(hasher, None)
+        return
+
+    for prop in struct.bl_rna.properties:
+        if "rna_type" == prop.identifier or prop.identifier in excludedNames:
+            continue
+        if prop.type in ("POINTER", "COLLECTION"):
+            continue
+        value = getattr(struct, prop.identifier, None)
+        if getattr(prop, "is_array", False):
+            value = tuple(value)
+        _updateWithValue(hasher, (prop.identifier, value))
+
+
+def _updateWithAnimData(hasher, animData, frameStart, frameEnd):
+    """Hash the keys of the action of the specified animation data that have an influence in the range
+    [frameStart, frameEnd], that is the keys in the range and the closest ones on each side of it
+    """
+    action = animData.action if animData is not None else None
+    if action is None:
+        _updateWithValue(hasher, None)
+        return
+
+    _updateWithValue(hasher, action.name)
+    for fcurve in action.fcurves:
+        _updateWithValue(hasher, (fcurve.data_path, fcurve.array_index, fcurve.mute, fcurve.extrapolation))
+        keyframes = fcurve.keyframe_points
+        numKeys = len(keyframes)
+        if not numKeys:
+            continue
+
+        co = array("f", [0.0] * (2 * numKeys))
+        keyframes.foreach_get("co", co)
+        keysFrames = co[0::2]
+
+        # keys are sorted by frame in the fcurves
+        firstKeyInd = max(0, bisect_left(keysFrames, frameStart) - 1)
+        lastKeyInd = min(numKeys, bisect_right(keysFrames, frameEnd) + 1)
+
+        handleLeft = array("f", [0.0] * (2 * numKeys))
+        handleRight = array("f", [0.0] * (2 * numKeys))
+        keyframes.foreach_get("handle_left", handleLeft)
+        keyframes.foreach_get("handle_right", handleRight)
+        for values in (co, handleLeft, handleRight):
+            hasher.update(values[2 * firstKeyInd : 2 * lastKeyInd].tobytes())
+        for keyInd in range(firstKeyInd, lastKeyInd):
+            key = keyframes[keyInd]
+            _updateWithValue(hasher, (key.interpolation, key.easing))
+
+
+def _updateWithGreasePencil(hasher, gpObject, frameStart, frameEnd):
+    """Hash the frames of the grease pencil object displayed in the range [frameStart, frameEnd]"""
+    if gpObject is None or gpObject.data is None:
+        _updateWithValue(hasher, None)
+        return
+
+    _updateWithValue(hasher, (gpObject.name, gpObject.hide_render, tuple(gpObject.matrix_world.col[3])))
+    for layer in gpObject.data.layers:
+        _updateWithValue(hasher, (layer.info, layer.hide, layer.opacity, tuple(layer.tint_color), layer.tint_factor))
+
+        # a grease pencil frame is displayed until the next one so the last frame before the range is used
+        frames = [f for f in layer.frames if f.frame_number <= frameEnd]
+        firstFrameInd = 0
+        for i, frame in enumerate(frames):
+            if frame.frame_number <= frameStart:
+                firstFrameInd = i
+
+        for frame in frames[firstFrameInd:]:
+            _updateWithValue(hasher, (frame.frame_number, len(frame.strokes)))
+            for stroke in frame.strokes:
+                numPoints = len(stroke.points)
+                _updateWithValue(hasher, (stroke.material_index, stroke.line_width, numPoints))
+                if numPoints:
+                    co = array("f", [0.0] * (3 * numPoints))
+                    stroke.points.foreach_get("co", co)
+                    hasher.update(co.tobytes())
+
+
+def getShotFingerprint(scene, take, shot, frameStart, frameEnd, renderPreset=None, stampInfoSettings=None):
+    """Return the fingerprint of the content of the shot rendered from frameStart to frameEnd, as an
+    hexadecimal string.
+    It has to be called once the render settings have been applied to the scene.
+    Args:
+        renderPreset: the render settings used for the rendering
+        stampInfoSettings: the Stamp Info settings, None if Stamp Info is not used
+    """
+    props = scene.UAS_shot_manager_props
+    hasher = hashlib.sha1()
+    _updateWithValue(hasher, _FINGERPRINT_VERSION)
+
+    # shot
+    _updateWithValue(hasher, (shot.name, shot.start, shot.end, frameStart, frameEnd))
+    _updateWithValue(hasher, (shot.getEditStart(referenceLevel="GLOBAL_EDIT"), tuple(shot.color)))
+
+    # camera
+    camera = shot.camera if shot.isCameraValid() else None
+    if camera is None:
+        _updateWithValue(hasher, None)
+    else:
+        _updateWithValue(hasher, camera.name)
+        if camera.animation_data is None or camera.animation_data.action is None:
+            _updateWithValue(hasher, tuple(tuple(row) for row in camera.matrix_world))
+        _updateWithAnimData(hasher, camera.animation_data, frameStart, frameEnd)
+        _updateWithRnaProperties(hasher, camera.data)
+        _updateWithRnaProperties(hasher, camera.data.dof)
+        _updateWithAnimData(hasher, camera.data.animation_data, frameStart, frameEnd)
+
+    # animation of the objects of the scene
+    for obj in sorted(scene.objects, key=lambda o: o.name):
+        if obj == camera:
+            continue
+        if obj.animation_data is not None and obj.animation_data.action is not None:
+            _updateWithValue(hasher, obj.name)
+            _updateWithAnimData(hasher, obj.animation_data, frameStart, frameEnd)
+
+    # storyboard frame
+    if props.use_greasepencil:
+        _updateWithGreasePencil(hasher, shot.getGreasePencilObject(), frameStart, frameEnd)
+
+    # render settings
+    _updateWithRnaProperties(hasher, renderPreset)
+    _updateWithRnaProperties(hasher, props.renderContext)
+    for propName in _renderSettingsNames:
+        _updateWithValue(hasher, (propName, getattr(scene.render, propName, None)))
+    _updateWithValue(hasher, scene.render.image_settings.file_format)
+    for propName in _viewSettingsNames:
+        _updateWithValue(hasher, (propName, getattr(scene.view_settings, propName, None)))
+
+    # stamp info settings
+    _updateWithRnaProperties(hasher, stampInfoSettings, excludedNames=_stampInfoShotSettingsNames)
+    if stampInfoSettings is not None:
+        _updateWithValue(hasher, (take.name, take.note01, shot.enabled, shot.note01, shot.note02, shot.note03))
+        _updateWithValue(hasher, (props.getSequenceName("FULL"), props.getHandlesDuration(), props.getEditDuration()))
+
+    return hasher.hexdigest()
+
+
+class RenderManifest:
+    """Fingerprints of the shot videos rendered in a render root folder, keyed by the path of the videos
+    relatively to this folder
+    """
+
+    def __init__(self, rootPath):
+        self.rootPath = rootPath
+        self.filepath = os.path.join(rootPath, _MANIFEST_FILE_NAME)
+        self._fingerprints = dict()
+
+        if Path(self.filepath).exists():
+            try:
+                with open(self.filepath) as f:
+                    self._fingerprints = json.load(f).get("shots", dict())
+            except (OSError, ValueError):
+                _logger.error_ext(f"Cannot read render manifest {self.filepath}, all the shots will be rendered")
+                self._fingerprints = dict()
+
+    def _getKey(self, mediaPath):
+        return Path(os.path.relpath(mediaPath, self.rootPath)).as_posix()
+
+    def isUpToDate(self, mediaPath, fingerprint):
+        """Return True if the media exists and has been rendered with the specified fingerprint"""
+        return self._fingerprints.get(self._getKey(mediaPath), None) == fingerprint and Path(mediaPath).exists()
+
+    def setFingerprint(self, mediaPath, fingerprint):
+        self._fingerprints[self._getKey(mediaPath)] = fingerprint
+
+    def removeFingerprint(self, mediaPath):
+        self._fingerprints.pop(self._getKey(mediaPath), None)
+
+    def save(self):
+        try:
+            Path(self.rootPath).mkdir(parents=True, exist_ok=True)
+            with open(self.filepath, "w") as f:
+                json.dump({"version": _FINGERPRINT_VERSION, "shots": self._fingerprints}, f, indent=4, sort_keys=True)
+        except OSError:
+            _logger.error_ext(f"Cannot write render manifest {self.filepath}")
@@ -20,7 +20,7 @@ Global Render properties
 """
 
 from bpy.types import PropertyGroup
-from bpy.props import BoolProperty, EnumProperty
+from bpy.props import BoolProperty, EnumProperty, IntProperty
 
 from shotmanager.config import sm_logging
 
@@ -52,6 +52,41 @@ class UAS_ShotManager_RenderGlobalContext(PropertyGroup):
         options=set(),
     )
 
+    useRenderWorkers: BoolProperty(
+        name="Background Workers",
+        description="Render the images of the shots with several Blender instances running in background"
+        "\non this machine. The stamped info, the sound and the videos are still generated in this session."
+        "\nOpenGL renderings are done with the GPU engine, without the viewport overlays",
+        default=False,
+        options=set(),
+    )
+
+    numRenderWorkers: IntProperty(
+        name="Workers",
+        description="Number of Blender instances to launch to render the images, automatic if 0",
+        min=0,
+        max=64,
+        default=0,
+        options=set(),
+    )
+
+    splitShotsInRenderWorkers: BoolProperty(
+        name="Split Shots",
+        description="Split the long shots in chunks of frames rendered by different workers."
+        "\nSimulations have to be baked since a chunk is rendered without its previous frames",
+        default=True,
+        options=set(),
+    )
+
+    useStreamCopyForEditVideo: BoolProperty(
+        name="Fast Edit Video",
+        description="Build the edit video by concatenating the shot videos without re-encoding them, when ffmpeg"
+        "\nand ffprobe are installed and the shot videos have the codecs and the resolution of the edit video."
+        "\nThe VSE is used otherwise, and when the shot videos with sound have handles",
+        default=False,
+        options=set(),
+    )
+
     def _update_renderEngine(self, context):
         pass
 
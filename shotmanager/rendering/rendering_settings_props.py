@@ -105,6 +105,16 @@ class UAS_ShotManager_RenderSettings(PropertyGroup):
 
     rerenderExistingShotVideos: BoolProperty(name="Re-render Exisiting Shot Videos", default=True)
 
+    rerenderChangedShotsOnly: BoolProperty(
+        name="Re-render Changed Shots Only",
+        description=(
+            "Render only the shots whose content (range, camera, animation keys, storyboard frame, render and"
+            "\nStamp Info settings) has changed since their last rendering. The videos of the other shots are"
+            "\nreused to build the edit video.\nChanges that are not keyframed are not detected"
+        ),
+        default=False,
+    )
+
     bypass_rendering_project_settings: BoolProperty(
         name="Bypass Project Settings",
         description="When Project Settings are used this allows the use of custom rendering settings",
@@ -229,6 +239,7 @@ class UAS_ShotManager_RenderSettings(PropertyGroup):
         self.renderOtioFile = False
         self.useStampInfo = True
         self.rerenderExistingShotVideos = True
+        self.rerenderChangedShotsOnly = False
         self.bypass_rendering_project_settings = False
         self.generateImageSequence = False
         self.outputMediaMode = "VIDEO"
@@ -19,9 +19,12 @@
 Rendering code for stamp info
 """
 
+from pathlib import Path
+
 import bpy
 
 from shotmanager.config import config
+from shotmanager.stampinfo.properties import infoImage
 from shotmanager.config import sm_logging
 
 _logger = sm_logging.getLogger(__name__)
@@ -183,6 +186,50 @@ def renderStampedInfoForFrame(scene, shot):
     pass
 
 
+def _getCameraLensSampler(camera):
+    """Return a function returning the focal length of the camera at the specified frame without changing
+    the scene time, None if the focal length cannot be obtained without evaluating the scene (driver, NLA)
+    Only an animated focal length is sampled, in its fcurve, otherwise its current value is returned
+    """
+    camData = camera.data
+    lens = camData.lens
+    animData = camData.animation_data
+    if animData is None:
+        return lambda frame: lens
+
+    if len(animData.nla_tracks) or animData.drivers.find("lens") is not None:
+        return None
+
+    fcurve = None if animData.action is None else animData.action.fcurves.find("lens")
+    if fcurve is None or fcurve.mute:
+        return lambda frame: lens
+    return fcurve.evaluate
+
+
+def getShotStampFramesValues(props, shot, frameStart, frameEnd):
+    """Return the list of the stamp values of the frames of the shot from frameStart to frameEnd included,
+    each one being a dictionary. The values are computed without changing the scene time.
+    Return None if some of them require the evaluation of the scene at each frame
+    """
+    lensSampler = _getCameraLensSampler(shot.camera)
+    if lensSampler is None:
+        return None
+
+    cameraName = shot.camera.name
+
+    framesValues = list()
+    for frame in range(frameStart, frameEnd + 1):
+        framesValues.append(
+            {
+                "frame": frame,
+                "edit3DFrame": props.getEditTime(shot, frame, referenceLevel="GLOBAL_EDIT"),
+                "cameraName": cameraName,
+                "cameraLens": lensSampler(frame),
+            }
+        )
+    return framesValues
+
+
 def renderStampedInfoForShot(
     stampInfoSettings,
     shotManagerProps,
@@ -196,6 +243,7 @@ def renderStampedInfoForShot(
     render_handles=True,
     specificFrame=None,
     stampInfoCustomSettingsDict=None,
+    metadataOnly=True,
     verbose=False,
 ):
     """Launch the rendering or the frames of the shot, with Stamp Info
@@ -207,6 +255,9 @@ def renderStampedInfoForShot(
 
     Args:
         resolution: array [width, height], resolution of the image rendered in Blender
+        metadataOnly: if True the stamp values of all the frames are computed before drawing them and the scene
+                      time is not changed, which avoids the evaluation of the scene at each frame. If some values
+                      cannot be obtained that way (eg: driven focal length) the time is changed at each frame
     """
     if not (newTempRenderPath.endswith("/") or newTempRenderPath.endswith("\\")):
         newTempRenderPath += "\\"
@@ -339,59 +390,78 @@ def renderStampedInfoForShot(
     elif not render_handles:
         render_frame_end = shot.end
 
-    for f, currentFrame in enumerate(range(render_frame_start, render_frame_end + 1)):
+    framesValues = None
+    if metadataOnly:
+        framesValues = getShotStampFramesValues(props, shot, render_frame_start, render_frame_end)
+        if framesValues is None:
+            _logger.debug_ext(
+                "Stamp values of shot %s require the scene evaluation", shot.name, col="GRAY", tag="RENDER"
+            )
 
-        # TODO
-        renderStampedInfoForFrame(scene, currentFrame)
+    stampInfoSettings.renderRootPath = newTempRenderPath
 
-        # scene.frame_current = currentFrame
-        scene.frame_set(currentFrame)
+    stampInfoSettings.shotName = f"{props.getRenderShotPrefix()}{shot.name}"
+    # stampInfoSettings.shotName = f"{shot.name}"
 
-        # scene.render.filepath = shot.getOutputMediaPath(
-        #     rootPath=rootPath, insertTempFolder=True, specificFrame=scene.frame_current
-        # )
-        scene.render.filepath = shot.getOutputMediaPath(
-            "SH_INTERM_STAMPINFO_SEQ", rootPath=rootPath, specificFrame=scene.frame_current
-        )
-        #    shotFilename = shot.getName_PathCompliant()
+    if stampInfoCustomSettingsDict is not None:
+        if True or "asset_tracking_step" in stampInfoCustomSettingsDict:
+            stampInfoSettings.bottomNoteUsed = True
+            stampInfoSettings.bottomNote = "Step: " + stampInfoCustomSettingsDict["asset_tracking_step"]
+        else:
+            stampInfoSettings.bottomNoteUsed = False
+            stampInfoSettings.bottomNote = ""
 
-        stampInfoSettings.renderRootPath = newTempRenderPath
+    stampInfoSettings.cameraName = shot.camera.name
 
-        stampInfoSettings.shotName = f"{props.getRenderShotPrefix()}{shot.name}"
-        # stampInfoSettings.shotName = f"{shot.name}"
+    Path(newTempRenderPath).mkdir(parents=True, exist_ok=True)
 
-        if stampInfoCustomSettingsDict is not None:
-            if True or "asset_tracking_step" in stampInfoCustomSettingsDict:
-                stampInfoSettings.bottomNoteUsed = True
-                stampInfoSettings.bottomNote = "Step: " + stampInfoCustomSettingsDict["asset_tracking_step"]
-            else:
-                stampInfoSettings.bottomNoteUsed = False
-                stampInfoSettings.bottomNote = ""
+    # the static part of the images is drawn once and the images are drawn and saved in worker threads
+    stampSettings = infoImage.StampedImageSettings(scene, resolutionFramed[0], resolutionFramed[1], resolution[1])
+    with infoImage.StampedImagesWriter(stampSettings) as imagesWriter:
+        for f, currentFrame in enumerate(range(render_frame_start, render_frame_end + 1)):
 
-        stampInfoSettings.cameraName = shot.camera.name
-        stampInfoSettings.edit3DFrame = props.getEditTime(shot, currentFrame, referenceLevel="GLOBAL_EDIT")
+            # TODO
+            renderStampedInfoForFrame(scene, currentFrame)
 
-        tmpShotFilename = shot.getOutputMediaPath(
-            "SH_INTERM_STAMPINFO_SEQ", providePath=False, specificFrame=currentFrame
-        )
-        if verbose:
-            # txt = "      ------------------------------------------"
-            txt = f"Stamp Info Frame:  Shot: {shot.name} {currentFrame}   ( {f + 1} / {numFramesInShot} )"
-            # txt += f"\n    File path: {scene.render.filepath}"
-            # txt += f"\n{'   - File name: ': <20}{tmpShotFilename}"
-            txt += f"{'   File: '}{tmpShotFilename}"
-            # txt += f"\n    stampInfoSettings.renderRootPath: {stampInfoSettings.renderRootPath}"
-            _logger.info_ext(txt)
-
-        stampInfoSettings.renderTmpImageWithStampedInfo(
-            scene,
-            currentFrame,
-            resolution=resolutionFramed,
-            innerHeight=resolution[1],
-            renderPath=newTempRenderPath,
-            renderFilename=tmpShotFilename,
-            verbose=False,
-        )
+            if framesValues is None:
+                # scene.frame_current = currentFrame
+                scene.frame_set(currentFrame)
+                frameValues = {
+                    "frame": currentFrame,
+                    "edit3DFrame": props.getEditTime(shot, currentFrame, referenceLevel="GLOBAL_EDIT"),
+                    "cameraName": scene.camera.name,
+                    "cameraLens": scene.camera.data.lens,
+                }
+            else:
+                frameValues = framesValues[f]
+
+            # scene.render.filepath = shot.getOutputMediaPath(
+            #     rootPath=rootPath, insertTempFolder=True, specificFrame=scene.frame_current
+            # )
+            scene.render.filepath = shot.getOutputMediaPath(
+                "SH_INTERM_STAMPINFO_SEQ", rootPath=rootPath, specificFrame=currentFrame
+            )
+            #    shotFilename = shot.getName_PathCompliant()
+
+            tmpShotFilename = shot.getOutputMediaPath(
+                "SH_INTERM_STAMPINFO_SEQ", providePath=False, specificFrame=currentFrame
+            )
+            if verbose:
+                # txt = "      ------------------------------------------"
+                txt = f"Stamp Info Frame:  Shot: {shot.name} {currentFrame}   ( {f + 1} / {numFramesInShot} )"
+                # txt += f"\n    File path: {scene.render.filepath}"
+                # txt += f"\n{'   - File name: ': <20}{tmpShotFilename}"
+                txt += f"{'   File: '}{tmpShotFilename}"
+                # txt += f"\n    stampInfoSettings.renderRootPath: {stampInfoSettings.renderRootPath}"
+                _logger.info_ext(txt)
+
+            imagesWriter.addImage(
+                newTempRenderPath + tmpShotFilename,
+                currentFrame,
+                edit3DFrame=frameValues["edit3DFrame"],
+                cameraName=frameValues["cameraName"],
+                cameraLens=frameValues["cameraLens"],
+            )
 
     if verbose:
         txt = "\n------------------------------------------\n"
@@ -433,6 +433,16 @@ def draw3DRenderPanel(self, context):
         subRow.label(text="Iteration (dev.):")
         subRow.prop(props.renderContext, "renderFrameIterationMode", text="")
 
+    row = layout.row(align=False)
+    row.prop(props.renderContext, "useRenderWorkers")
+    subRow = row.row(align=True)
+    subRow.enabled = props.renderContext.useRenderWorkers
+    subRow.prop(props.renderContext, "numRenderWorkers")
+    subRow.prop(props.renderContext, "splitShotsInRenderWorkers", text="Split Shots")
+
+    row = layout.row(align=True)
+    row.prop(props.renderContext, "useStreamCopyForEditVideo")
+
     # row.prop(bpy.context.scene.render, "engine", text="Engine")
 
     # row = layout.row(align=False)
@@ -730,6 +740,9 @@ def draw3DRenderPanel(self, context):
         row.prop(props.renderSettingsAll, "rerenderExistingShotVideos")
         row.prop(props.renderSettingsAll, "generateEditVideo")
 
+        row = col.row()
+        row.prop(props.renderSettingsAll, "rerenderChangedShotsOnly")
+
         row = col.row()
         row.prop(props.renderSettingsAll, "renderAllTakes")
         row.prop(props.renderSettingsAll, "renderAlsoDisabled")
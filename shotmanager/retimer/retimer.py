@@ -21,6 +21,11 @@ Retimer functions
 
 import bpy
 
+try:
+    import numpy as np
+except ModuleNotFoundError:
+    np = None
+
 from shotmanager.utils.utils_markers import sortMarkers
 
 # from shotmanager.config import config
@@ -460,6 +465,216 @@ def _snap_fCurve_frames(
             _set_time_fCurve_key(key, round(key_time))
 
 
+##########################################################################
+# fcurve - vectorized
+# Same operations as the functions above but applied to all the keys of the fcurve at once, on
+# arrays read and written with foreach_get and foreach_set. The computations are done in double
+# precision, in the same order as the per-key functions, so that the results are identical
+##########################################################################
+
+
+class FCurveArrays:
+    """Time values of the keys of an fcurve, as NumPy arrays in double precision"""
+
+    def __init__(self, fcurve):
+        self.fcurve = fcurve
+        self.read()
+
+    def _getArray(self, attr):
+        keyframe_points = self.fcurve.keyframe_points
+        values = np.empty(2 * len(keyframe_points), dtype=np.float32)
+        keyframe_points.foreach_get(attr, values)
+        return values.astype(np.float64).reshape(-1, 2)
+
+    def read(self):
+        self.co = self._getArray("co")
+        self.handle_left = self._getArray("handle_left")
+        self.handle_right = self._getArray("handle_right")
+
+    def write(self):
+        keyframe_points = self.fcurve.keyframe_points
+        keyframe_points.foreach_set("co", self.co.astype(np.float32).ravel())
+        keyframe_points.foreach_set("handle_left", self.handle_left.astype(np.float32).ravel())
+        keyframe_points.foreach_set("handle_right", self.handle_right.astype(np.float32).ravel())
+        # foreach_set doesn't trigger the update of the animation
+        self.fcurve.id_data.update_tag()
+
+    @property
+    def times(self):
+        return self.co[:, 0]
+
+    def setTimes(self, mask, new_key_times):
+        """Same as _set_time_fCurve_key() applied to the keys selected by mask"""
+        offsets = new_key_times - self.co[mask, 0]
+        self.handle_left[mask, 0] += offsets
+        self.handle_right[mask, 0] += offsets
+        self.co[mask, 0] = new_key_times
+
+    def __len__(self):
+        return len(self.co)
+
+
+def _compute_offset_array(frame_values, pivot, factor):
+    """Same as compute_offset(frame_values, pivot, factor, roundToNearestFrame=False) for arrays"""
+    duration_to_pivot = pivot - frame_values
+    new_duration_to_pivot = duration_to_pivot * factor
+    return duration_to_pivot - new_duration_to_pivot
+
+
+def _offset_fCurve_frames_arrays(keys: FCurveArrays, start_incl, offset, roundToNearestFrame):
+    mask = start_incl <= keys.times
+    new_key_times = keys.times[mask] + offset
+    if roundToNearestFrame:
+        # np.round rounds half to even, as the built-in round()
+        new_key_times = np.round(new_key_times)
+    keys.setTimes(mask, new_key_times)
+
+
+def _remove_fCurve_frames_arrays(fcurve: FCurve, start_incl, end_incl, remove_gap=False, roundToNearestFrame=True):
+    """Same as FCurve.remove_frames(). The keys are removed one by one since keyframe_points.remove() recomputes
+    the handles of the curve, then the remaining keys are offset at once"""
+    keys = FCurveArrays(fcurve.fcurve)
+    to_remove = np.flatnonzero((start_incl <= keys.times) & (keys.times <= end_incl))
+
+    if len(to_remove):
+        keyframe_points = fcurve.fcurve.keyframe_points
+        for i in reversed(to_remove):
+            keyframe_points.remove(keyframe_points[int(i)])
+        keys.read()
+
+    if remove_gap:
+        _offset_fCurve_frames_arrays(keys, end_incl, start_incl - end_incl - 1, roundToNearestFrame)
+        keys.write()
+
+
+def _rescale_fCurve_frames_arrays(
+    *,
+    keys: FCurveArrays,
+    start_incl,
+    end_incl,
+    factor,
+    pivot,
+    roundToNearestFrame=True,
+    keysBeforeRangeMode="DO_NOTHING",
+    keysAfterRangeMode="DO_NOTHING",
+):
+    """Same as _rescale_fCurve_frames() with clamp set to False"""
+    key_times = keys.times.copy()
+    isBefore = key_times < start_incl
+    isAfter = ~isBefore & (end_incl < key_times)
+    isInRange = ~isBefore & ~isAfter
+
+    rescaleMask = isInRange.copy()
+    offsetMask = np.zeros(len(keys), dtype=bool)
+    for modeMask, changeMode in ((isBefore, keysBeforeRangeMode), (isAfter, keysAfterRangeMode)):
+        if "RESCALE" == changeMode:
+            rescaleMask |= modeMask
+        elif "OFFSET" == changeMode:
+            offsetMask |= modeMask
+
+    # rescale
+    t = key_times[rescaleMask]
+    new_key_times = t + _compute_offset_array(t, pivot, factor)
+    if roundToNearestFrame:
+        new_key_times = np.round(new_key_times)
+    keys.co[rescaleMask, 0] = new_key_times
+
+    # see _rescale_fCurve_frames() for the handles
+    onPivot = t == pivot
+    notOnPivot = ~onPivot
+    left_handles = keys.handle_left[rescaleMask, 0]
+    right_handles = keys.handle_right[rescaleMask, 0]
+
+    factor_for_rounded_offset = (new_key_times[notOnPivot] - pivot) / (t[notOnPivot] - pivot)
+    left_handles[notOnPivot] += _compute_offset_array(left_handles[notOnPivot], pivot, factor_for_rounded_offset)
+    right_handles[notOnPivot] += _compute_offset_array(right_handles[notOnPivot], pivot, factor_for_rounded_offset)
+
+    leftMask = onPivot & (start_incl < left_handles)
+    left_handles[leftMask] += _compute_offset_array(left_handles[leftMask], pivot, factor)
+    rightMask = onPivot & (right_handles < end_incl)
+    right_handles[rightMask] += _compute_offset_array(right_handles[rightMask], pivot, factor)
+
+    keys.handle_left[rescaleMask, 0] = left_handles
+    keys.handle_right[rescaleMask, 0] = right_handles
+
+    # offset
+    for modeMask, refFrame in ((offsetMask & isBefore, start_incl), (offsetMask & isAfter, end_incl)):
+        offset = compute_offset(refFrame, pivot, factor, roundToNearestFrame=False)
+        new_key_times = key_times[modeMask] + offset
+        if roundToNearestFrame:
+            new_key_times = np.round(new_key_times)
+        keys.setTimes(modeMask, new_key_times)
+
+
+def _snap_fCurve_frames_arrays(
+    *,
+    keys: FCurveArrays,
+    start_incl,
+    end_incl,
+    keysBeforeRangeMode="DO_NOTHING",
+    keysAfterRangeMode="DO_NOTHING",
+):
+    """Same as _snap_fCurve_frames()"""
+    isBefore = keys.times < start_incl
+    isAfter = ~isBefore & (end_incl < keys.times)
+    snapMask = ~isBefore & ~isAfter
+    if "SNAP" == keysBeforeRangeMode:
+        snapMask |= isBefore
+    if "SNAP" == keysAfterRangeMode:
+        snapMask |= isAfter
+
+    keys.setTimes(snapMask, np.round(keys.times[snapMask]))
+
+
+def _retime_fCurve_frames_arrays(
+    fcurve: FCurve,
+    mode,
+    start_incl=0,
+    end_incl=0,
+    remove_gap=True,
+    factor=1.0,
+    pivot=0,
+    roundToNearestFrame=True,
+    keysBeforeRangeMode="DO_NOTHING",
+    keysAfterRangeMode="DO_NOTHING",
+):
+    """Vectorized version of retime_fCurve_frames(), for the modes INSERT, DELETE, CLEAR_ANIM, RESCALE and SNAP"""
+    if not len(fcurve):
+        return
+
+    if mode == "DELETE" or mode == "CLEAR_ANIM":
+        _remove_fCurve_frames_arrays(fcurve, start_incl, end_incl, remove_gap)
+        return
+
+    keys = FCurveArrays(fcurve.fcurve)
+
+    if mode == "INSERT":
+        _offset_fCurve_frames_arrays(keys, start_incl, end_incl - start_incl + 1, roundToNearestFrame)
+
+    elif mode == "RESCALE":
+        _rescale_fCurve_frames_arrays(
+            keys=keys,
+            start_incl=start_incl,
+            end_incl=end_incl,
+            factor=factor,
+            pivot=pivot,
+            roundToNearestFrame=roundToNearestFrame,
+            keysBeforeRangeMode=keysBeforeRangeMode,
+            keysAfterRangeMode=keysAfterRangeMode,
+        )
+
+    elif mode == "SNAP":
+        _snap_fCurve_frames_arrays(
+            keys=keys,
+            start_incl=start_incl,
+            end_incl=end_incl,
+            keysBeforeRangeMode=keysBeforeRangeMode,
+            keysAfterRangeMode=keysAfterRangeMode,
+        )
+
+    keys.write()
+
+
 def retime_fCurve_frames(
     fcurve: FCurve,
     mode,
@@ -471,6 +686,7 @@ def retime_fCurve_frames(
     roundToNearestFrame=True,
     keysBeforeRangeMode="DO_NOTHING",
     keysAfterRangeMode="DO_NOTHING",
+    vectorized=True,
 ):
     """
     Args:
@@ -479,7 +695,23 @@ def retime_fCurve_frames(
         duration_incl (int): The range of retime frames (new or deleted)
         keysBeforeRangeMode: Action to do on keys located before the specified time range. Can be DO_NOTHING, OFFSET, RESCALE, SNAP
         keysAfterRangeMode: Action to do on keys located after the specified time range. Can be DO_NOTHING, OFFSET, RESCALE, SNAP
+        vectorized: if True and NumPy is available then all the keys of the fcurve are retimed at once, otherwise
+            they are retimed one by one. Results are the same
     """
+    if vectorized and np is not None and mode in ("INSERT", "DELETE", "CLEAR_ANIM", "RESCALE", "SNAP"):
+        _retime_fCurve_frames_arrays(
+            fcurve,
+            mode,
+            start_incl=start_incl,
+            end_incl=end_incl,
+            remove_gap=remove_gap,
+            factor=factor,
+            pivot=pivot,
+            roundToNearestFrame=roundToNearestFrame,
+            keysBeforeRangeMode=keysBeforeRangeMode,
+            keysAfterRangeMode=keysAfterRangeMode,
+        )
+        return
 
     if mode == "INSERT":
         _offset_fCurve_frames(fcurve, start_incl, end_incl - start_incl + 1, roundToNearestFrame)
@@ -657,6 +889,155 @@ def retime_GPframes(
     return ()
 
 
+def _getGPLayersFrameNumbers(layers):
+    """Return the frame numbers of all the frames of the specified layers in a single array, and the list of
+    the indices in this array of the first frame of each layer, followed by the total number of frames"""
+    layersStarts = [0]
+    for layer in layers:
+        layersStarts.append(layersStarts[-1] + len(layer.frames))
+
+    frameNumbers = np.empty(layersStarts[-1], dtype=np.int32)
+    for i, layer in enumerate(layers):
+        layer.frames.foreach_get("frame_number", frameNumbers[layersStarts[i] : layersStarts[i + 1]])
+
+    return frameNumbers, layersStarts
+
+
+def _remove_GPframes(layer, frameIndices):
+    frames = layer.frames
+    for i in reversed(frameIndices):
+        frames.remove(frames[int(i)])
+
+
+def _sort_GPframes(layer, newFrameNumbers):
+    """Set the specified numbers, which must be unique, to the frames of the layer and put the frames in the
+    order of these numbers. Setting the number of a frame doesn't move it in the list of the frames of the layer,
+    which is expected to be sorted by time, so the frames are copied in time order and the initial ones removed
+    """
+    frames = layer.frames
+    numFrames = len(frames)
+
+    # the initial frames get numbers after the new ones so that the copies cannot collide with them
+    tempStart = int(newFrameNumbers.max()) + 1
+    frames.foreach_set("frame_number", np.arange(tempStart, tempStart + numFrames, dtype=np.int32))
+    for frameInd in np.argsort(newFrameNumbers, kind="stable"):
+        frames.copy(frames[int(frameInd)]).frame_number = int(newFrameNumbers[frameInd])
+
+    for _ in range(numFrames):
+        frames.remove(frames[0])
+
+
+def retime_GPlayers(
+    layers,
+    mode,
+    start_incl=0,
+    end_incl=0,
+    remove_gap=True,
+    factor=1.0,
+    pivot=0,
+    roundToNearestFrame=True,
+    keysBeforeRangeMode="DO_NOTHING",
+    keysAfterRangeMode="DO_NOTHING",
+):
+    """Same as retime_GPframes() applied to all the specified layers at once
+    The frame numbers of all the layers are read in one pass, the new numbers are computed on a single
+    array and then set to each layer with foreach_set.
+    When rescaling, several frames of a layer can get the same number. In this case only the latest frame,
+    the one that was displayed at the end of the time range, is kept. Rescaled frames overtaking frames that
+    were not moved are put back in time order.
+    """
+    if np is None or mode not in ("INSERT", "DELETE", "CLEAR_ANIM", "RESCALE"):
+        for layer in layers:
+            retime_GPframes(
+                layer,
+                mode,
+                start_incl,
+                end_incl,
+                remove_gap,
+                factor,
+                pivot,
+                roundToNearestFrame,
+                keysBeforeRangeMode,
+                keysAfterRangeMode,
+            )
+        return
+
+    layers = [layer for layer in layers if len(layer.frames)]
+    if not len(layers):
+        return
+
+    offset = end_incl - start_incl + 1
+    frameNumbers, layersStarts = _getGPLayersFrameNumbers(layers)
+
+    if mode == "DELETE" or mode == "CLEAR_ANIM":
+        toRemove = (start_incl <= frameNumbers) & (frameNumbers <= end_incl)
+        if toRemove.any():
+            for i, layer in enumerate(layers):
+                _remove_GPframes(layer, np.flatnonzero(toRemove[layersStarts[i] : layersStarts[i + 1]]))
+            frameNumbers, layersStarts = _getGPLayersFrameNumbers(layers)
+
+        # remove empty gap
+        if mode == "DELETE":
+            newFrameNumbers = np.where(end_incl <= frameNumbers, frameNumbers - offset, frameNumbers)
+        else:
+            newFrameNumbers = frameNumbers
+
+    elif mode == "INSERT":
+        newFrameNumbers = np.where(start_incl <= frameNumbers, frameNumbers + offset, frameNumbers)
+
+    elif mode == "RESCALE":
+        # NOTE: whereas key_time in fcurve is a float, here frameNumber is an int !!!
+        frameNumbersFloat = frameNumbers.astype(np.float64)
+        isBefore = frameNumbersFloat < start_incl
+        isAfter = ~isBefore & (end_incl < frameNumbersFloat)
+
+        rescaleMask = ~isBefore & ~isAfter
+        offsets = np.zeros(len(frameNumbers), dtype=np.float64)
+        for modeMask, changeMode, refFrame in (
+            (isBefore, keysBeforeRangeMode, start_incl),
+            (isAfter, keysAfterRangeMode, end_incl),
+        ):
+            if "RESCALE" == changeMode:
+                rescaleMask |= modeMask
+            elif "OFFSET" == changeMode:
+                offsets[modeMask] = compute_offset(refFrame, pivot, factor, roundToNearestFrame=False)
+
+        # see compute_offset()
+        durationToPivot = pivot - frameNumbersFloat[rescaleMask]
+        offsets[rescaleMask] = durationToPivot - durationToPivot * factor
+
+        # rounding has to be done anyway since GP frames are integer
+        newFrameNumbers = np.round(frameNumbersFloat + offsets).astype(np.int32)
+
+    for i, layer in enumerate(layers):
+        layerFrameNumbers = frameNumbers[layersStarts[i] : layersStarts[i + 1]]
+        layerNewFrameNumbers = newFrameNumbers[layersStarts[i] : layersStarts[i + 1]]
+        if np.array_equal(layerFrameNumbers, layerNewFrameNumbers):
+            continue
+
+        # collisions: a rescaled frame can get the number of any other frame of the layer, rescaled or not.
+        # For each new number only the frame that was the latest one in the layer is kept
+        numFrames = len(layerNewFrameNumbers)
+        _, lastIndicesReversed = np.unique(layerNewFrameNumbers[::-1], return_index=True)
+        if len(lastIndicesReversed) < numFrames:
+            keptFrames = np.zeros(numFrames, dtype=bool)
+            keptFrames[numFrames - 1 - lastIndicesReversed] = True
+            collisions = np.flatnonzero(~keptFrames)
+            _logger.debug_ext(
+                "Removing %s colliding frames in GP layer %s", len(collisions), layer.info, col="ORANGE", tag="RETIMER"
+            )
+            _remove_GPframes(layer, collisions)
+            layerNewFrameNumbers = layerNewFrameNumbers[keptFrames]
+
+        # rescaled frames can also overtake frames that were not moved
+        if np.any(layerNewFrameNumbers[:-1] > layerNewFrameNumbers[1:]):
+            _sort_GPframes(layer, layerNewFrameNumbers)
+        else:
+            layer.frames.foreach_set("frame_number", layerNewFrameNumbers)
+        # foreach_set doesn't trigger the update of the data
+        layer.id_data.update_tag()
+
+
 ##########################################################################
 # shot range
 ##########################################################################
@@ -1191,12 +1572,10 @@ def retimeScene(
                     #     if not action_tmp_added:
                     #         actions_done.add(action)
 
-                for layer in obj.data.layers:
-                    #    print(f"Treating GP object: {obj.name} layer: {layer}")
-                    if not layer.lock or retimerApplyToSettings.includeLockAnim:
-                        retime_GPframes(
-                            layer, *retime_args, roundToNearestFrame, keysBeforeRangeMode, keysAfterRangeMode
-                        )
+                layers = [
+                    layer for layer in obj.data.layers if not layer.lock or retimerApplyToSettings.includeLockAnim
+                ]
+                retime_GPlayers(layers, *retime_args, roundToNearestFrame, keysBeforeRangeMode, keysAfterRangeMode)
 
                 if action_tmp_added:
                     obj.animation_data.action = None
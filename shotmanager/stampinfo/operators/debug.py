@@ -22,9 +22,10 @@ This module is used for debug
 
 import bpy
 from bpy.types import Panel, Operator
-from bpy.props import BoolProperty
+from bpy.props import BoolProperty, IntProperty
 
 from shotmanager.utils import utils_render
+from ..properties import infoImage
 
 from shotmanager.config import config
 from shotmanager.config import sm_logging
@@ -45,6 +46,29 @@ class UAS_Stamp_Info_OT_EnableDebug(Operator):
         return {"FINISHED"}
 
 
+class UAS_Stamp_Info_OT_BenchmarkImages(Operator):
+    bl_idname = "uas_stamp_info.benchmark_images"
+    bl_label = "Benchmark Stamped Images"
+    bl_description = (
+        "Write the stamped images of the first frames of the scene in a temporary folder, one image at a time"
+        "\nand then with the cached static layer and the worker threads, and compare the durations"
+    )
+    bl_options = {"INTERNAL"}
+
+    numFrames: IntProperty(name="Frames", description="Number of images to write", min=1, default=100)
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+    def execute(self, context):
+        serialDuration, writerDuration = infoImage.benchmarkStampedImages(context.scene, numFrames=self.numFrames)
+        self.report(
+            {"INFO"},
+            f"Stamped images: one at a time: {serialDuration:.2f} s, with the writer: {writerDuration:.2f} s",
+        )
+        return {"FINISHED"}
+
+
 # ------------------------------------------------------------------------#
 #                                Debug Panel                             #
 # ------------------------------------------------------------------------#
@@ -77,6 +101,9 @@ class UAS_PT_SMStampInfoDebug(Panel):
         row.prop(scene.UAS_SM_StampInfo_Settings, "debug_DrawTextLines")
         #    row.prop(scene.UAS_SM_StampInfo_Settings, "offsetToCenterHNorm")
 
+        row = layout.row()
+        row.operator("uas_stamp_info.benchmark_images")
+
         if not utils_render.isRenderPathValid(context.scene):
             row = layout.row()
             row.alert = True
@@ -85,6 +112,7 @@ class UAS_PT_SMStampInfoDebug(Panel):
 
 _classes = (
     UAS_Stamp_Info_OT_EnableDebug,
+    UAS_Stamp_Info_OT_BenchmarkImages,
     UAS_PT_SMStampInfoDebug,
 )
 
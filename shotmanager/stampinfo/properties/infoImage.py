@@ -17,725 +17,829 @@
 
 """
 Generation of the frame images
+
+The settings and the scene values used to draw the images are copied in a StampedImageSettings snapshot in
+the main thread. Everything else is pure PIL work that can run in worker threads: a StampedImageLayout draws
+once the static layer of the images (borders, logo, notes...) and then only the values that change from
+a frame to another, and a StampedImagesWriter draws and saves the images of a sequence in parallel.
 """
 
 
 import os
 from pathlib import Path
 import getpass
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 import bpy
 
 from datetime import datetime
-from .stamper import getInfoFileFullPath
+from .stamper import getInfoFileFullPath, getRenderResolutionForStampInfo, getInnerHeight
 
 from shotmanager.config import sm_logging
 
 _logger = sm_logging.getLogger(__name__)
 
 
-# Preparation of the files
-def renderStampedImage(
-    scene, currentFrame, renderW, renderH, innerH, renderPath=None, renderFilename=None, verbose=False
-):
-    """Called by the Pre renderer callback
-    Preparation of the files
-    """
-    # Notes
-    #   - Image origine is at TOP LEFT corner
-    #   - Everything is proportionnal to the HEIGHT of the output image
-    #
-    # Metadata from Blender:
-    #   top:    file, date, render time, host, note, memory         frame range
-    #   bottom: marker, timecode, frame, camera, lens               sequencer strip, strip metadata
+# dictionary of the fonts used to stamp the images, keyed by font size
+_fonts = dict()
 
-    from PIL import Image, ImageDraw, ImageFont
 
-    if verbose:
-        print("\n       renderTmpImageWithStampedInfo ")
+def _getFont(fontsize):
+    """Return the font of the specified size, loaded only once"""
+    from PIL import ImageFont
 
-    siSettings = scene.UAS_SM_StampInfo_Settings
-    # prefs = config.getShotManagerPrefs()
-    paddingLeftMetadataTopNorm = 0.0
-    paddingLeftMetadataBottomNorm = 0.0
-
-    # stamp_background
-    # stamp_font_size
-    # stamp_foreground
-    # stamp_note_text
-    # use_stamp
-    # use_stamp_camera
-    # use_stamp_date
-    # use_stamp_filename
-    # use_stamp_frame
-    # use_stamp_frame_range
-    # use_stamp_hostname
-    # use_stamp_labels
-    # use_stamp_lens
-    # use_stamp_marker
-    # use_stamp_memory
-    # use_stamp_note
-    # use_stamp_render_time
-    # use_stamp_scene
-    # use_stamp_sequencer_strip
-    # use_stamp_strip_meta
-    # use_stamp_time
-    # support of metadata from Blender
-
-    # !!! Removed !!! Wkip: to rewrite in a smarter way !!!
-    # if scene.render.use_stamp:
-    if False:
-        if (
-            scene.render.use_stamp_filename
-            or scene.render.use_stamp_date
-            or scene.render.use_stamp_render_time
-            or scene.render.use_stamp_hostname
-            or scene.render.use_stamp_note
-            or scene.render.use_stamp_frame_range
-            or scene.render.use_stamp_memory
-        ):
-            paddingLeftMetadataTopNorm = 0.2
-
-        if (
-            scene.render.use_stamp_marker
-            or scene.render.use_stamp_time
-            or scene.render.use_stamp_frame
-            or scene.render.use_stamp_camera
-            or scene.render.use_stamp_lens
-            or scene.render.use_stamp_sequencer_strip
-            or scene.render.use_strip_meta
-        ):
-            paddingLeftMetadataBottomNorm = 0.2
-
-    borderTopH = max(
-        int((renderH - innerH) * 0.5), 0
-    )  # border cannot be negative, which happens if render ratio < inner ratio
-    borderBottomH = borderTopH
-
-    # ---------- framing control settings ----------------
-    paddingTopExtNorm = siSettings.extPaddingNorm
-    # 0.03      # padding near the exterior of the image on the border rectangle
-    paddingTopIntNorm = 0.04  # not used here # padding near the interior of the image on the border rectangle
-    paddingLeftNorm = siSettings.extPaddingHorizNorm
-
-    textLineNorm = siSettings.fontScaleHNorm
-    textInterlineNorm = siSettings.interlineHNorm  # 0.01
-    numLinesTop = 3
-    numLinesBottom = numLinesTop
-
-    if siSettings.automaticTextSize:
-        borderTopNorm = min(0.5, borderTopH / renderH)
-        paddingTopExtNormInBorder = siSettings.extPaddingNorm * 10.0  # 0.2
-        paddingTopIntNormInBorder = 0.1
-        paddingTopExtNorm = paddingTopExtNormInBorder * borderTopNorm
-        paddingTopIntNorm = paddingTopIntNormInBorder * borderTopNorm
-
-        textInterlineNormInBorder = siSettings.interlineHNorm  # 0.04
-        textInterlineNorm = textInterlineNormInBorder * borderTopNorm
-
-        textBorderNorm = borderTopNorm - paddingTopExtNorm - paddingTopIntNorm
-        if textBorderNorm <= (numLinesTop - 1) * textInterlineNorm:
-            textBorderNorm = 0.0
-            textLineNorm = 0.0
-        else:
-            textLineNorm = min(textLineNorm, (textBorderNorm - (numLinesTop - 1) * textInterlineNorm) / 3.0)
+    font = _fonts.get(fontsize, None)
+    if font is None:
+        font = ImageFont.truetype("arial", fontsize)
+        _fonts[fontsize] = font
+    return font
 
-    # ---------- framing control settings ----------------
 
-    # All dimensions are normalized as if the image had the size 1.0 * 1.0
-    # fontScaleHNorm      = siSettings.fontScaleHNorm        #0.03
-    # fontsize            = int(fontScaleHNorm * renderH)
-    # font                = ImageFont.truetype("arial", fontsize)
-    # textLineH           = (font.getsize("Aj"))[1]            # line height
+class StampedImageSettings:
+    """Snapshot of the Stamp Info settings and of the scene values used to draw the stamped images
+    It holds only Python values so that the images can be drawn out of the main thread of Blender
+    """
 
-    textLineH = int(renderH * textLineNorm)
-    textInterlineH = int(renderH * textInterlineNorm)
-
-    fontsize = int(1.0 * textLineNorm * renderH)
-    font = ImageFont.truetype("arial", fontsize)
-    fontHeight = (font.getsize("Text"))[1]
-    fontLargeFactor = 1.6
-    fontLarge = ImageFont.truetype("arial", int(fontsize * fontLargeFactor))
-    fontLargeHeight = (fontLarge.getsize("Text"))[1]
-
-    paddingLeft = int((paddingLeftNorm) * renderW)
-    paddingLeftMetadataTop = int((paddingLeftMetadataTopNorm) * renderW)
-    paddingLeftMetadataBottom = int((paddingLeftMetadataBottomNorm) * renderW)
-    # paddingLeft         = int((paddingLeftNorm + paddingLeftMetadataTopNorm) * renderW)
-    #    paddingRight = paddingLeft
-
-    paddingTopExt = int(paddingTopExtNorm * renderH)
-    paddingBottomExt = paddingTopExt
-    #    paddingTopInt = int(paddingTopIntNorm * renderH)
-    #    paddingBottomInt = paddingTopInt
-
-    borderColorRGB = siSettings.borderColor  # (0, 0, 0, 255)
-    borderColorRGBA = (
-        int(borderColorRGB[0] * 255),
-        int(borderColorRGB[1] * 255),
-        int(borderColorRGB[2] * 255),
-        int(borderColorRGB[3] * 255),
+    # names of the Stamp Info settings copied in the snapshot
+    _settingsNames = (
+        "animDurationUsed",
+        "animRangeUsed",
+        "automaticTextSize",
+        "borderColor",
+        "borderUsed",
+        "bottomNote",
+        "bottomNoteUsed",
+        "cameraLensUsed",
+        "cameraUsed",
+        "cornerNote",
+        "cornerNoteUsed",
+        "currentFrameUsed",
+        "customFileFullPath",
+        "dateUsed",
+        "debug_DrawTextLines",
+        "edit3DFrame",
+        "edit3DFrameUsed",
+        "edit3DTotalNumber",
+        "edit3DTotalNumberUsed",
+        "extPaddingHorizNorm",
+        "extPaddingNorm",
+        "filenameUsed",
+        "filepathUsed",
+        "fontScaleHNorm",
+        "frameDigitsPadding",
+        "framerateUsed",
+        "handlesUsed",
+        "imagesCompressionLevel",
+        "interlineHNorm",
+        "logoPosNormX",
+        "logoPosNormY",
+        "logoScaleH",
+        "logoUsed",
+        "notesLine01",
+        "notesLine02",
+        "notesLine03",
+        "notesUsed",
+        "offsetToCenterHNorm",
+        "projectName",
+        "projectUsed",
+        "sceneUsed",
+        "sequenceName",
+        "sequenceUsed",
+        "shotDurationUsed",
+        "shotHandles",
+        "shotName",
+        "shotUsed",
+        "stampPropertyLabel",
+        "stampPropertyValue",
+        "takeName",
+        "takeUsed",
+        "textColor",
+        "timeUsed",
+        "userNameUsed",
+        "videoFirstFrameIndex",
+        "videoFirstFrameIndexUsed",
+        "videoFrameUsed",
     )
 
-    #   borderColorOpacity  = siSettings.borderColorOpacity                  #(0, 0, 0, 255)
-    #   borderColorRGBA = (int(borderColorRGB[0] * borderColorOpacity * 255), int(borderColorRGB[1] * borderColorOpacity * 255), int(borderColorRGB[2] * borderColorOpacity * 255), int(borderColorOpacity * 255) )
-    #   borderColorRGBA = (int(borderColorRGB[0] * 255), int(borderColorRGB[1] * 255), int(borderColorRGB[2] * 255), int(borderColorOpacity * 255) )
-    # print("borderColor: " + str(borderColor[0]))
-    #  borderColor         = (0, 0, 0, 255)
-
-    # innerAspectRatio    = siSettings.innerImageRatio              #16/9   # must be >= 1
-    # if 1.0 >= innerAspectRatio:
-    #     innerAspectRatio = 1.0
-    # innerH              = renderW * 1.0 / innerAspectRatio
-    textColorRGB = siSettings.textColor  # (0, 0, 0, 255)
-    #   textColorOpacity  = siSettings.textColorOpacity                  #(0, 0, 0, 255)
-    #  textColorRGBA = (int(textColorRGB[0] * textColorOpacity * 255), int(textColorRGB[1] * textColorOpacity * 255), int(textColorRGB[2] * textColorOpacity * 255), int(textColorOpacity * 255) )
-    textColorRGBA = (
-        int(textColorRGB[0] * 255),
-        int(textColorRGB[1] * 255),
-        int(textColorRGB[2] * 255),
-        int(textColorRGB[3] * 255),
-    )
+    def __init__(self, scene, renderW, renderH, innerH):
+        siSettings = scene.UAS_SM_StampInfo_Settings
+        for name in self._settingsNames:
+            value = getattr(siSettings, name)
+            # colors are converted from bpy arrays to tupples
+            if not isinstance(value, (bool, int, float, str)):
+                value = tuple(value)
+            setattr(self, name, value)
+
+        self.renderW = renderW
+        self.renderH = renderH
+        self.innerH = innerH
+
+        self.frameStart = scene.frame_start
+        self.frameEnd = scene.frame_end
+        self.fps = scene.render.fps
+        self.sceneName = scene.name
+        self.blenderFilepath = bpy.data.filepath
+
+        self.logoFile = ""
+        if siSettings.logoUsed:
+            if "BUILTIN" == siSettings.logoMode:
+                dir = siSettings.getBuiltInLogosPath()
+                self.logoFile = str(dir) + "\\" + str(siSettings.logoBuiltinName)
+            else:
+                self.logoFile = siSettings.logoFilepath
+            #  print("  Logo: siSettings.logoFilepath: " + siSettings.logoFilepath)
 
-    # textColorWhite = (235, 235, 235, 255)
+            # if path is relative then get the full path
+            if "//" == self.logoFile[0:2] and bpy.data.is_saved:
+                # print("Logo path is relative")
+                self.logoFile = bpy.path.abspath(self.logoFile)
 
-    # alertColorRGB = siSettings.textColor
-    alertColorRGB = (0.7, 0.2, 0.2, 255)
-    alertColorRGBA = (
-        int(alertColorRGB[0] * 255),
-        int(alertColorRGB[1] * 255),
-        int(alertColorRGB[2] * 255),
-        int(alertColorRGB[3] * 255),
-    )
 
-    # move the content (border + text) toward center
-    offsetToCenterH = int(siSettings.offsetToCenterHNorm * renderH)
-
-    imgInfo = Image.new("RGBA", (renderW, renderH), (0, 0, 0, 0))
-
-    def _debug_drawPadding(borderInd):
-        myCol = (200, 250, 0, 100)
-        if 0 == borderInd:  # top
-            imgBorderRect = Image.new("RGBA", (renderW - 2 * paddingLeft, borderTopH - 2 * paddingTopExt), myCol)
-            imgInfo.paste(imgBorderRect, (paddingLeft, paddingTopExt))
-        else:  # bottom
-            imgBorderRect = Image.new("RGBA", (renderW - 2 * paddingLeft, borderBottomH - 2 * paddingBottomExt), myCol)
-            imgInfo.paste(imgBorderRect, (paddingLeft, renderH - borderBottomH + paddingTopExt))
-        return
-
-    # -------------------------------- #
-    # stamp borders with PIL
-    # -------------------------------- #
-    if siSettings.borderUsed:
-        imgBorderRect = Image.new("RGBA", (renderW, borderTopH), borderColorRGBA)
-        imgInfo.paste(imgBorderRect, (0, offsetToCenterH))
-        imgBorderRect = Image.new("RGBA", (renderW, borderBottomH), borderColorRGBA)
-        imgInfo.paste(imgBorderRect, (0, renderH - borderBottomH - offsetToCenterH))
-
-    # -------------------------------- #
-    # Debug - Draw text lines
-    # -------------------------------- #
-    if siSettings.debug_DrawTextLines:
-        currentTextLeft = paddingLeft + paddingLeftMetadataTop
-        currentTextTop = offsetToCenterH + paddingTopExt
+class StampedImageLayout:
+    """Positions, fonts and static layer of the images stamped with a snapshot of the settings
+    The static layer contains everything that does not change from a frame to another. The image of a
+    frame is a copy of it on which the frame indices, the edit time and the camera are drawn.
+    Blender data is not accessed here so the layout can be created and used out of the main thread.
+    """
 
-        for borderInd in range(0, 2):
-            if 0 == borderInd:  # top
-                numLines = 6  # numLinesTop
-                currentTextLeft = paddingLeft + paddingLeftMetadataTop
-                currentTextTop = offsetToCenterH + paddingTopExt
-                directionSign = 1
-            else:  # bottom
-                numLines = 6  # numLinesBottom
-                currentTextLeft = paddingLeft + paddingLeftMetadataTop
-                currentTextTop = (
-                    renderH
-                    - paddingBottomExt
-                    # - numLines * textLineH
-                    - textLineH
-                    - offsetToCenterH
-                )
-                directionSign = -1
+    def __init__(self, settings):
+        # Notes
+        #   - Image origine is at TOP LEFT corner
+        #   - Everything is proportionnal to the HEIGHT of the output image
+        #
+        # Metadata from Blender:
+        #   top:    file, date, render time, host, note, memory         frame range
+        #   bottom: marker, timecode, frame, camera, lens               sequencer strip, strip metadata
+        # The support of the metadata from Blender has been removed (wkip: to rewrite in a smarter way)
+
+        from PIL import Image, ImageDraw
+
+        self.settings = settings
+        siSettings = settings
+        renderW = settings.renderW
+        renderH = settings.renderH
+        innerH = settings.innerH
+
+        paddingLeftMetadataTopNorm = 0.0
+        paddingLeftMetadataBottomNorm = 0.0
+
+        borderTopH = max(
+            int((renderH - innerH) * 0.5), 0
+        )  # border cannot be negative, which happens if render ratio < inner ratio
+        borderBottomH = borderTopH
+
+        # ---------- framing control settings ----------------
+        paddingTopExtNorm = siSettings.extPaddingNorm
+        # 0.03      # padding near the exterior of the image on the border rectangle
+        paddingTopIntNorm = 0.04  # not used here # padding near the interior of the image on the border rectangle
+        paddingLeftNorm = siSettings.extPaddingHorizNorm
+
+        textLineNorm = siSettings.fontScaleHNorm
+        textInterlineNorm = siSettings.interlineHNorm  # 0.01
+        numLinesTop = 3
+        numLinesBottom = numLinesTop
+
+        if siSettings.automaticTextSize:
+            borderTopNorm = min(0.5, borderTopH / renderH)
+            paddingTopExtNormInBorder = siSettings.extPaddingNorm * 10.0  # 0.2
+            paddingTopIntNormInBorder = 0.1
+            paddingTopExtNorm = paddingTopExtNormInBorder * borderTopNorm
+            paddingTopIntNorm = paddingTopIntNormInBorder * borderTopNorm
+
+            textInterlineNormInBorder = siSettings.interlineHNorm  # 0.04
+            textInterlineNorm = textInterlineNormInBorder * borderTopNorm
+
+            textBorderNorm = borderTopNorm - paddingTopExtNorm - paddingTopIntNorm
+            if textBorderNorm <= (numLinesTop - 1) * textInterlineNorm:
+                textBorderNorm = 0.0
+                textLineNorm = 0.0
+            else:
+                textLineNorm = min(textLineNorm, (textBorderNorm - (numLinesTop - 1) * textInterlineNorm) / 3.0)
+
+        # ---------- framing control settings ----------------
+
+        # All dimensions are normalized as if the image had the size 1.0 * 1.0
+        textLineH = int(renderH * textLineNorm)
+        textInterlineH = int(renderH * textInterlineNorm)
+
+        fontsize = int(1.0 * textLineNorm * renderH)
+        font = _getFont(fontsize)
+        fontHeight = (font.getsize("Text"))[1]
+        fontLargeFactor = 1.6
+        fontLarge = _getFont(int(fontsize * fontLargeFactor))
+        fontLargeHeight = (fontLarge.getsize("Text"))[1]
+
+        paddingLeft = int((paddingLeftNorm) * renderW)
+        paddingLeftMetadataTop = int((paddingLeftMetadataTopNorm) * renderW)
+        paddingLeftMetadataBottom = int((paddingLeftMetadataBottomNorm) * renderW)
+
+        paddingTopExt = int(paddingTopExtNorm * renderH)
+        paddingBottomExt = paddingTopExt
+
+        borderColorRGB = siSettings.borderColor  # (0, 0, 0, 255)
+        borderColorRGBA = (
+            int(borderColorRGB[0] * 255),
+            int(borderColorRGB[1] * 255),
+            int(borderColorRGB[2] * 255),
+            int(borderColorRGB[3] * 255),
+        )
+
+        textColorRGB = siSettings.textColor  # (0, 0, 0, 255)
+        textColorRGBA = (
+            int(textColorRGB[0] * 255),
+            int(textColorRGB[1] * 255),
+            int(textColorRGB[2] * 255),
+            int(textColorRGB[3] * 255),
+        )
+
+        # alertColorRGB = siSettings.textColor
+        alertColorRGB = (0.7, 0.2, 0.2, 255)
+        alertColorRGBA = (
+            int(alertColorRGB[0] * 255),
+            int(alertColorRGB[1] * 255),
+            int(alertColorRGB[2] * 255),
+            int(alertColorRGB[3] * 255),
+        )
 
-            _debug_drawPadding(borderInd)
+        # move the content (border + text) toward center
+        offsetToCenterH = int(siSettings.offsetToCenterHNorm * renderH)
 
-            for lineInd in range(0, numLines):
-                # first line top
-                myCol = (255, 20, 0, 200)
-                imgBorderRect = Image.new("RGBA", (80, textLineH), myCol)
-                imgInfo.paste(imgBorderRect, (currentTextLeft + lineInd * 20, currentTextTop))
+        imgInfo = Image.new("RGBA", (renderW, renderH), (0, 0, 0, 0))
 
-                # first interline top
-                myCol = (20, 250, 0, 100)
-                imgBorderRect = Image.new("RGBA", (int(1.0 * renderW), textInterlineH), myCol)
+        def _debug_drawPadding(borderInd):
+            myCol = (200, 250, 0, 100)
+            if 0 == borderInd:  # top
+                imgBorderRect = Image.new("RGBA", (renderW - 2 * paddingLeft, borderTopH - 2 * paddingTopExt), myCol)
+                imgInfo.paste(imgBorderRect, (paddingLeft, paddingTopExt))
+            else:  # bottom
+                imgBorderRect = Image.new(
+                    "RGBA", (renderW - 2 * paddingLeft, borderBottomH - 2 * paddingBottomExt), myCol
+                )
+                imgInfo.paste(imgBorderRect, (paddingLeft, renderH - borderBottomH + paddingTopExt))
+            return
+
+        # -------------------------------- #
+        # stamp borders with PIL
+        # -------------------------------- #
+        if siSettings.borderUsed:
+            imgBorderRect = Image.new("RGBA", (renderW, borderTopH), borderColorRGBA)
+            imgInfo.paste(imgBorderRect, (0, offsetToCenterH))
+            imgBorderRect = Image.new("RGBA", (renderW, borderBottomH), borderColorRGBA)
+            imgInfo.paste(imgBorderRect, (0, renderH - borderBottomH - offsetToCenterH))
+
+        # -------------------------------- #
+        # Debug - Draw text lines
+        # -------------------------------- #
+        if siSettings.debug_DrawTextLines:
+            currentTextLeft = paddingLeft + paddingLeftMetadataTop
+            currentTextTop = offsetToCenterH + paddingTopExt
+
+            for borderInd in range(0, 2):
                 if 0 == borderInd:  # top
-                    imgInfo.paste(
-                        imgBorderRect, (currentTextLeft + lineInd * 20, currentTextTop + directionSign * textLineH)
-                    )
+                    numLines = 6  # numLinesTop
+                    currentTextLeft = paddingLeft + paddingLeftMetadataTop
+                    currentTextTop = offsetToCenterH + paddingTopExt
+                    directionSign = 1
                 else:  # bottom
-                    imgInfo.paste(
-                        imgBorderRect, (currentTextLeft + lineInd * 20, currentTextTop + directionSign * textInterlineH)
+                    numLines = 6  # numLinesBottom
+                    currentTextLeft = paddingLeft + paddingLeftMetadataTop
+                    currentTextTop = (
+                        renderH
+                        - paddingBottomExt
+                        # - numLines * textLineH
+                        - textLineH
+                        - offsetToCenterH
                     )
+                    directionSign = -1
+
+                _debug_drawPadding(borderInd)
+
+                for lineInd in range(0, numLines):
+                    # first line top
+                    myCol = (255, 20, 0, 200)
+                    imgBorderRect = Image.new("RGBA", (80, textLineH), myCol)
+                    imgInfo.paste(imgBorderRect, (currentTextLeft + lineInd * 20, currentTextTop))
+
+                    # first interline top
+                    myCol = (20, 250, 0, 100)
+                    imgBorderRect = Image.new("RGBA", (int(1.0 * renderW), textInterlineH), myCol)
+                    if 0 == borderInd:  # top
+                        imgInfo.paste(
+                            imgBorderRect, (currentTextLeft + lineInd * 20, currentTextTop + directionSign * textLineH)
+                        )
+                    else:  # bottom
+                        imgInfo.paste(
+                            imgBorderRect,
+                            (currentTextLeft + lineInd * 20, currentTextTop + directionSign * textInterlineH),
+                        )
+
+                    currentTextTop += directionSign * (textLineH + textInterlineH)
+
+        # -------------------------------- #
+        # stamp logo
+        # if the logo is not found a red fake logo is stamped instead
+        # -------------------------------- #
+
+        if siSettings.logoUsed:
+            logoFile = siSettings.logoFile
+            logoFilePathIsValid = False
+
+            if os.path.exists(logoFile):
+                logoFilePathIsValid = True
+            else:
+                _logger.error_ext(f"Logo path is NOT valid: {logoFile}")
+                # wkip mettre alert rouge
 
-                currentTextTop += directionSign * (textLineH + textInterlineH)
+            logoScaleH = siSettings.logoScaleH
+            logoPositionNorm = [
+                renderW * siSettings.logoPosNormX,
+                renderH * siSettings.logoPosNormY,
+            ]  # normalized in range [0,1]
+
+            imgLogoSource = None
+            if logoFilePathIsValid:
+                imgLogoSource = Image.open(logoFile).convert("RGBA")
+                if imgLogoSource is None:
+                    _logger.warning_ext(f"******* Cannot open specified logo !!! *** File: {logoFile} *********")
+                    logoFilePathIsValid = False
+            else:
+                imgLogoSource = Image.new("RGBA", (150, 150), "red")
 
-    # -------------------------------- #
-    # stamp logo
-    # if the logo is not found a red fake logo is stamped instead
-    # -------------------------------- #
+            logoScaleW = logoScaleH * imgLogoSource.size[0] * 1.0 / imgLogoSource.size[1]
+            newLogoSize = (int(logoScaleW * renderH), int(logoScaleH * renderH))  # preserve logo size on height
+            imgLogoSource = imgLogoSource.resize(newLogoSize, Image.ANTIALIAS)  # size in pixels # resamplming mode
 
-    if siSettings.logoUsed:
+            # put logo on image in position (0, 0)
+            imgInfo.paste(
+                imgLogoSource, (int(logoPositionNorm[0]), int(logoPositionNorm[1])), mask=imgLogoSource
+            )  # left align
 
-        logoFile = ""
+        # put text on image
+        img_draw = ImageDraw.Draw(imgInfo)
 
-        if "BUILTIN" == siSettings.logoMode:
-            dir = siSettings.getBuiltInLogosPath()
-            logoFile = str(dir) + "\\" + str(siSettings.logoBuiltinName)
-        else:
-            logoFile = siSettings.logoFilepath
-        #  print("  Logo: siSettings.logoFilepath: " + siSettings.logoFilepath)
+        stampLabel = siSettings.stampPropertyLabel
+        stampValue = siSettings.stampPropertyValue
+        textProp = ""
 
-        filename, extension = os.path.splitext(logoFile)
-        # print('Selected file:', self.filepath)
-        # print('File name:', filename)
-        # print('File extension:', extension)
+        # ---------------------------------
+        # top border
+        # ---------------------------------
 
-        logoFilePathIsValid = False
+        col01 = paddingLeft
+        col01 = col01 + paddingLeftMetadataTop
+        col02 = 0.1 * renderW
+        col028 = 0.69 * renderW
+        col035 = 0.84 * renderW
+        # col03 = 0.75 * renderW
+        col04 = 0.8 * renderW
 
-        # if path is relative then get the full path
-        if "//" == logoFile[0:2] and bpy.data.is_saved:
-            # print("Logo path is relative")
-            logoFile = bpy.path.abspath(logoFile)
+        currentTextTop = offsetToCenterH + paddingTopExt
 
-        if os.path.exists(logoFile):
-            logoFilePathIsValid = True
-        else:
-            if siSettings.logoUsed:
-                _logger.error_ext(f"Logo path is NOT valid: {logoFile}")
-                # wkip mettre alert rouge
+        # ---------- project -------------
+        if siSettings.projectUsed:
+            textProp = "Project: " if stampLabel and not stampValue else ""
+            textProp += siSettings.projectName if stampValue else ""
+            img_draw.text((col02, currentTextTop), textProp, font=fontLarge, fill=textColorRGBA)
+
+        # ---------------------
+        # Code for date and time aligned from bottom:
+        # ---------------------
+        currentTextTop = borderTopH - paddingTopExt - fontHeight
+
+        # ---------- user -------------
+        if siSettings.userNameUsed:
+            textProp = "By: "  # if stampLabel else ""
+            textProp += getpass.getuser() if stampValue else ""
+
+            img_draw.text((col01, currentTextTop), textProp, font=font, fill=textColorRGBA)
+
+        # ---------- date -------------
+        # drawn with the time at which each image is drawn
+        currentTextTop -= textLineH + textInterlineH
+        dateTimePosition = (col01, currentTextTop)
+
+        # ---------- image sequence indices in video ref system -------------
+        # drawn with the values of the frame
+        currentTextTopForVideoFrames = offsetToCenterH + paddingTopExt + textLineH + textInterlineH
+        currentTextLeftForVideoFrames = renderW * (1.0 - paddingLeftNorm)
+
+        # ------------ corner note ---------------
+        currentTextTop = offsetToCenterH + paddingTopExt / 2.0
+        currentTextRight = renderW * (1.0 - paddingLeftNorm)
+
+        if siSettings.cornerNoteUsed:
+            # textProp = "Corner Note: " if stampLabel else ""
+            textProp = siSettings.cornerNote if stampValue else ""
+            img_draw.text(
+                (currentTextRight - (font.getsize(textProp))[0], currentTextTop),
+                textProp,
+                font=font,
+                fill=alertColorRGBA,
+            )
 
-        # logoScaleW = 0.09                                         # logo size is in % of width relatively to the outpur render size. In other words: 1.0 => logo width = renderW
-        # logoScaleH = 0.08                                         # logo size is in % of height relatively to the outpur render size. In other words: 1.0 => logo height = renderH
-        logoScaleH = siSettings.logoScaleH
-        logoPositionNorm = [
-            renderW * siSettings.logoPosNormX,
-            renderH * siSettings.logoPosNormY,
-        ]  # normalized in range [0,1]
-
-        imgLogoSource = None
-        if logoFilePathIsValid:
-            imgLogoSource = Image.open(logoFile).convert("RGBA")
-            if imgLogoSource is None:
-                _logger.warning_ext(f"******* Cannot open specified logo !!! *** File: {logoFile} *********")
-                logoFilePathIsValid = False
-        else:
-            imgLogoSource = Image.new("RGBA", (150, 150), "red")
+        # ---------- fps and 3D edit -------------
+        currentTextTop = currentTextTopForVideoFrames + textLineH + textInterlineH
 
-        #   logoScaleH = logoScaleW * imgLogoSource.size[1] * 1.0 / imgLogoSource.size[0]
-        #   newLogoSize = (int(logoScaleW * renderW), int(logoScaleH * renderW)                                         # preserve logo size on widht
-        logoScaleW = logoScaleH * imgLogoSource.size[0] * 1.0 / imgLogoSource.size[1]
-        newLogoSize = (int(logoScaleW * renderH), int(logoScaleH * renderH))  # preserve logo size on height
+        if siSettings.framerateUsed:
+            textProp = "Framerate: " if stampLabel else ""
+            textProp += str(siSettings.fps) + " fps" if stampValue else ""
+            img_draw.text(
+                (currentTextLeftForVideoFrames - (font.getsize(textProp))[0], currentTextTop),
+                textProp,
+                font=font,
+                fill=textColorRGBA,
+            )
 
-        #  newLogoSize = (int(logoScale * imgLogoSource.size[0]), int(logoScale * imgLogoSource.size[1]))             # to get a precise logo size when output res in pixels is known
-        imgLogoSource = imgLogoSource.resize(newLogoSize, Image.ANTIALIAS)  # size in pixels # resamplming mode
+        # the index in the 3D edit is drawn with the values of the frame
+        edit3DFramePosition = (col035, currentTextTop)
 
-        # put logo on image in position (0, 0)
-        imgInfo.paste(
-            imgLogoSource, (int(logoPositionNorm[0]), int(logoPositionNorm[1])), mask=imgLogoSource
-        )  # left align
-    # imgInfo.paste(imgLogoSource, (renderW - newLogoSize[0] - paddingRight, paddingRight), mask = imgLogoSource)      # right align
+        # ---------- video duration -------------
+        if siSettings.animDurationUsed:
+            textProp = "Duration: "
+            textProp += str(siSettings.frameEnd - siSettings.frameStart + 1) + " fr." if stampValue else ""
+            img_draw.text((col028, currentTextTop), textProp, font=font, fill=textColorRGBA)
 
-    # put text on image
-    img_draw = ImageDraw.Draw(imgInfo)
+        # ---------- notes -------------
+        currentTextTop = offsetToCenterH + paddingTopExt
 
-    stampLabel = siSettings.stampPropertyLabel
-    stampValue = siSettings.stampPropertyValue
-    textProp = ""
+        if siSettings.notesUsed:
+            # colNotes = col02
 
-    # ---------------------------------
-    # top border
-    # ---------------------------------
-
-    col01 = paddingLeft
-    col01 = col01 + paddingLeftMetadataTop
-    col02 = 0.1 * renderW
-    col028 = 0.69 * renderW
-    col035 = 0.84 * renderW
-
-    # col03 = 0.75 * renderW
-    col04 = 0.8 * renderW
-
-    currentTextTop = offsetToCenterH + paddingTopExt
-
-    # ---------- project -------------
-    if siSettings.projectUsed:
-        textProp = "Project: " if stampLabel and not stampValue else ""
-        textProp += siSettings.projectName if stampValue else ""
-        img_draw.text((col02, currentTextTop), textProp, font=fontLarge, fill=textColorRGBA)
-
-    # ---------------------
-    # Code for date and time aligned from bottom:
-    # ---------------------
-    currentTextTop = borderTopH - paddingTopExt - fontHeight
-
-    # ---------- user -------------
-    if siSettings.userNameUsed:
-        textProp = "By: "  # if stampLabel else ""
-        textProp += getpass.getuser() if stampValue else ""
-
-        img_draw.text((col01, currentTextTop), textProp, font=font, fill=textColorRGBA)
-
-    # ---------- date -------------
-
-    # wkip use pytz to get the right time zone
-    currentTextTop -= textLineH + textInterlineH
-
-    now = datetime.now()
-    timeStr = now.strftime("%H:%M:%S")
-    if siSettings.dateUsed:
-        textProp = "Date: " if stampLabel else ""
-        textProp += now.strftime("%b-%d-%Y") if stampValue else ""  # Month abbreviation, day and year
-        if siSettings.timeUsed:
-            textProp += "  " + timeStr if stampValue else ""
-    elif siSettings.timeUsed:
-        textProp = "Time: " if stampLabel else ""
-        textProp += "  " + timeStr if stampValue else ""
-
-    if siSettings.dateUsed or siSettings.timeUsed:
-        img_draw.text((col01, currentTextTop), textProp, font=font, fill=textColorRGBA)
-
-    # ---------------------
-    # Code for date and time aligned from top:
-    # ---------------------
-    # currentTextTop += 2 * (textLineH + textInterlineH)
-
-    # ---------- date -------------
-
-    # wkip use pytz to get the right time zone
-
-    # now = datetime.now()
-    # timeStr = now.strftime("%H:%M:%S")
-    # if siSettings.dateUsed:
-    #     textProp = "Date: " if stampLabel else ""
-    #     textProp += now.strftime("%b-%d-%Y") if stampValue else ""  # Month abbreviation, day and year
-    #     if siSettings.timeUsed:
-    #         textProp += "  " + timeStr if stampValue else ""
-    # elif siSettings.timeUsed:
-    #     textProp = "Time: " if stampLabel else ""
-    #     textProp += "  " + timeStr if stampValue else ""
-
-    # if siSettings.dateUsed or siSettings.timeUsed:
-    #     img_draw.text((col01, currentTextTop), textProp, font=font, fill=textColorRGBA)
-
-    # ---------- user -------------
-    # currentTextTop += textLineH + textInterlineH
-    # if True or siSettings.userNameUsed:
-    #     textProp = "By: "  # if stampLabel else ""
-    #     textProp += getpass.getuser() if stampValue else ""
-    #     img_draw.text((col01, currentTextTop), textProp, font=font, fill=textColorRGBA)
-
-    # ---------- image sequence indices in video ref system -------------
-    # currentTextTop += textLineH + textInterlineH
-
-    currentTextTopForVideoFrames = offsetToCenterH + paddingTopExt + textLineH + textInterlineH
-    currentTextLeftForVideoFrames = renderW * (1.0 - paddingLeftNorm)
-
-    if siSettings.videoFrameUsed:
-        # textProp = "Video: " if stampLabel else ""
-        textProp = "Video Frame: "
-
-        if siSettings.videoFirstFrameIndexUsed:
-            currentImage = scene.frame_current - scene.frame_start + siSettings.videoFirstFrameIndex
-            firstFrameInd = siSettings.videoFirstFrameIndex
-            lastFrameInd = scene.frame_end - scene.frame_start + siSettings.videoFirstFrameIndex
-        else:
-            currentImage = scene.frame_current - scene.frame_start
-            firstFrameInd = 0
-            lastFrameInd = scene.frame_end - scene.frame_start
-
-        # _logger.debug_ext(
-        #     f"drawRangesAndFrame: currentImage: {currentImage}, firstFrameInd: {firstFrameInd}, lastFrameInd: {lastFrameInd}"
-        # )
-        drawRangesAndFrame(
-            scene,
-            img_draw,
-            "VIDEOFRAME",
-            currentImage,
-            firstFrameInd,
-            lastFrameInd,
-            siSettings.shotHandles,
-            siSettings.currentFrameUsed,
-            siSettings.animRangeUsed,
-            siSettings.handlesUsed,
-            currentTextLeftForVideoFrames,
-            currentTextTopForVideoFrames,
-            font,
-            fontLarge,
-            textColorRGBA,
-            siSettings.frameDigitsPadding,
-        )
+            currentBoxTop = currentTextTop - 0.005 * renderH
+            currentBoxBottom = currentTextTop + 4 * (textLineH + textInterlineH) + 0.005 * renderH
 
-    # ------------ corner note ---------------
-    currentTextTop = offsetToCenterH + paddingTopExt / 2.0
-    currentTextRight = renderW * (1.0 - paddingLeftNorm)
-
-    if siSettings.cornerNoteUsed:
-        # textProp = "Corner Note: " if stampLabel else ""
-        textProp = siSettings.cornerNote if stampValue else ""
-        img_draw.text(
-            (currentTextRight - (font.getsize(textProp))[0], currentTextTop),
-            textProp,
-            font=font,
-            fill=alertColorRGBA,
-        )
+            colBoxLeft = 0.26 * renderW
+            colBoxRight = colBoxLeft + 0.43 * renderW
+            colNotesLabel = colBoxLeft + 0.01 * renderW
+            colNotes = colBoxLeft + 0.02 * renderW
 
-    # ---------- fps and 3D edit -------------
-    currentTextTop = currentTextTopForVideoFrames + textLineH + textInterlineH
-
-    if siSettings.framerateUsed:
-        textProp = "Framerate: " if stampLabel else ""
-        textProp += str(scene.render.fps) + " fps" if stampValue else ""
-        img_draw.text(
-            (currentTextLeftForVideoFrames - (font.getsize(textProp))[0], currentTextTop),
-            textProp,
-            font=font,
-            fill=textColorRGBA,
-        )
+            boxLineThickness = max(1, int(0.002 * renderH))
+            textColorGray = (50, 50, 50, 255)
 
-    if siSettings.edit3DFrameUsed:
-        textProp = "Index in 3D Edit: " if stampLabel else ""
-        #  textProp += '{:03d}'.format(scene.render.fps) + " fps" if stampValue else ""
-        currentImage = siSettings.edit3DFrame
-        totalImages = siSettings.edit3DTotalNumber
-        textProp += str(int(currentImage)) if stampValue else ""
-        if siSettings.edit3DTotalNumberUsed:
-            textProp += " / " + str(int(totalImages)) + " fr." if stampValue else ""
-        img_draw.text((col035, currentTextTop), textProp, font=font, fill=textColorRGBA)
-
-    # ---------- video duration -------------
-    # currentTextTop += textLineH + textInterlineH
-    if siSettings.animDurationUsed:
-        textProp = "Duration: "
-        textProp += str(scene.frame_end - scene.frame_start + 1) + " fr." if stampValue else ""
-        img_draw.text((col028, currentTextTop), textProp, font=font, fill=textColorRGBA)
-
-    # currentTextTop += textLineH + textInterlineH
-
-    # ---------- notes -------------
-    currentTextTop = offsetToCenterH + paddingTopExt
-
-    if siSettings.notesUsed:
-        # colNotes = col02
-
-        currentBoxTop = currentTextTop - 0.005 * renderH
-        currentBoxBottom = currentTextTop + 4 * (textLineH + textInterlineH) + 0.005 * renderH
-
-        colBoxLeft = 0.26 * renderW
-        colBoxRight = colBoxLeft + 0.43 * renderW
-        colNotesLabel = colBoxLeft + 0.01 * renderW
-        colNotes = colBoxLeft + 0.02 * renderW
-
-        boxLineThickness = max(1, int(0.002 * renderH))
-        textColorGray = (50, 50, 50, 255)
-
-        textProp = "Notes: " if stampLabel else ""
-        img_draw.text((colNotesLabel, currentTextTop), textProp, font=font, fill=textColorRGBA)
-
-        currentTextTop += textLineH + textInterlineH
-        textProp = siSettings.notesLine01 if stampValue else ("Notes Line 1" if stampLabel else "")
-        img_draw.text((colNotes, currentTextTop), textProp, font=font, fill=textColorRGBA)
-
-        currentTextTop += textLineH + textInterlineH
-        textProp = siSettings.notesLine02 if stampValue else ("Notes Line 2" if stampLabel else "")
-        img_draw.text((colNotes, currentTextTop), textProp, font=font, fill=textColorRGBA)
-
-        currentTextTop += textLineH + textInterlineH
-        textProp = siSettings.notesLine03 if stampValue else ("Notes Line 3" if stampLabel else "")
-        img_draw.text((colNotes, currentTextTop), textProp, font=font, fill=textColorRGBA)
-
-        # draw box
-        img_draw.line(
-            [(colBoxLeft, currentBoxTop), (colBoxRight, currentBoxTop)],
-            fill=textColorGray,
-            width=boxLineThickness,
-        )
-        img_draw.line(
-            [(colBoxLeft, currentBoxBottom), (colBoxRight, currentBoxBottom)],
-            fill=textColorGray,
-            width=boxLineThickness,
-        )
-        img_draw.line(
-            [(colBoxLeft, currentBoxTop), (colBoxLeft, currentBoxBottom)],
-            fill=textColorGray,
-            width=boxLineThickness,
-        )
-        img_draw.line(
-            [(colBoxRight, currentBoxTop), (colBoxRight, currentBoxBottom)],
-            fill=textColorGray,
-            width=boxLineThickness,
-        )
+            textProp = "Notes: " if stampLabel else ""
+            img_draw.text((colNotesLabel, currentTextTop), textProp, font=font, fill=textColorRGBA)
 
-    # ---------------------------------
-    # bottom border
-    # ---------------------------------
-
-    col01 = paddingLeft
-    col02 = 0.19 * renderW
-    # col03 = 0.34 * renderW
-    col04 = 0.7 * renderW
-    # col05 = 0.7 * renderW
-    lineTextXEnd = col01
-    separatorX = 0.015 * renderW
-    currentTextTop = (
-        renderH
-        - paddingBottomExt
-        - numLinesBottom * textLineH
-        - (numLinesBottom - 1) * textInterlineH
-        - offsetToCenterH
-    )
-    currentTextTopFor3DFrames = currentTextTop
-    col01 = col01 + paddingLeftMetadataBottom
-    currentTextFromBottom = renderH - paddingBottomExt - textLineH + textInterlineH
-
-    # ---------- shot -------------
-    stampLabel3D = stampLabel or stampValue
-
-    yPos = currentTextTop + -1.0 * fontLargeHeight + 1.0 * textInterlineH
-    if siSettings.shotUsed:
-        # textProp = "Shot: " if stampLabel3D else ""
-        textProp = siSettings.shotName if stampValue else ""
-        img_draw.text((col01, yPos), textProp, font=fontLarge, fill=textColorRGBA)  # textColorRGBA
-        lineTextXEnd += (fontLarge.getsize(textProp))[0] + separatorX
-
-    # ---------- shot duration -------------
-    # currentTextTop += fontHeight * (1.2 / fontLargeFactor)
-    if siSettings.shotDurationUsed:
-        # textProp = "Shot Duration: "
-        textProp = (
-            str(scene.frame_end - scene.frame_start + 1 - 2 * siSettings.shotHandles) + " fr." if stampValue else ""
+            currentTextTop += textLineH + textInterlineH
+            textProp = siSettings.notesLine01 if stampValue else ("Notes Line 1" if stampLabel else "")
+            img_draw.text((colNotes, currentTextTop), textProp, font=font, fill=textColorRGBA)
+
+            currentTextTop += textLineH + textInterlineH
+            textProp = siSettings.notesLine02 if stampValue else ("Notes Line 2" if stampLabel else "")
+            img_draw.text((colNotes, currentTextTop), textProp, font=font, fill=textColorRGBA)
+
+            currentTextTop += textLineH + textInterlineH
+            textProp = siSettings.notesLine03 if stampValue else ("Notes Line 3" if stampLabel else "")
+            img_draw.text((colNotes, currentTextTop), textProp, font=font, fill=textColorRGBA)
+
+            # draw box
+            img_draw.line(
+                [(colBoxLeft, currentBoxTop), (colBoxRight, currentBoxTop)],
+                fill=textColorGray,
+                width=boxLineThickness,
+            )
+            img_draw.line(
+                [(colBoxLeft, currentBoxBottom), (colBoxRight, currentBoxBottom)],
+                fill=textColorGray,
+                width=boxLineThickness,
+            )
+            img_draw.line(
+                [(colBoxLeft, currentBoxTop), (colBoxLeft, currentBoxBottom)],
+                fill=textColorGray,
+                width=boxLineThickness,
+            )
+            img_draw.line(
+                [(colBoxRight, currentBoxTop), (colBoxRight, currentBoxBottom)],
+                fill=textColorGray,
+                width=boxLineThickness,
+            )
+
+        # ---------------------------------
+        # bottom border
+        # ---------------------------------
+
+        col01 = paddingLeft
+        col02 = 0.19 * renderW
+        # col03 = 0.34 * renderW
+        col04 = 0.7 * renderW
+        # col05 = 0.7 * renderW
+        lineTextXEnd = col01
+        separatorX = 0.015 * renderW
+        currentTextTop = (
+            renderH
+            - paddingBottomExt
+            - numLinesBottom * textLineH
+            - (numLinesBottom - 1) * textInterlineH
+            - offsetToCenterH
         )
-        img_draw.text((lineTextXEnd, yPos), textProp, font=font, fill=textColorRGBA)
-        lineTextXEnd += (font.getsize(textProp))[0] + separatorX
-
-    # ---------- sequence -------------
-    if siSettings.sequenceUsed:
-        textProp = "Seq: " if stampLabel3D else ""
-        textProp += siSettings.sequenceName if stampValue else ""
-        yPos = currentTextTop + -1.0 * fontHeight + 1.0 * textInterlineH
-        img_draw.text((lineTextXEnd, yPos), textProp, font=font, fill=textColorRGBA)
-        lineTextXEnd += (font.getsize(textProp))[0] + separatorX
-
-    # ---------- take -------------
-    if siSettings.takeUsed:
-        textProp = "Take: " if stampLabel3D else ""
-        textProp += siSettings.takeName if stampValue else ""
-        yPos = currentTextTop + -1.0 * fontHeight + 1.0 * textInterlineH
-        img_draw.text((lineTextXEnd, yPos), textProp, font=font, fill=textColorRGBA)
-        lineTextXEnd += (font.getsize(textProp))[0] + separatorX
-
-    # ---------- 3d frames and range -------------
-    # currentTextTopFor3DFrames += textLineH + textInterlineH
-
-    if siSettings.currentFrameUsed:
+        currentTextTopFor3DFrames = currentTextTop
+        col01 = col01 + paddingLeftMetadataBottom
+        currentTextFromBottom = renderH - paddingBottomExt - textLineH + textInterlineH
+
+        # ---------- shot -------------
+        stampLabel3D = stampLabel or stampValue
+
+        yPos = currentTextTop + -1.0 * fontLargeHeight + 1.0 * textInterlineH
+        if siSettings.shotUsed:
+            # textProp = "Shot: " if stampLabel3D else ""
+            textProp = siSettings.shotName if stampValue else ""
+            img_draw.text((col01, yPos), textProp, font=fontLarge, fill=textColorRGBA)  # textColorRGBA
+            lineTextXEnd += (fontLarge.getsize(textProp))[0] + separatorX
+
+        # ---------- shot duration -------------
+        if siSettings.shotDurationUsed:
+            # textProp = "Shot Duration: "
+            textProp = (
+                str(siSettings.frameEnd - siSettings.frameStart + 1 - 2 * siSettings.shotHandles) + " fr."
+                if stampValue
+                else ""
+            )
+            img_draw.text((lineTextXEnd, yPos), textProp, font=font, fill=textColorRGBA)
+            lineTextXEnd += (font.getsize(textProp))[0] + separatorX
+
+        # ---------- sequence -------------
+        if siSettings.sequenceUsed:
+            textProp = "Seq: " if stampLabel3D else ""
+            textProp += siSettings.sequenceName if stampValue else ""
+            yPos = currentTextTop + -1.0 * fontHeight + 1.0 * textInterlineH
+            img_draw.text((lineTextXEnd, yPos), textProp, font=font, fill=textColorRGBA)
+            lineTextXEnd += (font.getsize(textProp))[0] + separatorX
+
+        # ---------- take -------------
+        if siSettings.takeUsed:
+            textProp = "Take: " if stampLabel3D else ""
+            textProp += siSettings.takeName if stampValue else ""
+            yPos = currentTextTop + -1.0 * fontHeight + 1.0 * textInterlineH
+            img_draw.text((lineTextXEnd, yPos), textProp, font=font, fill=textColorRGBA)
+            lineTextXEnd += (font.getsize(textProp))[0] + separatorX
+
+        # ---------- 3d frames and range -------------
+        # drawn with the values of the frame
         currentTextTopFor3DFrames = currentTextTop  # - fontHeight
         currentTextLeftFor3DFrames = renderW * (1.0 - paddingLeftNorm)
-        drawRangesAndFrame(
-            scene,
-            img_draw,
-            "3DFRAME",
-            currentFrame,
-            scene.frame_start,
-            scene.frame_end,
-            siSettings.shotHandles,
-            siSettings.currentFrameUsed,
-            siSettings.animRangeUsed,
-            siSettings.handlesUsed,
-            currentTextLeftFor3DFrames,
-            currentTextTopFor3DFrames,
-            font,
-            fontLarge,
-            textColorRGBA,
-            siSettings.frameDigitsPadding,
-        )
 
-    currentTextTop += textLineH + 2.0 * textInterlineH
-
-    lineTextXEnd = col01
-    # ---------- scene -------------
-    if siSettings.sceneUsed:
-        textProp = "Scene: " if stampLabel3D else ""
-        textProp += str(scene.name) if stampValue else ""
-        # yPos = currentTextTop
-        yPos = currentTextFromBottom - textInterlineH - textLineH
-        img_draw.text((lineTextXEnd, yPos), textProp, font=font, fill=textColorRGBA)
-        lineTextXEnd += (font.getsize(textProp))[0] + separatorX
-
-    # ---------- bottom note -------------
-    if siSettings.bottomNoteUsed:
-        # textProp = "Scene: " if stampLabel3D else ""
-        # yPos = currentTextTop
-        yPos = currentTextFromBottom - textInterlineH - textLineH
-        textProp = siSettings.bottomNote if stampValue else ""
-        img_draw.text((lineTextXEnd, yPos), textProp, font=font, fill=textColorRGBA)
-
-    # ---------- camera -------------
-    currentTextRight = renderW * (1.0 - paddingLeftNorm)
-
-    if siSettings.cameraLensUsed:
+        currentTextTop += textLineH + 2.0 * textInterlineH
+
+        lineTextXEnd = col01
+        # ---------- scene -------------
+        if siSettings.sceneUsed:
+            textProp = "Scene: " if stampLabel3D else ""
+            textProp += str(siSettings.sceneName) if stampValue else ""
+            # yPos = currentTextTop
+            yPos = currentTextFromBottom - textInterlineH - textLineH
+            img_draw.text((lineTextXEnd, yPos), textProp, font=font, fill=textColorRGBA)
+            lineTextXEnd += (font.getsize(textProp))[0] + separatorX
+
+        # ---------- bottom note -------------
+        if siSettings.bottomNoteUsed:
+            # textProp = "Scene: " if stampLabel3D else ""
+            # yPos = currentTextTop
+            yPos = currentTextFromBottom - textInterlineH - textLineH
+            textProp = siSettings.bottomNote if stampValue else ""
+            img_draw.text((lineTextXEnd, yPos), textProp, font=font, fill=textColorRGBA)
+
+        # ---------- camera -------------
+        # drawn with the values of the frame
+        cameraPosition = (renderW * (1.0 - paddingLeftNorm), currentTextTop)
+        cameraNamePosition = (col04, currentTextTop)
+
+        # ---------- file -------------
+        if siSettings.filenameUsed or siSettings.filepathUsed:
+            textProp = "Blender file: " if stampLabel else ""
+            if stampValue:
+                filenameStr = ""
+                if "" != siSettings.customFileFullPath:
+                    filenameStr = siSettings.customFileFullPath
+                    if "" == filenameStr:
+                        textProp += "*** Custom File not specified ***"
+                else:
+                    filenameStr = siSettings.blenderFilepath
+                    if "" == filenameStr:
+                        textProp += "*** File not saved ***"
+                if "" != filenameStr:
+                    # head, tail = ntpath.split(filenameStr)
+                    if siSettings.filepathUsed:
+                        textProp += str(Path(filenameStr).parent) + "\\"
+                    if siSettings.filenameUsed:
+                        textProp += Path(filenameStr).name
+            img_draw.text((col01, currentTextFromBottom), textProp, font=font, fill=textColorRGBA)
+
+        self.staticLayer = imgInfo
+
+        self._font = font
+        self._fontLarge = fontLarge
+        self._textColorRGBA = textColorRGBA
+        self._dateTimePosition = dateTimePosition
+        self._videoFramesPosition = (currentTextLeftForVideoFrames, currentTextTopForVideoFrames)
+        self._edit3DFramePosition = edit3DFramePosition
+        self._3DFramesPosition = (currentTextLeftFor3DFrames, currentTextTopFor3DFrames)
+        self._cameraPosition = cameraPosition
+        self._cameraNamePosition = cameraNamePosition
+
+    def drawImage(self, currentFrame, edit3DFrame=None, cameraName=None, cameraLens=None):
+        """Return a new image made of the static layer and of the values of the specified frame
+        Args:
+            edit3DFrame: index of the frame in the 3D edit, the one of the settings if None
+        """
+        from PIL import ImageDraw
+
+        siSettings = self.settings
+        if edit3DFrame is None:
+            edit3DFrame = siSettings.edit3DFrame
+
+        font = self._font
+        fontLarge = self._fontLarge
+        textColorRGBA = self._textColorRGBA
+        stampLabel = siSettings.stampPropertyLabel
+        stampValue = siSettings.stampPropertyValue
+        stampLabel3D = stampLabel or stampValue
+
+        imgInfo = self.staticLayer.copy()
+        img_draw = ImageDraw.Draw(imgInfo)
+
+        # ---------- date -------------
+        # wkip use pytz to get the right time zone
+        if siSettings.dateUsed or siSettings.timeUsed:
+            now = datetime.now()
+            timeStr = now.strftime("%H:%M:%S")
+            if siSettings.dateUsed:
+                textProp = "Date: " if stampLabel else ""
+                textProp += now.strftime("%b-%d-%Y") if stampValue else ""  # Month abbreviation, day and year
+                if siSettings.timeUsed:
+                    textProp += "  " + timeStr if stampValue else ""
+            else:
+                textProp = "Time: " if stampLabel else ""
+                textProp += "  " + timeStr if stampValue else ""
+            img_draw.text(self._dateTimePosition, textProp, font=font, fill=textColorRGBA)
+
+        # ---------- image sequence indices in video ref system -------------
+        if siSettings.videoFrameUsed:
+            if siSettings.videoFirstFrameIndexUsed:
+                currentImage = currentFrame - siSettings.frameStart + siSettings.videoFirstFrameIndex
+                firstFrameInd = siSettings.videoFirstFrameIndex
+                lastFrameInd = siSettings.frameEnd - siSettings.frameStart + siSettings.videoFirstFrameIndex
+            else:
+                currentImage = currentFrame - siSettings.frameStart
+                firstFrameInd = 0
+                lastFrameInd = siSettings.frameEnd - siSettings.frameStart
+
+            drawRangesAndFrame(
+                siSettings,
+                img_draw,
+                "VIDEOFRAME",
+                currentImage,
+                firstFrameInd,
+                lastFrameInd,
+                siSettings.shotHandles,
+                siSettings.currentFrameUsed,
+                siSettings.animRangeUsed,
+                siSettings.handlesUsed,
+                self._videoFramesPosition[0],
+                self._videoFramesPosition[1],
+                font,
+                fontLarge,
+                textColorRGBA,
+                siSettings.frameDigitsPadding,
+            )
+
+        # ---------- 3D edit -------------
+        if siSettings.edit3DFrameUsed:
+            textProp = "Index in 3D Edit: " if stampLabel else ""
+            totalImages = siSettings.edit3DTotalNumber
+            textProp += str(int(edit3DFrame)) if stampValue else ""
+            if siSettings.edit3DTotalNumberUsed:
+                textProp += " / " + str(int(totalImages)) + " fr." if stampValue else ""
+            img_draw.text(self._edit3DFramePosition, textProp, font=font, fill=textColorRGBA)
+
+        # ---------- 3d frames and range -------------
+        if siSettings.currentFrameUsed:
+            drawRangesAndFrame(
+                siSettings,
+                img_draw,
+                "3DFRAME",
+                currentFrame,
+                siSettings.frameStart,
+                siSettings.frameEnd,
+                siSettings.shotHandles,
+                siSettings.currentFrameUsed,
+                siSettings.animRangeUsed,
+                siSettings.handlesUsed,
+                self._3DFramesPosition[0],
+                self._3DFramesPosition[1],
+                font,
+                fontLarge,
+                textColorRGBA,
+                siSettings.frameDigitsPadding,
+            )
+
+        # ---------- camera -------------
+        currentTextRight, currentTextTop = self._cameraPosition
+
+        if siSettings.cameraLensUsed:
+            if siSettings.cameraUsed:
+                textProp = ""
+            else:
+                textProp = "Lens: " if stampLabel else ""
+            textProp += (str(int(cameraLens))).rjust(3, " ") + " mm" if stampValue else ""  # :05.2f}
+            img_draw.text(
+                (currentTextRight - (font.getsize(textProp))[0], currentTextTop),
+                textProp,
+                font=font,
+                fill=textColorRGBA,
+            )
+
         if siSettings.cameraUsed:
-            textProp = ""
+            textProp = "Cam: " if stampLabel3D else ""
+            textProp += str(cameraName) if stampValue else ""
+            if siSettings.cameraLensUsed:
+                textProp += "    "
+            img_draw.text(
+                self._cameraNamePosition,
+                textProp,
+                font=font,
+                fill=textColorRGBA,
+            )
+
+        return imgInfo
+
+
+def _saveImage(imgInfo, filepath, compressLevel=None):
+    """Save the image in PNG. If compressLevel is None the default compression level of PIL is used"""
+    try:
+        if compressLevel is None:
+            imgInfo.save(filepath)
         else:
-            textProp = "Lens: " if stampLabel else ""
-        # textProp += f"{(scene.camera.data.lens):05.0f}" + " mm" if stampValue else ""       # :05.2f}
-        textProp += (str(int(scene.camera.data.lens))).rjust(3, " ") + " mm" if stampValue else ""  # :05.2f}
-        img_draw.text(
-            (currentTextRight - (font.getsize(textProp))[0], currentTextTop), textProp, font=font, fill=textColorRGBA
+            imgInfo.save(filepath, compress_level=compressLevel)
+    except BaseException:
+        _logger.error_ext(f"Stamp Info: Cannot save file: {filepath}")
+        raise
+
+
+class StampedImagesWriter:
+    """Draw and save the stamped images of a sequence in worker threads
+
+    The layout, and then the static layer, is created by the first worker so that no PIL work is done in
+    the main thread of Blender. Pillow releases the GIL while copying, compositing and encoding the images so
+    the workers run in parallel. Processes cannot be used since the workers would have to import the add-on,
+    which requires bpy.
+    Use it as a context manager: all the images have been written when leaving it.
+    """
+
+    def __init__(self, settings, numWorkers=None, compressLevel=None):
+        self.numWorkers = numWorkers if numWorkers is not None else min(8, os.cpu_count() or 1)
+        self.compressLevel = settings.imagesCompressionLevel if compressLevel is None else compressLevel
+
+        self._executor = ThreadPoolExecutor(max_workers=self.numWorkers, thread_name_prefix="StampInfo")
+        self._layout = self._executor.submit(StampedImageLayout, settings)
+
+        # the number of images waiting to be written is limited to bound the memory used
+        self._maxPendingImages = 2 * self.numWorkers
+        self._pendingImages = deque()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.cancel()
+
+    def addImage(self, filepath, currentFrame, edit3DFrame=None, cameraName=None, cameraLens=None):
+        """Queue the drawing and the saving of the image of the specified frame
+        An exception raised while writing a previous image is raised here
+        """
+        while len(self._pendingImages) >= self._maxPendingImages:
+            self._pendingImages.popleft().result()
+
+        self._pendingImages.append(
+            self._executor.submit(self._writeImage, filepath, currentFrame, edit3DFrame, cameraName, cameraLens)
         )
 
-    if siSettings.cameraUsed:
-        if siSettings.cameraLensUsed:
-            currentTextRight -= (font.getsize(textProp))[0]
-        textProp = "Cam: " if stampLabel3D else ""
-        textProp += str(scene.camera.name) if stampValue else ""
-        if siSettings.cameraLensUsed:
-            textProp += "    "
-        # if siSettings.cameraLensUsed:
-        #     textProp += "   " + (str(int(scene.camera.data.lens))).rjust(3, " ") + " mm" if stampValue else ""
-        # img_draw.text(
-        #     (currentTextRight - (font.getsize(textProp))[0], currentTextTop), textProp, font=font, fill=textColorRGBA,
-        # )
-        img_draw.text(
-            (col04, currentTextTop),
-            textProp,
-            font=font,
-            fill=textColorRGBA,
+    def _writeImage(self, filepath, currentFrame, edit3DFrame, cameraName, cameraLens):
+        imgInfo = self._layout.result().drawImage(
+            currentFrame, edit3DFrame=edit3DFrame, cameraName=cameraName, cameraLens=cameraLens
         )
+        _saveImage(imgInfo, filepath, self.compressLevel)
 
-    # ---------- file -------------
-    # currentTextTop += textLineH + textInterlineH  # * 2
-
-    if siSettings.filenameUsed or siSettings.filepathUsed:
-        textProp = "Blender file: " if stampLabel else ""
-        if stampValue:
-            filenameStr = ""
-            if "" != siSettings.customFileFullPath:
-                filenameStr = siSettings.customFileFullPath
-                if "" == filenameStr:
-                    textProp += "*** Custom File not specified ***"
-            else:
-                filenameStr = bpy.data.filepath
-                if "" == filenameStr:
-                    textProp += "*** File not saved ***"
-            if "" != filenameStr:
-                # head, tail = ntpath.split(filenameStr)
-                if siSettings.filepathUsed:
-                    textProp += str(Path(filenameStr).parent) + "\\"
-                if siSettings.filenameUsed:
-                    textProp += Path(filenameStr).name
-            # textProp  += str(os.path.basename(bpy.data.filepath))
-        # img_draw.text((col01, currentTextTop), textProp, font=font, fill=textColorRGBA)
-        img_draw.text((col01, currentTextFromBottom), textProp, font=font, fill=textColorRGBA)
+    def close(self):
+        """Wait for all the images to be written. An exception raised while writing them is raised here"""
+        try:
+            while len(self._pendingImages):
+                self._pendingImages.popleft().result()
+        finally:
+            self.cancel()
 
+    def cancel(self):
+        """Cancel the writing of the images that have not been started yet"""
+        self._pendingImages.clear()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _getStampedImageFilepath(scene, currentFrame, renderPath=None, renderFilename=None):
+    """Return the path of the stamped image of the specified frame, creating its directory if needed"""
     dirAndFilename = getInfoFileFullPath(scene, currentFrame)
     if renderPath is None:
         renderPath = dirAndFilename[0]
@@ -749,22 +853,103 @@ def renderStampedImage(
             raise
 
     if renderFilename is None:
-        filepath = renderPath + dirAndFilename[1]
-    else:
-        filepath = renderPath + renderFilename
+        return renderPath + dirAndFilename[1]
+    return renderPath + renderFilename
+
+
+# Preparation of the files
+def renderStampedImage(
+    scene,
+    currentFrame,
+    renderW,
+    renderH,
+    innerH,
+    renderPath=None,
+    renderFilename=None,
+    cameraName=None,
+    cameraLens=None,
+    compressLevel=None,
+    verbose=False,
+):
+    """Called by the Pre renderer callback
+    Draw and save the stamped image of the specified frame. To write the images of a sequence use
+    a StampedImagesWriter instead, which draws the static part of the images only once.
+    The scene time is not used: the image is drawn for currentFrame. The name and focal length of the scene camera
+    are used unless cameraName and cameraLens are specified, so that they can be precomputed for a whole shot
+    """
+    if verbose:
+        print("\n       renderTmpImageWithStampedInfo ")
+
+    if scene.camera is not None:
+        if cameraName is None:
+            cameraName = scene.camera.name
+        if cameraLens is None:
+            cameraLens = scene.camera.data.lens
+
+    settings = StampedImageSettings(scene, renderW, renderH, innerH)
+    imgInfo = StampedImageLayout(settings).drawImage(currentFrame, cameraName=cameraName, cameraLens=cameraLens)
 
+    filepath = _getStampedImageFilepath(scene, currentFrame, renderPath=renderPath, renderFilename=renderFilename)
     if verbose:
         print("Info file rendered name: ", (filepath))
 
-    try:
-        imgInfo.save(filepath)
-    except BaseException:
-        _logger.error_ext(f"Stamp Info: renderTmpImageWithStampedInfo Error: Cannot save file: {filepath}")
-        raise
+    _saveImage(imgInfo, filepath, settings.imagesCompressionLevel if compressLevel is None else compressLevel)
+
+
+def benchmarkStampedImages(scene, numFrames=100, numWorkers=None):
+    """Write the stamped images of numFrames frames in a temporary directory, first one image at a time with
+    infoImage_legacy.renderStampedImage() after having set the scene at the time of the frame, as it was done
+    before the fonts cache, the static layer and the writer were introduced, then with a StampedImagesWriter
+    Return a tupple made of the durations in seconds of both writings
+    """
+    from . import infoImage_legacy
+
+    renderW, renderH = getRenderResolutionForStampInfo(scene, forceMultiplesOf2=True)
+    innerH = getInnerHeight(scene)
+    cameraName = None if scene.camera is None else scene.camera.name
+    cameraLens = None if scene.camera is None else scene.camera.data.lens
+    frames = range(scene.frame_start, scene.frame_start + numFrames)
+    previousFrame = scene.frame_current
+
+    with tempfile.TemporaryDirectory() as tmpDir:
+        startTime = time.perf_counter()
+        try:
+            for frame in frames:
+                scene.frame_set(frame)
+                infoImage_legacy.renderStampedImage(
+                    scene,
+                    frame,
+                    renderW,
+                    renderH,
+                    innerH,
+                    renderPath=tmpDir + os.sep,
+                    renderFilename=f"serial_{frame:06}.png",
+                )
+        finally:
+            scene.frame_set(previousFrame)
+        serialDuration = time.perf_counter() - startTime
+
+        _fonts.clear()
+        startTime = time.perf_counter()
+        settings = StampedImageSettings(scene, renderW, renderH, innerH)
+        with StampedImagesWriter(settings, numWorkers=numWorkers) as imagesWriter:
+            for frame in frames:
+                imagesWriter.addImage(
+                    os.path.join(tmpDir, f"writer_{frame:06}.png"), frame, cameraName=cameraName, cameraLens=cameraLens
+                )
+        writerDuration = time.perf_counter() - startTime
+
+    _logger.info_ext(
+        f"Stamped images benchmark: {numFrames} frames at {renderW} x {renderH}:"
+        f" one at a time: {serialDuration:.2f} s, writer ({imagesWriter.numWorkers} workers, compression"
+        f" {imagesWriter.compressLevel}): {writerDuration:.2f} s",
+        col="CYAN",
+    )
+    return (serialDuration, writerDuration)
 
 
 def drawRangesAndFrame(
-    scene,
+    siSettings,
     img_draw,
     framemode,
     currentFrame,
@@ -783,8 +968,8 @@ def drawRangesAndFrame(
 ):
     """
     framemode can be '3DFRAME' or 'VIDEOFRAME'
+    siSettings can be the Stamp Info settings or a StampedImageSettings snapshot
     """
-    siSettings = scene.UAS_SM_StampInfo_Settings
 
     #    currentTextTopFor3DFrames += textLineH + textInterlineH
     #    currentTextLeftFor3DFrames = renderW * (1.0 - 0.05)
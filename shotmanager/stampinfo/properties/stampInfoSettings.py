@@ -558,6 +558,16 @@ class UAS_SMStampInfoSettings(bpy.types.PropertyGroup):
         name="Stamp Property Value", description="Stamp Property Value", default=True, options=set()
     )
 
+    imagesCompressionLevel: IntProperty(
+        name="Images Compression",
+        description="Compression level of the PNG images of the stamped information, from 0 (no compression,"
+        "\nfastest) to 9 (smallest files, slowest)",
+        min=0,
+        max=9,
+        default=1,
+        options=set(),
+    )
+
     # debug properties -------------
 
     def set_debugMode(self, value):
@@ -592,10 +602,13 @@ class UAS_SMStampInfoSettings(bpy.types.PropertyGroup):
         innerHeight=None,
         renderPath=None,
         renderFilename=None,
+        cameraName=None,
+        cameraLens=None,
         verbose=False,
     ):
         """Args:
-        resolution: the resolution frame"""
+        resolution: the resolution frame
+        cameraName, cameraLens: values to stamp instead of the ones of the scene camera at the current time"""
 
         if resolution is None or innerHeight is None:
             renderW = getRenderResolutionForStampInfo(scene, forceMultiplesOf2=True)[0]
@@ -614,6 +627,8 @@ class UAS_SMStampInfoSettings(bpy.types.PropertyGroup):
             innerH,
             renderPath=renderPath,
             renderFilename=renderFilename,
+            cameraName=cameraName,
+            cameraLens=cameraLens,
             verbose=verbose,
         )
 
@@ -798,6 +798,9 @@ def drawSettingsPanel(context, layout, enabled=True):
     row = layout.row()
     row.prop(siSettings, "stampPropertyValue")
 
+    row = layout.row()
+    row.prop(siSettings, "imagesCompressionLevel")
+
 
 #########
 # MISC
@@ -26,6 +26,7 @@ from shotmanager.config import config
 from shotmanager.utils.utils_os import module_can_be_imported
 
 from . import sm_shots_ui_common
+from .sm_ui_snapshot import getUISnapshot
 
 from shotmanager.config import sm_logging
 
@@ -40,6 +41,8 @@ _logger = sm_logging.getLogger(__name__)
 class UAS_UL_ShotManager_Items(bpy.types.UIList):
     def draw_item(self, context, layout, data, item, icon, active_data, active_propname, index):
         props = context.scene.UAS_shot_manager_props
+        uiSnapshot = getUISnapshot(context)
+        currentLayout = uiSnapshot.currentLayout
         current_shot_index = props.current_shot_index
         scene = context.scene
 
@@ -53,7 +56,7 @@ class UAS_UL_ShotManager_Items(bpy.types.UIList):
         cameraIsValid = item.isCameraValid()
         itemHasWarnings = not cameraIsValid
 
-        takeContainsSharedCameras = props.isThereSharedCamerasInTake()
+        takeContainsSharedCameras = uiSnapshot.takeContainsSharedCameras
         if takeContainsSharedCameras:
             numSharedCam = props.getNumSharedCamera(item.camera)
         else:
@@ -74,7 +77,7 @@ class UAS_UL_ShotManager_Items(bpy.types.UIList):
             if props.display_selectbut_in_shotlist:
                 row.operator("uas_shot_manager.shots_selectcamera", text="", icon="RESTRICT_SELECT_OFF").index = index
 
-            if props.getCurrentLayout().display_cameraBG_in_properties and props.display_cameraBG_in_shotlist:
+            if currentLayout.display_cameraBG_in_properties and props.display_cameraBG_in_shotlist:
                 row = row.row(align=True)
                 row.scale_x = 0.9
                 # icon = "VIEW_CAMERA" if item.hasBGImage() else "BLANK1"
@@ -99,16 +102,16 @@ class UAS_UL_ShotManager_Items(bpy.types.UIList):
                 row.prop(item, "color", text="")
                 row.scale_x = 0.45
 
-        if props.display_greasepencil_in_shotlist or props.getCurrentLayout().display_storyboard_in_properties:
+        if props.display_greasepencil_in_shotlist or currentLayout.display_storyboard_in_properties:
 
             mainRow.separator(factor=0.8)
             stbRow = mainRow.row(align=True)
             stbRow.scale_x = 1.0
 
-            if props.getCurrentLayout().display_storyboard_in_properties and props.display_greasepencil_in_shotlist:
+            if currentLayout.display_storyboard_in_properties and props.display_greasepencil_in_shotlist:
                 sm_shots_ui_common.drawStoryboardRow(stbRow, props, item, index)
 
-            if props.getCurrentLayout().display_notes_in_properties and props.display_notes_in_shotlist:
+            if currentLayout.display_notes_in_properties and props.display_notes_in_shotlist:
                 sm_shots_ui_common.drawNotesRow(stbRow, props, item, index)
 
         mainRow.separator(factor=0.6)
@@ -25,12 +25,12 @@ from bpy.types import Panel, Operator
 from shotmanager.utils import utils
 from shotmanager.utils import utils_shot_manager
 from shotmanager.utils import utils_ui
-from shotmanager.utils import utils_markers
 
 from . import sm_shots_ui_previz_layout
 from . import sm_shots_ui_storyboard_layout
 from . import sm_takes_ui
 from . import sm_shot_settings_panel_ui
+from .sm_ui_snapshot import getUISnapshot
 from shotmanager.warnings.warnings_ui import drawWarnings
 
 # from shotmanager.features.greasepencil import greasepencil_ui as gp
@@ -145,25 +145,18 @@ class UAS_PT_ShotManager(Panel):
         props = scene.UAS_shot_manager_props
         prefs = config.getShotManagerPrefs()
 
-        currentLayout = props.getCurrentLayout()
-        # currentLayoutIsStb = "STORYBOARD" == props.currentLayoutMode()
+        uiSnapshot = getUISnapshot(context)
+
+        currentLayout = uiSnapshot.currentLayout
+        currentLayoutIsStb = uiSnapshot.currentLayoutIsStb
         if currentLayout is None:
             _logger.debug_ext("SM UI: currentLayout is None...", col="RED")
-            #    return
-            currentLayoutIsStb = False
-        #  print(f"Redrawing SM panel...  layout None is Stb: {currentLayoutIsStb}")
-        else:
-            currentLayoutIsStb = "STORYBOARD" == currentLayout.layoutMode
         # print(f"Redrawing SM panel...  layout is Stb: {currentLayoutIsStb}")
 
-        currentTake = props.getCurrentTake()
-        currentTakeInd = props.getCurrentTakeIndex()
+        currentTake = uiSnapshot.currentTake
+        currentTakeInd = uiSnapshot.currentTakeIndex
 
-        shot = None
-        if "SELECTED" == props.current_shot_properties_mode:
-            shot = props.getSelectedShot()
-        else:
-            shot = props.getCurrentShot()
+        shot = uiSnapshot.propertiesShot
 
         enlargeButs = 1.15
 
@@ -205,7 +198,7 @@ class UAS_PT_ShotManager(Panel):
 
         # scene warnings
         ################
-        warningsList = props.getWarnings(scene)
+        warningsList = uiSnapshot.warnings
         drawWarnings(context, layout, warningsList, panelType="MAIN")
 
         if not props.isInitialized or not len(props.layouts) or currentLayout is None:
@@ -213,7 +206,7 @@ class UAS_PT_ShotManager(Panel):
 
         # play and timeline
         ################
-        playEnabled = not utils_markers.sceneContainsCameraBinding(scene)
+        playEnabled = not uiSnapshot.sceneContainsCameraBinding
         row = layout.row()
         row.scale_y = 1.3
         rowPlayButton = row.row()
@@ -0,0 +1,148 @@
+# GPLv3 License
+#
+# Copyright (C) 2021 Ubisoft
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Snapshot of the state of Shot Manager read by the panels and the shots lists when they are drawn
+
+The sidebar is redrawn very often, and each row of the shots lists used to query the current layout,
+the take and the shared cameras again. The snapshot gathers these values once and is reused by all the
+draw functions until something changes: it is keyed by the indices of the current take, shot and layout
+and by counters incremented by the depsgraph updates and the invalidations of the shots index.
+The current frame is not part of the key so that the snapshot persists during the playback.
+"""
+
+from collections import namedtuple
+
+import bpy
+from bpy.app.handlers import persistent
+
+from shotmanager.properties import shots_index
+from shotmanager.utils import utils_markers
+from shotmanager.warnings import warnings
+
+from shotmanager.config import sm_logging
+
+_logger = sm_logging.getLogger(__name__)
+
+
+# dictionary of tuples (key, UISnapshot), keyed by props pointer
+_snapshots = dict()
+
+# number of updates of the data of the file, incremented by the depsgraph handler
+_updatesCounter = 0
+
+
+class UISnapshot(
+    namedtuple(
+        "UISnapshot",
+        [
+            "currentLayout",
+            "currentLayoutIsStb",
+            "currentTakeIndex",
+            "currentTake",
+            "currentShotIndex",
+            "currentShot",
+            "selectedShotIndex",
+            "selectedShot",
+            "propertiesShot",
+            "warnings",
+            "takeContainsSharedCameras",
+            "sceneContainsCameraBinding",
+        ],
+    )
+):
+    """Immutable state of Shot Manager for a redraw of the UI
+    propertiesShot is the shot displayed in the shot properties panel, the selected or the current one
+    """
+
+    __slots__ = ()
+
+
+def _getSnapshotKey(scene, props):
+    return (
+        _updatesCounter,
+        shots_index.getGeneration(),
+        warnings.getGeneration(),
+        bpy.data.filepath,
+        scene.name,
+        props.current_take_name,
+        len(props.takes),
+        props.current_shot_index,
+        props.selected_shot_index,
+        props.current_layout_index,
+        len(props.layouts),
+        props.current_shot_properties_mode,
+        props.isInitialized,
+    )
+
+
+def _buildSnapshot(scene, props):
+    currentLayout = props.getCurrentLayout()
+    currentShot = props.getCurrentShot()
+    selectedShot = props.getSelectedShot()
+
+    return UISnapshot(
+        currentLayout=currentLayout,
+        currentLayoutIsStb=currentLayout is not None and "STORYBOARD" == currentLayout.layoutMode,
+        currentTakeIndex=props.getCurrentTakeIndex(),
+        currentTake=props.getCurrentTake(),
+        currentShotIndex=props.getCurrentShotIndex(),
+        currentShot=currentShot,
+        selectedShotIndex=props.getSelectedShotIndex(),
+        selectedShot=selectedShot,
+        propertiesShot=selectedShot if "SELECTED" == props.current_shot_properties_mode else currentShot,
+        warnings=tuple(props.getWarnings(scene)),
+        takeContainsSharedCameras=props.isThereSharedCamerasInTake(),
+        sceneContainsCameraBinding=utils_markers.sceneContainsCameraBinding(scene),
+    )
+
+
+def getUISnapshot(context):
+    """Return the snapshot of the state of the Shot Manager of the scene of the context, built again only
+    if something has changed since the previous call
+    """
+    scene = context.scene
+    props = scene.UAS_shot_manager_props
+    propsPointer = props.as_pointer()
+
+    key = _getSnapshotKey(scene, props)
+    cached = _snapshots.get(propsPointer, None)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    _logger.debug_ext("Building UI snapshot", col="GRAY", tag="UI_SNAPSHOT")
+    snapshot = _buildSnapshot(scene, props)
+    _snapshots[propsPointer] = (key, snapshot)
+    return snapshot
+
+
+def getUpdatesCounter():
+    """Return the number of updates of the data of the file, to use in the keys of the caches of the UI"""
+    return _updatesCounter
+
+
+def invalidateUISnapshots():
+    """Invalidate the snapshots of all the scenes, to call when the data they reference may have been freed"""
+    global _updatesCounter
+    _updatesCounter += 1
+    _snapshots.clear()
+
+
+@persistent
+def shotMngHandler_depsgraph_update_post_uiSnapshot(scene, depsgraph):
+    global _updatesCounter
+    _updatesCounter += 1
@@ -29,6 +29,7 @@ from random import uniform
 from xmlrpc.client import Boolean
 
 import bpy
+from bpy.app.handlers import persistent
 
 from shotmanager.utils import utils_os
 from shotmanager.config import sm_logging
@@ -681,12 +682,14 @@ def getSceneVSE(vsm_sceneName, createVseTab=False):
 
 
 def getChildrenHierarchy(parentObject):
-    """Return a list with all the children - recursive - of the specified object"""
+    """Return a list with all the children - recursive - of the specified object
+    The children are read from the cached children index instead of object.children
+    """
 
     allChildren = list()
 
     def _getChildrenHierarchyRec(parentObject):
-        for child in parentObject.children:
+        for child in getObjectChildren(parentObject):
             allChildren.append(child)
             _getChildrenHierarchyRec(child)
 
@@ -695,6 +698,74 @@ def getChildrenHierarchy(parentObject):
     return allChildren
 
 
+class ObjectsChildrenIndex:
+    """Children of all the objects of the file, built in one pass over bpy.data.objects
+    object.children scans all the objects of the file at each call, which is slow in files with many objects
+    """
+
+    def __init__(self):
+        self.numObjects = len(bpy.data.objects)
+
+        # dictionary of the lists of the children of the objects, keyed by parent pointer
+        self.children = dict()
+        # dictionary of the pointers of the parents of the objects having one, keyed by object pointer
+        self.parents = dict()
+
+        for obj in bpy.data.objects:
+            if obj.parent is not None:
+                parentPointer = obj.parent.as_pointer()
+                self.children.setdefault(parentPointer, list()).append(obj)
+                self.parents[obj.as_pointer()] = parentPointer
+
+
+_objectsChildrenIndex = None
+
+
+def _getObjectsChildrenIndex():
+    global _objectsChildrenIndex
+    if _objectsChildrenIndex is None or _objectsChildrenIndex.numObjects != len(bpy.data.objects):
+        _logger.debug_ext("Building objects children index", col="GRAY", tag="CHILDREN_INDEX")
+        _objectsChildrenIndex = ObjectsChildrenIndex()
+    return _objectsChildrenIndex
+
+
+def getObjectChildren(obj):
+    """Return the list of the direct children of the specified object, in the same order as obj.children,
+    from a cache invalidated when objects are added, removed or parented
+    The returned list must not be modified
+    """
+    objPointer = obj.as_pointer()
+    children = _getObjectsChildrenIndex().children.get(objPointer, [])
+    try:
+        if all(child.parent is not None and child.parent.as_pointer() == objPointer for child in children):
+            return children
+    except ReferenceError:
+        # a child has been removed
+        pass
+
+    invalidateObjectsChildren()
+    return _getObjectsChildrenIndex().children.get(objPointer, [])
+
+
+def invalidateObjectsChildren():
+    global _objectsChildrenIndex
+    _objectsChildrenIndex = None
+
+
+@persistent
+def shotMngHandler_depsgraph_update_post_objectsChildren(scene, depsgraph):
+    # parenting of existing objects done in the UI or by other add-ons
+    if _objectsChildrenIndex is None or not depsgraph.id_type_updated("OBJECT"):
+        return
+    for update in depsgraph.updates:
+        if isinstance(update.id, bpy.types.Object):
+            obj = update.id.original
+            parentPointer = obj.parent.as_pointer() if obj.parent is not None else None
+            if _objectsChildrenIndex.parents.get(obj.as_pointer(), None) != parentPointer:
+                invalidateObjectsChildren()
+                return
+
+
 def duplicateObject(sourceObject, newName=None, duplicateHierarchy=False):
     """Duplicate (deepcopy) an object and place it in the same collection
     Can be any 3D object, camera...
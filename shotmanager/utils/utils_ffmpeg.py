@@ -0,0 +1,213 @@
+# GPLv3 License
+#
+# Copyright (C) 2021 Ubisoft
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Concatenation of videos by stream copy with the ffmpeg and ffprobe executables installed on the machine
+
+The videos are not re-encoded so they must have been generated with the same codec parameters, which is the case
+of the shot videos generated by Shot Manager. When the handles of the videos have to be removed, the first frame
+after the start handle must be a key frame and the videos must not have B-frames, so that the cuts are frame accurate.
+The audio packets cannot be cut on frame boundaries, so videos with sound are concatenated only when they have
+no handles.
+"""
+
+import os
+import json
+import math
+import shutil
+import subprocess
+import tempfile
+from fractions import Fraction
+from pathlib import Path
+
+from shotmanager.config import sm_logging
+
+_logger = sm_logging.getLogger(__name__)
+
+
+# parameters of the streams that have to be identical for the videos to be concatenated
+_videoParamsNames = ("codec_name", "profile", "width", "height", "pix_fmt", "r_frame_rate", "time_base")
+_audioParamsNames = ("codec_name", "profile", "sample_rate", "channels", "channel_layout")
+
+# codecs of the edit videos rendered with the VSE, that the concatenated videos must already use
+_videoCodecs = ("h264",)
+_audioCodecs = ("aac",)
+
+
+def getFFmpegExecutables():
+    """Return the paths of the ffmpeg and ffprobe executables found in the PATH, None if one of them is missing"""
+    ffmpeg = shutil.which("ffmpeg")
+    ffprobe = shutil.which("ffprobe")
+    if ffmpeg is None or ffprobe is None:
+        return None
+    return ffmpeg, ffprobe
+
+
+def _runFFprobe(ffprobe, args):
+    result = subprocess.run(
+        [ffprobe, "-v", "error", "-of", "json"] + args, capture_output=True, universal_newlines=True, errors="replace"
+    )
+    if 0 != result.returncode:
+        _logger.error_ext(f"ffprobe failed: {result.stderr}")
+        return None
+    return json.loads(result.stdout)
+
+
+def getMediaStreamsParams(ffprobe, filepath):
+    """Return a tuple made of the parameters of the first video stream and of the first audio stream of the media,
+    None for a missing stream, or None if the media cannot be read
+    """
+    info = _runFFprobe(ffprobe, ["-show_streams", filepath])
+    if info is None:
+        return None
+
+    videoParams = None
+    audioParams = None
+    for stream in info.get("streams", []):
+        if "video" == stream.get("codec_type") and videoParams is None:
+            videoParams = tuple(stream.get(name) for name in _videoParamsNames) + (stream.get("has_b_frames", 0),)
+        elif "audio" == stream.get("codec_type") and audioParams is None:
+            audioParams = tuple(stream.get(name) for name in _audioParamsNames)
+    return videoParams, audioParams
+
+
+def getVideoPackets(ffprobe, filepath):
+    """Return the list of the video packets of the media, sorted by presentation time, as tuples made of the
+    presentation time in seconds (as a Fraction) and a boolean set to True for the key frames. None if the media
+    cannot be read
+    """
+    info = _runFFprobe(
+        ffprobe,
+        ["-select_streams", "v:0", "-show_entries", "stream=time_base:packet=pts,flags", filepath],
+    )
+    if info is None or not len(info.get("streams", [])):
+        return None
+
+    timeBase = Fraction(info["streams"][0]["time_base"])
+    packets = list()
+    for packet in info.get("packets", []):
+        if "pts" not in packet:
+            return None
+        packets.append((packet["pts"] * timeBase, "K" in packet.get("flags", "")))
+    packets.sort()
+    return packets
+
+
+def _formatTime(time, roundUp):
+    # the concat demuxer reads times in microseconds, they are rounded so that the time of the cut frame is
+    # inside the kept range
+    microseconds = math.ceil(time * 1000000) if roundUp else math.floor(time * 1000000)
+    return f"{microseconds // 1000000}.{microseconds % 1000000:06}"
+
+
+def _escapeConcatPath(filepath):
+    return "'" + str(filepath).replace("'", "'\\''") + "'"
+
+
+def concatVideosByStreamCopy(outputFile, mediaFiles, handles, fps, resolution=None):
+    """Concatenate the specified videos without re-encoding them, after having removed their handles
+    Return True if the output file has been generated, False if the videos cannot be concatenated this way, in
+    which case nothing is written
+    Args:
+        handles: number of frames to remove at the start and at the end of each video
+        fps: frame rate the videos must have
+        resolution: tupple made of the width and height the videos must have, None to accept any resolution
+    """
+    executables = getFFmpegExecutables()
+    if executables is None:
+        _logger.info_ext("ffmpeg or ffprobe not found, stream copy of the videos not possible", col="PURPLE")
+        return False
+    ffmpeg, ffprobe = executables
+
+    if not len(mediaFiles):
+        return False
+
+    refParams = None
+    concatLines = ["ffconcat version 1.0"]
+    for mediaPath in mediaFiles:
+        if not Path(mediaPath).exists():
+            _logger.info_ext(f"Stream copy not possible, media not found: {mediaPath}", col="PURPLE")
+            return False
+
+        params = getMediaStreamsParams(ffprobe, mediaPath)
+        if params is None or params[0] is None:
+            _logger.info_ext(f"Stream copy not possible, media cannot be read: {mediaPath}", col="PURPLE")
+            return False
+        if refParams is None:
+            refParams = params
+            frameRate = Fraction(params[0][_videoParamsNames.index("r_frame_rate")])
+            if abs(float(frameRate) - fps) > 0.001:
+                _logger.info_ext(f"Stream copy not possible, frame rate {frameRate} is not {fps}", col="PURPLE")
+                return False
+            videoCodec = params[0][_videoParamsNames.index("codec_name")]
+            audioCodec = None if params[1] is None else params[1][_audioParamsNames.index("codec_name")]
+            if videoCodec not in _videoCodecs or (audioCodec is not None and audioCodec not in _audioCodecs):
+                _logger.info_ext(f"Stream copy not possible, codecs {videoCodec}, {audioCodec}", col="PURPLE")
+                return False
+            videoSize = (params[0][_videoParamsNames.index("width")], params[0][_videoParamsNames.index("height")])
+            if resolution is not None and videoSize != tuple(resolution):
+                _logger.info_ext(f"Stream copy not possible, resolution {videoSize} is not {resolution}", col="PURPLE")
+                return False
+            # audio packets are not aligned on the video frames so cutting them at the handles would make the
+            # sound drift from the pictures at each shot
+            if 0 < handles and params[1] is not None:
+                _logger.info_ext("Stream copy not possible, audio cannot be cut at the handles", col="PURPLE")
+                return False
+        elif params != refParams:
+            _logger.info_ext(f"Stream copy not possible, parameters of {mediaPath} differ: {params}", col="PURPLE")
+            return False
+
+        concatLines.append(f"file {_escapeConcatPath(Path(mediaPath).resolve())}")
+
+        if 0 < handles:
+            # has_b_frames is the last video parameter
+            if 0 != params[0][-1]:
+                _logger.info_ext(f"Stream copy not possible, media has B-frames: {mediaPath}", col="PURPLE")
+                return False
+            packets = getVideoPackets(ffprobe, mediaPath)
+            if packets is None or len(packets) <= 2 * handles:
+                _logger.info_ext(f"Stream copy not possible, media shorter than its handles: {mediaPath}", col="PURPLE")
+                return False
+            inTime, isKeyFrame = packets[handles]
+            if not isKeyFrame:
+                _logger.info_ext(f"Stream copy not possible, no key frame after the handle: {mediaPath}", col="PURPLE")
+                return False
+            outTime = packets[len(packets) - handles][0]
+            concatLines.append(f"inpoint {_formatTime(inTime, roundUp=True)}")
+            concatLines.append(f"outpoint {_formatTime(outTime, roundUp=False)}")
+
+    concatFileHandle, concatFile = tempfile.mkstemp(prefix="ShotManager_", suffix=".ffconcat")
+    try:
+        with os.fdopen(concatFileHandle, "w", encoding="utf-8") as f:
+            f.write("\n".join(concatLines) + "\n")
+
+        Path(outputFile).parent.mkdir(parents=True, exist_ok=True)
+        command = [ffmpeg, "-y", "-v", "error", "-f", "concat", "-safe", "0", "-i", concatFile]
+        command += ["-map", "0:v:0", "-map", "0:a:0?", "-c", "copy", outputFile]
+        _logger.debug_ext(f"Concatenating videos by stream copy: {command}", col="GRAY", tag="RENDER")
+        result = subprocess.run(command, capture_output=True, universal_newlines=True, errors="replace")
+    finally:
+        os.remove(concatFile)
+
+    if 0 != result.returncode:
+        _logger.error_ext(f"ffmpeg failed to concatenate the videos: {result.stderr}")
+        if Path(outputFile).exists():
+            os.remove(outputFile)
+        return False
+
+    _logger.info_ext(f"Videos concatenated by stream copy: {outputFile}", col="GREEN")
+    return True
@@ -20,6 +20,8 @@ Classes and functions dedicated to filenames management such as sequence names.
 """
 
 
+import os
+import time
 from pathlib import Path
 import bpy
 
@@ -326,6 +328,104 @@ def run_sequence_path_tests(at_frame=None):
 #
 
 
+###############
+# Image sequences discovery
+###############
+
+# a listing of a folder is not trusted if it has been made less than this number of seconds after the
+# last modification of the folder, since files added during the same tick of the file system clock
+# would not change its modification time
+_FOLDER_MTIME_RESOLUTION = 2.0
+
+# dictionary of the listings of the folders, keyed by folder path. Each value is a tuple made of the
+# modification time of the folder, the time of the listing and the names of the files of the folder
+_folderFilesCache = dict()
+
+# dictionary of ImageSequenceFrames instances, keyed by (folder, prefix, suffix, padding)
+_imageSequencesCache = dict()
+
+
+class ImageSequenceFrames:
+    """Frames of an image sequence found in a folder, the files being named prefix + frame number + suffix,
+    with the frame number padded with zeros to the specified number of digits
+    """
+
+    def __init__(self, folder, prefix, suffix, padding, fileNames):
+        self.folder = folder
+
+        # listing of the folder the frames have been found in, used to detect a new listing of the folder
+        self.fileNames = fileNames
+
+        # dictionary of the file names, keyed by frame number
+        self.frames = dict()
+        nameLength = len(prefix) + padding + len(suffix)
+        for fileName in fileNames:
+            if len(fileName) == nameLength and fileName.startswith(prefix) and fileName.endswith(suffix):
+                frameStr = fileName[len(prefix) : len(prefix) + padding]
+                if frameStr.isascii() and frameStr.isdigit():
+                    self.frames[int(frameStr)] = fileName
+
+        self.minFrame = min(self.frames) if len(self.frames) else None
+        self.maxFrame = max(self.frames) if len(self.frames) else None
+
+        # list of the ranges of missing frames between minFrame and maxFrame, as tuples (first, last)
+        self.gaps = list()
+        previousFrame = None
+        for frame in sorted(self.frames):
+            if previousFrame is not None and frame > previousFrame + 1:
+                self.gaps.append((previousFrame + 1, frame - 1))
+            previousFrame = frame
+
+    def getFilepath(self, frame):
+        return os.path.join(self.folder, self.frames[frame])
+
+    def getElementsNames(self):
+        """Return the list of the file names from minFrame to maxFrame, with an empty name for the missing frames,
+        as expected by the elements of an image strip
+        """
+        if self.minFrame is None:
+            return []
+        return [self.frames.get(frame, "") for frame in range(self.minFrame, self.maxFrame + 1)]
+
+
+def getFolderFileNames(folder):
+    """Return the list of the names of the files of the folder, empty if the folder does not exist
+    The listing is cached until the modification time of the folder changes
+    """
+    try:
+        folderMTime = os.stat(folder).st_mtime
+    except OSError:
+        _folderFilesCache.pop(folder, None)
+        return []
+
+    cachedListing = _folderFilesCache.get(folder, None)
+    if cachedListing is not None:
+        cachedMTime, listingTime, fileNames = cachedListing
+        if cachedMTime == folderMTime and listingTime - folderMTime > _FOLDER_MTIME_RESOLUTION:
+            return fileNames
+
+    listingTime = time.time()
+    with os.scandir(folder) as entries:
+        fileNames = [entry.name for entry in entries if entry.is_file()]
+    _folderFilesCache[folder] = (folderMTime, listingTime, fileNames)
+    return fileNames
+
+
+def getImageSequenceFrames(folder, prefix, suffix, padding):
+    """Return the ImageSequenceFrames of the files of the folder named prefix + frame number + suffix
+    The result is cached until the content of the folder changes
+    """
+    folder = str(folder)
+    fileNames = getFolderFileNames(folder)
+
+    key = (folder, prefix, suffix, padding)
+    seqFrames = _imageSequencesCache.get(key, None)
+    if seqFrames is None or seqFrames.fileNames is not fileNames:
+        seqFrames = ImageSequenceFrames(folder, prefix, suffix, padding, fileNames)
+        _imageSequencesCache[key] = seqFrames
+    return seqFrames
+
+
 _classes = (SequencePath,)
 
 
@@ -44,15 +44,14 @@ def get_greasepencil_child(obj, childType="GPENCIL", name_filter=""):
     gpChild = None
 
     if obj is not None:
-        if len(obj.children):
-            for c in obj.children:
-                if "EMPTY" == c.type:
-                    if "EMPTY" == childType:
-                        return c
-                    if len(c.children):
-                        for cc in c.children:
-                            if "GPENCIL" == cc.type:
-                                return cc
+        # the cached children are used since obj.children scans all the objects of the file
+        for c in utils.getObjectChildren(obj):
+            if "EMPTY" == c.type:
+                if "EMPTY" == childType:
+                    return c
+                for cc in utils.getObjectChildren(c):
+                    if "GPENCIL" == cc.type:
+                        return cc
 
     return gpChild
     # if obj is not None:
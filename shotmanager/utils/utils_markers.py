@@ -17,8 +17,125 @@
 
 """
 Utils markers
+
+The queries of the markers by frame use an index of the markers of the scene sorted by frame, with
+buckets of the markers whose name contains a filter text. The index is updated by the functions adding,
+renaming and removing markers and rebuilt when the number of markers changes or after a depsgraph
+update of the scene.
 """
 
+from bisect import bisect_left, bisect_right
+
+from bpy.app.handlers import persistent
+
+from shotmanager.config import sm_logging
+
+_logger = sm_logging.getLogger(__name__)
+
+
+# dictionary of MarkersIndex instances, keyed by scene pointer
+_markersIndices = dict()
+
+
+class MarkersIndex:
+    """Markers of a scene sorted by frame, markers at the same frame being in the order of the scene markers"""
+
+    def __init__(self, scene):
+        self.markers = sorted(scene.timeline_markers, key=lambda m: m.frame)
+        self.frames = [m.frame for m in self.markers]
+
+        # dictionary of tuples (frames, markers) of the markers whose name contains the filter, keyed by filter
+        self._buckets = dict()
+
+    def getMarkers(self, filter=""):
+        """Return a tuple made of the sorted list of the frames of the markers whose name contains filter and of
+        the list of these markers"""
+        if "" == filter:
+            return self.frames, self.markers
+
+        bucket = self._buckets.get(filter, None)
+        if bucket is None:
+            markers = [m for m in self.markers if filter in m.name]
+            bucket = ([m.frame for m in markers], markers)
+            self._buckets[filter] = bucket
+        return bucket
+
+    def _getBuckets(self):
+        return [("", (self.frames, self.markers))] + list(self._buckets.items())
+
+    def addMarker(self, marker):
+        """Add to the index a marker just created in the scene"""
+        for filter, (frames, markers) in self._getBuckets():
+            if filter in marker.name:
+                ind = bisect_right(frames, marker.frame)
+                frames.insert(ind, marker.frame)
+                markers.insert(ind, marker)
+
+    def removeMarker(self, marker, name=None):
+        """Remove from the index a marker before it is removed from the scene
+        Args:
+            name: name of the marker when it has been indexed, the current one if None
+        """
+        name = marker.name if name is None else name
+        for filter, (frames, markers) in self._getBuckets():
+            if filter in name:
+                for ind in range(bisect_left(frames, marker.frame), bisect_right(frames, marker.frame)):
+                    if markers[ind] == marker:
+                        del frames[ind]
+                        del markers[ind]
+                        break
+
+    def renameMarker(self, marker, previousName):
+        """Update the index after the marker has been renamed
+        The buckets the marker enters or leaves are dropped, to be rebuilt with the markers at the same frame
+        in the order of the scene markers
+        """
+        for filter in list(self._buckets):
+            if (filter in previousName) != (filter in marker.name):
+                del self._buckets[filter]
+
+
+def getMarkersIndex(scene):
+    """Return the index of the markers of the scene, rebuilt if the number of markers has changed"""
+    index = _markersIndices.get(scene.as_pointer(), None)
+    if index is None or len(index.markers) != len(scene.timeline_markers):
+        _logger.debug_ext(f"Building markers index of scene {scene.name}", col="GRAY", tag="MARKERS_INDEX")
+        index = MarkersIndex(scene)
+        _markersIndices[scene.as_pointer()] = index
+    return index
+
+
+def invalidateMarkersIndex(scene=None):
+    """Invalidate the index of the markers of the specified scene, of all the scenes if None"""
+    if scene is None:
+        _markersIndices.clear()
+    else:
+        _markersIndices.pop(scene.as_pointer(), None)
+
+
+@persistent
+def shotMngHandler_depsgraph_update_post_markersIndex(scene, depsgraph):
+    # the markers can be modified outside of Shot Manager
+    if depsgraph.id_type_updated("SCENE"):
+        invalidateMarkersIndex()
+
+
+def _queryMarker(scene, filter, queryFunction):
+    """Return the marker at the index returned by queryFunction(frames) in the sorted markers matching the
+    filter, None if the index is None. If the marker found is not consistent with the index the index is
+    built again
+    """
+    for _i in range(2):
+        frames, markers = getMarkersIndex(scene).getMarkers(filter)
+        ind = queryFunction(frames)
+        if ind is None:
+            return None
+        marker = markers[ind]
+        if marker.frame == frames[ind] and filter in marker.name:
+            return marker
+        invalidateMarkersIndex(scene)
+    return None
+
 
 def sceneContainsCameraBinding(scene):
     for m in scene.timeline_markers:
@@ -47,41 +164,35 @@ def sortMarkers(markers, filter=""):
 
 
 def getFirstMarker(scene, frame, filter=""):
-    markers = sortMarkers(scene.timeline_markers, filter)
-    return markers[0] if len(markers) else None
+    return _queryMarker(scene, filter, lambda frames: 0 if len(frames) else None)
 
 
 def getMarkerBeforeFrame(scene, frame, filter=""):
-    markers = sortMarkers(scene.timeline_markers, filter)
-    previousMarker = None
-    for m in markers:
-        if frame > m.frame:
-            previousMarker = m
-        else:
-            return previousMarker
-    return previousMarker
+    def _query(frames):
+        ind = bisect_left(frames, frame)
+        return ind - 1 if 0 < ind else None
+
+    return _queryMarker(scene, filter, _query)
 
 
 def getMarkerAtFrame(scene, frame, filter=""):
-    markers = sortMarkers(scene.timeline_markers, filter)
-    for m in markers:
-        # for m in scene.timeline_markers:
-        if frame == m.frame:
-            return m
-    return None
+    def _query(frames):
+        ind = bisect_left(frames, frame)
+        return ind if ind < len(frames) and frame == frames[ind] else None
+
+    return _queryMarker(scene, filter, _query)
 
 
 def getMarkerAfterFrame(scene, frame, filter=""):
-    markers = sortMarkers(scene.timeline_markers, filter)
-    for m in markers:
-        if frame < m.frame:
-            return m
-    return None
+    def _query(frames):
+        ind = bisect_right(frames, frame)
+        return ind if ind < len(frames) else None
+
+    return _queryMarker(scene, filter, _query)
 
 
 def getLastMarker(scene, frame, filter=""):
-    markers = sortMarkers(scene.timeline_markers, filter)
-    return markers[len(markers) - 1] if len(markers) else None
+    return _queryMarker(scene, filter, lambda frames: len(frames) - 1 if len(frames) else None)
 
 
 def clearMarkersSelection(markers):
@@ -92,16 +203,20 @@ def clearMarkersSelection(markers):
 def addMarkerAtFrame(scene, frame, name):
     marker = getMarkerAtFrame(scene, frame)
     if marker is not None:
-        marker = getMarkerAtFrame(scene, frame)
+        previousName = marker.name
         marker.name = name
+        getMarkersIndex(scene).renameMarker(marker, previousName)
     else:
         if "" == name:
             name = f"F_{scene.frame_current}"
+        index = getMarkersIndex(scene)
         marker = scene.timeline_markers.new(name, frame=frame)
+        index.addMarker(marker)
     return marker
 
 
 def deleteMarkerAtFrame(scene, frame):
     marker = getMarkerAtFrame(scene, frame)
     if marker is not None:
+        getMarkersIndex(scene).removeMarker(marker)
         scene.timeline_markers.remove(marker)
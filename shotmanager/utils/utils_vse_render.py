@@ -33,6 +33,8 @@ from bpy.props import (
 
 from ..config import config
 from ..utils import utils
+from ..utils import utils_ffmpeg
+from ..utils import utils_filenames
 
 from shotmanager.config import sm_logging
 
@@ -410,64 +412,40 @@ class ShotManager_Vse_Render(PropertyGroup):
         def _new_images_sequence(scene, clipName, images_path, channelInd, atFrame):
             """Find the name template for the specified images sequence in order to create it"""
             import re
-            from pathlib import Path
 
             seq = None
             p = Path(images_path)
             folder, name = p.parent, str(p.name)
 
-            mov_name = ""
             # Find frame padding. Either using # formating or printf formating
-            file_re = ""
             padding_match = re.match(".*?(#+).*", name)
             if not padding_match:
-                padding_match = re.match(".*?%(\d\d)d.*", name)
+                padding_match = re.match(".*?%(\\d\\d)d.*", name)
                 if padding_match:
                     padding_length = int(padding_match[1])
-                    file_re = re.compile(
-                        r"^{1}({0}){2}$".format(
-                            "\d" * padding_length, name[: padding_match.start(1) - 1], name[padding_match.end(1) + 1 :]
-                        )
-                    )
-                    mov_name = (
-                        str(p.stem)[: padding_match.start(1) - 1] + str(p.stem)[padding_match.end(1) + 1 :]
-                    )  # Removes the % and d which are not captured in the re.
+                    # removes the % and d which are not captured in the re
+                    prefix = name[: padding_match.start(1) - 1]
+                    suffix = name[padding_match.end(1) + 1 :]
             else:
                 padding_length = len(padding_match[1])
-                file_re = re.compile(
-                    r"^{1}({0}){2}$".format(
-                        "\d" * padding_length, name[: padding_match.start(1)], name[padding_match.end(1) :]
-                    )
-                )
-                mov_name = str(p.stem)[: padding_match.start(1)] + str(p.stem)[padding_match.end(1) :]
+                prefix = name[: padding_match.start(1)]
+                suffix = name[padding_match.end(1) :]
 
             if padding_match:
-                # scene.render.filepath = str(folder.joinpath(mov_name))
-
-                frames = dict()
-                max_frame = 0
-                min_frame = 999999999
-                for f in sorted(list(folder.glob("*"))):
-                    _folder, _name = f.parent, f.name
-                    re_match = file_re.match(_name)
-                    if re_match:
-                        frame_nb = int(re_match[1])
-                        max_frame = max(max_frame, frame_nb)
-                        min_frame = min(min_frame, frame_nb)
-
-                        frames[frame_nb] = f
-
-                frame_keys = list(frames.keys())  # As of python 3.7 should be in the insertion order.
-                if frames:
+                # the listing of the folder is cached, it is shared by the strips of the sequence
+                seqFrames = utils_filenames.getImageSequenceFrames(folder, prefix, suffix, padding_length)
+                if len(seqFrames.frames):
+                    if len(seqFrames.gaps):
+                        _logger.debug_ext(f"Missing frames in {images_path}: {seqFrames.gaps}", col="ORANGE")
+
+                    # the names are all computed before being appended to the strip in a single loop
+                    elementsNames = seqFrames.getElementsNames()
                     seq = scene.sequence_editor.sequences.new_image(
-                        clipName, str(frames[frame_keys[0]]), channelInd, atFrame
+                        clipName, seqFrames.getFilepath(seqFrames.minFrame), channelInd, atFrame
                     )
-
-                    for i in range(min_frame + 1, max_frame + 1):
-                        pp = frames.get(i, Path(""))
-                        seq.elements.append(pp.name)
-
-                #   scene.frame_end = max_frame - min_frame + 1
+                    appendElement = seq.elements.append
+                    for elementName in elementsNames[1:]:
+                        appendElement(elementName)
 
             return seq
 
@@ -741,14 +719,25 @@ class ShotManager_Vse_Render(PropertyGroup):
 
     # NOTE: This function has 2 different behaviors depending if we use mediaDictArr or mediaFiles
     # FIXME: wkipwkipwkip this has to be fixed to harmonize the behavior
-    def buildSequenceVideoFromMedia(self, outputFile, handles, fps, mediaDictArr=None, mediaFiles=None):
+    def buildSequenceVideoFromMedia(
+        self, outputFile, handles, fps, mediaDictArr=None, mediaFiles=None, useStreamCopy=False
+    ):
         """Create a composited output (image sequence or video according to the extension of outputFile) from
         the bg, fg and audio media provided either by mediaDictArr or mediaFiles
 
         Args:
             mediaDictArr: dictionary specifying the source media and their resolution
             mediaFiles: list of 2 media and an audio
+            useStreamCopy: if True the videos of mediaFiles are concatenated without being re-encoded when ffmpeg
+                           is available and they already have the codecs and the resolution of the output.
+                           The VSE is used otherwise
         """
+        if useStreamCopy and mediaFiles is not None:
+            if utils_ffmpeg.concatVideosByStreamCopy(
+                outputFile, mediaFiles, handles, fps, resolution=self.outputResolution
+            ):
+                return
+
         previousScene = bpy.context.window.scene
 
         sequenceScene = None
@@ -17,20 +17,154 @@
 
 """
 Functions specific to Shot Manager props
+
+The warnings are displayed by the panels at each redraw so they are cached and computed again only when
+the data of the file may have changed: depsgraph updates, file loading and saving, undo and redo, and
+edits of the shots. The checks made on the file system, slow on network drives, are cached separately
+and refreshed by a timer, which invalidates the warnings when their result changes.
 """
 
+import time
 from stat import S_IMODE, S_IWRITE
 from pathlib import Path
 
 import bpy
+from bpy.app.handlers import persistent
+
 from shotmanager.config import config
+from shotmanager.properties import shots_index
 from shotmanager.utils import utils
 from shotmanager.utils.utils_markers import sceneContainsCameraBinding
 
+from shotmanager.config import sm_logging
+
+_logger = sm_logging.getLogger(__name__)
+
+
+# period in seconds of the refresh of the checks made on the file system
+_FILESYSTEM_CHECKS_PERIOD = 5.0
+
+# dictionary of WarningsCache instances, keyed by props pointer
+_warningsCaches = dict()
+
+# results of the checks made on the file system, keyed by tuples (check name, path)
+_filesystemChecks = dict()
+
+# number of invalidations of the warnings, part of the keys of the caches
+_generation = 0
+
+
+class WarningsCache:
+    """Warnings computed for a Shot Manager instance, with the time it took to compute them"""
+
+    def __init__(self, key, warnings, computeDuration):
+        self.key = key
+        self.warnings = warnings
+        self.computeTime = time.perf_counter()
+        self.computeDuration = computeDuration
+        self.numQueries = 0
+
+    def getAge(self):
+        """Return the time in seconds since the warnings have been computed"""
+        return time.perf_counter() - self.computeTime
+
+
+def _isFileReadOnly(filepath):
+    try:
+        return S_IMODE(Path(filepath).stat().st_mode) & S_IWRITE == 0
+    except OSError:
+        return False
+
+
+def _pathExists(path):
+    return Path(path).exists()
+
+
+_filesystemCheckFunctions = {"READ_ONLY": _isFileReadOnly, "EXISTS": _pathExists}
+
+
+def _getFilesystemCheck(checkName, path):
+    """Return the result of the specified check made on the path, computed at the first query and then
+    refreshed by the timer
+    """
+    checkKey = (checkName, path)
+    result = _filesystemChecks.get(checkKey, None)
+    if result is None:
+        result = _filesystemCheckFunctions[checkName](path)
+        _filesystemChecks[checkKey] = result
+    return result
+
+
+def _isRenderRootPathValid(props):
+    """Same as props.isRenderRootPathValid() but with the existence of the path taken from the cache"""
+    rootPath = props.renderRootPath
+    if "" == rootPath or rootPath.startswith("//"):
+        return props.isRenderRootPathValid()
+    return _getFilesystemCheck("EXISTS", rootPath)
+
+
+def refreshFilesystemChecks():
+    """Run again the checks made on the file system and invalidate the warnings if a result has changed
+    Return True if a result has changed
+    """
+    changed = False
+    for checkKey in list(_filesystemChecks):
+        result = _filesystemCheckFunctions[checkKey[0]](checkKey[1])
+        if result != _filesystemChecks[checkKey]:
+            _filesystemChecks[checkKey] = result
+            changed = True
+
+    if changed:
+        _logger.debug_ext("File system checks changed, warnings invalidated", col="GRAY", tag="WARNINGS")
+        invalidateWarnings()
+    return changed
+
+
+def filesystemChecksTimer():
+    """Function registered in bpy.app.timers, refreshing the checks made on the file system"""
+    if refreshFilesystemChecks():
+        wm = bpy.context.window_manager
+        if wm is not None:
+            for window in wm.windows:
+                for area in window.screen.areas:
+                    area.tag_redraw()
+    return _FILESYSTEM_CHECKS_PERIOD
+
+
+def invalidateWarnings(filesystemChecks=False):
+    """Invalidate the warnings of all the scenes
+    Args:
+        filesystemChecks: if True the checks made on the file system are also done again at the next query
+    """
+    global _generation
+    _generation += 1
+    _warningsCaches.clear()
+    if filesystemChecks:
+        _filesystemChecks.clear()
+
+
+@persistent
+def shotMngHandler_depsgraph_update_post_warnings(scene, depsgraph):
+    global _generation
+    _generation += 1
+
+
+def getGeneration():
+    """Return a counter incremented each time the warnings are invalidated"""
+    return _generation
+
+
+def getWarningsCache(props):
+    """Return the cache of the warnings of the specified props, None if they have not been computed or have
+    been invalidated. Used to get the age of the warnings and the time it took to compute them
+    """
+    return _warningsCaches.get(props.as_pointer(), None)
+
 
 def getWarnings(props, scene):
     """Check if some warnings are to be mentioned to the user/
     A warning message can be on several lines when the separator \n is used.
+    The result is cached until the data of the file changes.
 
     Return:
         An array of tupples made of:
@@ -39,7 +173,20 @@ def getWarnings(props, scene):
             - the panel type, which can be 'ALL', 'MAIN' or 'RENDER'
         eg: [("Current file in Read-Only", 1, 'ALL'), ("Current scene fps and project fps are different !!", 2, 'MAIN')]
     """
-    prefs = config.getShotManagerPrefs()
+    key = (_generation, shots_index.getGeneration(), bpy.data.filepath, scene.name, config.devDebug)
+    cache = _warningsCaches.get(props.as_pointer(), None)
+    if cache is None or cache.key != key:
+        startTime = time.perf_counter()
+        warningList = _computeWarnings(props, scene)
+        cache = WarningsCache(key, warningList, time.perf_counter() - startTime)
+        _warningsCaches[props.as_pointer()] = cache
+        _logger.debug_ext(f"Warnings computed in {cache.computeDuration * 1000.0:.3f} ms", col="GRAY", tag="WARNINGS")
+
+    cache.numQueries += 1
+    return list(cache.warnings)
+
+
+def _computeWarnings(props, scene):
     warningList = []
 
     # check if the current file is saved and not read only
@@ -50,9 +197,7 @@ def getWarnings(props, scene):
         # wkip to remove ones warning mecanics are integrated in the settings
         pass
     else:
-        stat = Path(currentFilePath).stat()
-        # print(f"Blender file Stats: {stat.st_mode}")
-        if S_IMODE(stat.st_mode) & S_IWRITE == 0:
+        if _getFilesystemCheck("READ_ONLY", currentFilePath):
             warningList.append(("Current file in Read-Only", 10, "ALL"))
 
     # check is the data version is compatible with the current version
@@ -109,7 +254,7 @@ def getWarnings(props, scene):
     if "" == props.renderRootPath:
         warningList.append(("Rendering path is not defined", 120, "RENDER"))
 
-    elif not props.isRenderRootPathValid():
+    elif not _isRenderRootPathValid(props):
         warningList.append(("Rendering path is invalid", 121, "RENDER"))
 
     # check if the resolution render percentage is at 100%
@@ -20,6 +20,7 @@ Draw the warnings component
 """
 
 from shotmanager.config import config
+from . import warnings
 
 
 def drawWarnings(context, ui_component, warningsList, panelType="MAIN"):
@@ -68,6 +69,15 @@ def drawWarnings(context, ui_component, warningsList, panelType="MAIN"):
     # titleRowRight.alert = True
     # titleRowRight.label(text="test")
 
+    if config.devDebug:
+        warningsCache = warnings.getWarningsCache(context.scene.UAS_shot_manager_props)
+        if warningsCache is not None:
+            titleRowRight = panelRow.row()
+            titleRowRight.alignment = "RIGHT"
+            titleRowRight.label(
+                text=f"{warningsCache.computeDuration * 1000.0:.2f} ms, age: {warningsCache.getAge():.1f} s"
+            )
+
     if prefs.general_warning_expanded:
         mainRow = box.row()
         mainRow.separator(factor=2.0)